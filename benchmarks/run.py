@@ -0,0 +1,285 @@
+"""
+Benchmarks for the ExpandCore startup path and the url_todo_list hot paths.
+
+Every benchmark is timed with timeit (best of several runs) and then run once
+more under tracemalloc to record its peak memory. The url_todo_list benchmarks
+run against synthetic databases of each requested size.
+
+Usage:
+    python -m benchmarks.run                          # 10k, 100k and 1M rows
+    python -m benchmarks.run --sizes 10000 --save     # record a new baseline
+    python -m benchmarks.run --threshold 0.25         # fail on a 25% regression
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core.manager import ModuleManager
+from modules.url_todo_list.cache import invalidate
+from modules.url_todo_list.connection import connect
+from modules.url_todo_list.database import add_url, fetch_urls, fetch_urls_page, iter_urls
+from modules.url_todo_list.importer import import_urls
+from modules.url_todo_list.repository import URLRepository, INSERT_URL_SQL, insert_url_params
+from modules.url_todo_list.migrations import migrate, deferred_search_index
+from modules.url_todo_list.utils import is_valid_url, export_to_csv, export_to_json, export_to_xml
+
+SIZES = (10000, 100000, 1000000)
+
+REPEAT = 3
+
+# A result is a regression when it is this much worse than the baseline
+THRESHOLD = 0.2
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Number of single-row inserts timed by the insert benchmark
+INSERT_COUNT = 1000
+
+# Number of strings checked by the is_valid_url benchmark
+VALIDATE_COUNT = 10000
+
+GENERATE_BATCH_SIZE = 10000
+
+CATEGORIES = ("news", "blog", "docs", "video", "misc")
+
+EXPORTERS = (
+    ("export_to_csv", export_to_csv, "csv"),
+    ("export_to_json", export_to_json, "json"),
+    ("export_to_xml", export_to_xml, "xml"),
+)
+
+
+def synthetic_rows(count, start=0):
+    """Yield (url, description, category, status) records for a synthetic database"""
+    for index in range(start, start + count):
+        yield (
+            f"https://site{index % 997}.example.com/articles/{index}?page={index % 7}",
+            f"Synthetic article number {index}",
+            CATEGORIES[index % len(CATEGORIES)],
+            index % 3 == 0,
+        )
+
+
+def generate_database(path, rows):
+    """Create a database holding `rows` synthetic URLs, unless it already exists"""
+    conn = connect(path)
+    migrate(conn)
+    existing = conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+    for start in range(existing, rows, GENERATE_BATCH_SIZE):
+        count = min(GENERATE_BATCH_SIZE, rows - start)
+        params = [insert_url_params(*row) for row in synthetic_rows(count, start)]
+        with deferred_search_index(conn):
+            conn.executemany(INSERT_URL_SQL, params)
+        conn.commit()
+    conn.execute("ANALYZE")
+    conn.commit()
+    return conn
+
+
+def measure(func, setup=None, repeat=REPEAT):
+    """Return (best seconds, peak traced bytes) for a callable, calling setup before each run"""
+    setup = setup or (lambda: None)
+    timer = timeit.Timer(func, setup)
+    seconds = min(timer.repeat(repeat=repeat, number=1))
+
+    # Memory is measured separately, as tracing slows every allocation down
+    setup()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def measure_startup(repeat=REPEAT):
+    """Time a fresh interpreter importing main.py, which loads config and rich"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import main"], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return min(timings), None
+
+
+def core_benchmarks(repeat):
+    """Benchmarks that do not depend on a database size"""
+    results = {"startup": measure_startup(repeat)}
+
+    manager = ModuleManager()
+    # The manager reports every load and unload on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        results["load_module"] = measure(
+            lambda: manager.load_module("url_todo_list"),
+            lambda: manager.unload_module("url_todo_list"),
+            repeat,
+        )
+
+    urls = [row[0] for row in synthetic_rows(VALIDATE_COUNT)]
+    urls[::10] = ["not a url"] * len(urls[::10])
+    results["is_valid_url"] = measure(lambda: [is_valid_url(url) for url in urls], repeat=repeat)
+    return results
+
+
+def database_benchmarks(conn, size, directory, repeat):
+    """Benchmarks run against a database of `size` rows"""
+    results = {}
+
+    def inserts():
+        for row in synthetic_rows(INSERT_COUNT, size):
+            add_url(conn, row[0], row[1], row[2], commit=False)
+
+    def discard_inserts():
+        conn.rollback()
+        invalidate(conn)
+
+    results["add_url"] = measure(inserts, discard_inserts, repeat)
+    discard_inserts()
+
+    # The query cache would turn repeated reads into dict lookups; time the queries themselves
+    results["fetch_urls"] = measure(lambda: fetch_urls(conn), lambda: invalidate(conn), repeat)
+    results["fetch_urls_by_status"] = measure(lambda: fetch_urls(conn, status=True), lambda: invalidate(conn), repeat)
+    results["fetch_urls_by_category"] = measure(lambda: fetch_urls(conn, category="docs"), lambda: invalidate(conn), repeat)
+    results["fetch_urls_page"] = measure(lambda: fetch_urls_page(conn, after_id=size // 2), lambda: invalidate(conn), repeat)
+    results["iter_urls"] = measure(lambda: sum(1 for _ in URLRepository(conn).iter()), repeat=repeat)
+
+    for name, exporter, extension in EXPORTERS:
+        filename = os.path.join(directory, f"export-{size}.{extension}")
+        results[name] = measure(lambda: exporter(iter_urls(conn), filename), repeat=repeat)
+
+    # Bulk import of the CSV export into an empty database, run once as it is the slowest benchmark
+    import_path = os.path.join(directory, f"import-{size}.db")
+
+    def remove_import_database():
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(import_path + suffix):
+                os.remove(import_path + suffix)
+
+    def bulk_import():
+        import_conn = connect(import_path)
+        try:
+            import_urls(import_conn, os.path.join(directory, f"export-{size}.csv"))
+        finally:
+            import_conn.close()
+
+    results["import_urls"] = measure(bulk_import, remove_import_database, repeat=1)
+    remove_import_database()
+    return {f"{name}[{size}]": result for name, result in results.items()}
+
+
+def run_benchmarks(sizes=SIZES, repeat=REPEAT, data_dir=None, progress=None):
+    """Run every benchmark and return {name: {"seconds": ..., "peak_bytes": ...}}"""
+    progress = progress or (lambda message: None)
+    results = {}
+
+    progress("core")
+    results.update(core_benchmarks(repeat))
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_dir = data_dir or directory
+        os.makedirs(data_dir, exist_ok=True)
+        for size in sizes:
+            progress(f"generating {size} rows")
+            conn = generate_database(os.path.join(data_dir, f"bench-{size}.db"), size)
+            try:
+                progress(f"{size} rows")
+                results.update(database_benchmarks(conn, size, directory, repeat))
+            finally:
+                conn.close()
+
+    return {name: {"seconds": seconds, "peak_bytes": peak} for name, (seconds, peak) in results.items()}
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Return (name, metric, baseline value, new value) for every result worse than the baseline by more than threshold"""
+    regressions = []
+    for name, result in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            old, new = previous.get(metric), result.get(metric)
+            if old and new is not None and new > old * (1 + threshold):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def load_baseline(path):
+    """Read the benchmark results of a baseline file, or None if there is none"""
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)["results"]
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results):
+    """Write benchmark results to a baseline file, with the environment they were measured in"""
+    data = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+
+
+def format_results(results, baseline=None):
+    """Return a table of the results, with the change from the baseline when there is one"""
+    lines = [f"{'benchmark':<36} {'time (ms)':>12} {'peak (KiB)':>12} {'change':>8}"]
+    for name, result in sorted(results.items()):
+        peak = "-" if result["peak_bytes"] is None else f"{result['peak_bytes'] / 1024:.1f}"
+        change = ""
+        previous = (baseline or {}).get(name)
+        if previous and previous.get("seconds"):
+            change = f"{(result['seconds'] / previous['seconds'] - 1) * 100:+.0f}%"
+        lines.append(f"{name:<36} {result['seconds'] * 1000:>12.2f} {peak:>12} {change:>8}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the ExpandCore benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Number of rows of the synthetic databases")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Runs per benchmark, the best one is kept")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file to compare with")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Relative slowdown reported as a regression")
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--data-dir", help="Keep the generated databases in this directory to reuse them")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.data_dir,
+                             progress=lambda message: sys.stderr.write(f"Running {message}...\n"))
+    baseline = load_baseline(args.baseline)
+    print(format_results(results, baseline))
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, metric, old, new in regressions:
+        print(f"REGRESSION {name} {metric}: {old:.6g} -> {new:.6g} ({(new / old - 1) * 100:+.0f}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
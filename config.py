@@ -10,8 +10,24 @@ config.read(os.path.join(base_path, 'config.ini'))
 
 # Charger les variables
 DATABASE = config['variables'].get('DATABASE', 'todos.db')
+PAGE_SIZE = int(config['variables'].get('PAGE_SIZE', 20))
 MAX_ATTEMPTS = int(config['variables'].get('MAX_ATTEMPTS', 3))
 START_INDEX = int(config['variables'].get('START_INDEX', 0))
+LAZY_LOADING = config['variables'].getboolean('LAZY_LOADING', True)
+AUTO_DISCOVER = config['variables'].getboolean('AUTO_DISCOVER', False)
+HOT_RELOAD = config['variables'].getboolean('HOT_RELOAD', False)
+# Exécuter chaque module dans un processus séparé, avec un délai (secondes) et une limite mémoire (Mo), 0 = aucune limite
+ISOLATE_MODULES = config['variables'].getboolean('ISOLATE_MODULES', False)
+MODULE_TIMEOUT = float(config['variables'].get('MODULE_TIMEOUT', 0))
+MODULE_MEMORY_LIMIT = int(config['variables'].get('MODULE_MEMORY_LIMIT', 0))
+# Fichier JSON où écrire l'historique des ressources utilisées par les modules en quittant (vide = aucun)
+RESOURCE_JSON = config['variables'].get('RESOURCE_JSON', '') or None
+# Lancer les tâches de fond déclarées par les modules (register_jobs)
+BACKGROUND_JOBS = config['variables'].getboolean('BACKGROUND_JOBS', True)
+# Mesurer la latence des requêtes SQL de url_todo_list dès le démarrage
+SQL_TRACE = config['variables'].getboolean('SQL_TRACE', False)
 
 # Charger les modules sans clés explicites
-MODULES = {str(i + START_INDEX): module for i, module in enumerate(config['modules']) if module is not None}
+# Avec AUTO_DISCOVER, la liste est construite par ModuleManager.discover_modules()
+modules_section = config['modules'] if config.has_section('modules') else []
+MODULES = {str(i + START_INDEX): module for i, module in enumerate(modules_section) if module is not None}
@@ -0,0 +1,277 @@
+import json
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+# Seconds between two samples of a running module
+SAMPLE_INTERVAL = 0.05
+
+# Number of runs remembered per module
+HISTORY_SIZE = 50
+
+ResourceUsage = namedtuple("ResourceUsage", [
+    "module_name",    # Name of the module that ran
+    "started",        # Start time, seconds since the epoch
+    "wall_seconds",   # Elapsed time of the run
+    "cpu_seconds",    # User + system CPU time used during the run
+    "rss_peak",       # Highest resident set size sampled, in bytes
+    "rss_delta",      # Resident set size at the end minus at the start, in bytes
+    "open_fds",       # Open file descriptors (handles on Windows) at the end
+    "fds_delta",      # Open file descriptors at the end minus at the start
+    "threads",        # Highest thread count sampled
+    "isolated",       # Whether the run happened in a worker process
+    "ok",             # Whether the entry point returned without raising
+])
+
+
+def count_fds(process):
+    """
+    Returns the number of open file descriptors of a process, or of handles on Windows.
+    """
+    if hasattr(process, "num_fds"):
+        return process.num_fds()
+    return process.num_handles()
+
+
+class ResourceMonitor:
+    """
+    Samples the CPU time, memory, file descriptors and threads of a process while a module runs.
+
+    A background thread samples the process every `interval` seconds so the
+    peak resident set size and thread count are caught even when the module
+    frees its memory before returning. When the monitored process is the
+    current one, CPU time and thread counts include the other threads of the
+    application.
+
+    Attributes:
+        pid (int): The monitored process.
+        interval (float): Seconds between two samples.
+    """
+
+    def __init__(self, pid=None, interval=SAMPLE_INTERVAL):
+        """
+        Initializes a new ResourceMonitor.
+
+        Args:
+            pid (int): The process to monitor. Defaults to the current process.
+            interval (float): Seconds between two samples.
+        """
+        # psutil takes tens of milliseconds to import, only pay for it once a module is measured
+        import psutil
+
+        self.pid = pid
+        self.interval = interval
+        self._process = psutil.Process(pid)
+        self._first = None
+        self._last = None
+        self._rss_peak = 0
+        self._threads_peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._started = None
+        self._wall_start = None
+
+    def sample(self):
+        """
+        Takes one sample of the process. Does nothing once the process has exited.
+        """
+        import psutil
+
+        try:
+            with self._process.oneshot():
+                cpu = self._process.cpu_times()
+                snapshot = {
+                    "cpu": cpu.user + cpu.system,
+                    "rss": self._process.memory_info().rss,
+                    "fds": count_fds(self._process),
+                    "threads": self._process.num_threads(),
+                }
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return
+        with self._lock:
+            if self._first is None:
+                self._first = snapshot
+            self._last = snapshot
+            self._rss_peak = max(self._rss_peak, snapshot["rss"])
+            self._threads_peak = max(self._threads_peak, snapshot["threads"])
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        """
+        Takes the first sample and starts sampling in the background.
+
+        Returns:
+            ResourceMonitor: The monitor itself.
+        """
+        self._started = time.time()
+        self._wall_start = time.perf_counter()
+        self.sample()
+        self._thread = threading.Thread(target=self._sample_loop, name="resource-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, module_name, isolated=False, ok=True):
+        """
+        Stops sampling and returns the resources used since start().
+
+        Args:
+            module_name (str): Name of the module recorded in the result.
+            isolated (bool): Whether the module ran in a worker process.
+            ok (bool): Whether the entry point returned without raising.
+
+        Returns:
+            ResourceUsage: The resources used by the run.
+        """
+        wall_seconds = time.perf_counter() - self._wall_start
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+        with self._lock:
+            first = self._first or {"cpu": 0.0, "rss": 0, "fds": 0, "threads": 0}
+            last = self._last or first
+            return ResourceUsage(
+                module_name, self._started, wall_seconds,
+                last["cpu"] - first["cpu"],
+                self._rss_peak, last["rss"] - first["rss"],
+                last["fds"], last["fds"] - first["fds"],
+                self._threads_peak, isolated, ok,
+            )
+
+
+class ResourceAccounting:
+    """
+    Keeps a rolling history of the resources used by each module run.
+
+    Only the last `history_size` runs of each module are kept, so the history
+    stays small in long-lived sessions.
+
+    Attributes:
+        history_size (int): Number of runs remembered per module.
+        interval (float): Seconds between two samples of a running module.
+    """
+
+    def __init__(self, history_size=HISTORY_SIZE, interval=SAMPLE_INTERVAL):
+        """
+        Initializes a new ResourceAccounting.
+
+        Args:
+            history_size (int): Number of runs remembered per module.
+            interval (float): Seconds between two samples of a running module.
+        """
+        self.history_size = history_size
+        self.interval = interval
+        self._history = {}
+        self._lock = threading.Lock()
+
+    def monitor(self, pid=None):
+        """
+        Starts monitoring a process.
+
+        Args:
+            pid (int): The process to monitor. Defaults to the current process.
+
+        Returns:
+            ResourceMonitor: The started monitor.
+        """
+        return ResourceMonitor(pid, self.interval).start()
+
+    @contextmanager
+    def measure(self, module_name):
+        """
+        Context manager recording the resources used by a module run in the current process.
+
+        Args:
+            module_name (str): The name of the module.
+        """
+        monitor = self.monitor()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(monitor.stop(module_name, ok=ok))
+
+    def record(self, usage):
+        """
+        Adds a run to the history of its module, dropping the oldest run when it is full.
+
+        Args:
+            usage (ResourceUsage): The resources used by the run.
+        """
+        with self._lock:
+            history = self._history.get(usage.module_name)
+            if history is None:
+                history = self._history[usage.module_name] = deque(maxlen=self.history_size)
+            history.append(usage)
+
+    def history(self, module_name=None):
+        """
+        Returns the recorded runs, oldest first.
+
+        Args:
+            module_name (str): Only return the runs of this module.
+
+        Returns:
+            list: ResourceUsage records.
+        """
+        with self._lock:
+            if module_name is not None:
+                return list(self._history.get(module_name, ()))
+            return [usage for history in self._history.values() for usage in history]
+
+    def summary(self):
+        """
+        Aggregates the recorded runs of each module.
+
+        Returns:
+            dict: Per module name, a dictionary with 'runs', 'failures', 'wall_seconds',
+                'cpu_seconds' (totals), 'rss_peak', 'threads' (maxima), 'rss_delta'
+                and 'fds_delta' (sums, a steady growth hints at a leak).
+        """
+        with self._lock:
+            histories = {name: list(history) for name, history in self._history.items()}
+        summary = {}
+        for name, runs in sorted(histories.items()):
+            summary[name] = {
+                "runs": len(runs),
+                "failures": sum(not usage.ok for usage in runs),
+                "wall_seconds": sum(usage.wall_seconds for usage in runs),
+                "cpu_seconds": sum(usage.cpu_seconds for usage in runs),
+                "rss_peak": max(usage.rss_peak for usage in runs),
+                "rss_delta": sum(usage.rss_delta for usage in runs),
+                "fds_delta": sum(usage.fds_delta for usage in runs),
+                "threads": max(usage.threads for usage in runs),
+            }
+        return summary
+
+    def to_dict(self):
+        """
+        Returns the summary and the history of every module as JSON-serializable data.
+        """
+        return {
+            "summary": self.summary(),
+            "history": [usage._asdict() for usage in self.history()],
+        }
+
+    def dump(self, path):
+        """
+        Writes the summary and history as JSON.
+
+        Args:
+            path (str): The file to write.
+
+        Returns:
+            bool: True if the file was written.
+        """
+        try:
+            with open(path, "w") as file:
+                json.dump(self.to_dict(), file, indent=4)
+        except OSError as e:
+            print(f"Error: Failed to write resource usage to {path}: {e}")
+            return False
+        return True
@@ -0,0 +1,152 @@
+import ast
+import json
+import os
+from collections import namedtuple
+
+# Identity of a module as read from its __init__.py, without importing it
+ModuleInfo = namedtuple("ModuleInfo", ["module_name", "name", "version", "entry_point", "dependencies", "jobs"], defaults=[(), False])
+
+MODULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "modules")
+INDEX_FILENAME = ".module_index.json"
+INDEX_FORMAT = 3
+
+
+def inspect_module(init_path, module_name):
+    """
+    Reads the identity information of a module from its __init__.py without importing it.
+
+    Only top-level literal assignments of `name`, `version` and `dependencies` are
+    considered, and the entry point is `main` when a top-level `main` function is defined.
+    `jobs` is True when the module defines a top-level `register_jobs` function.
+
+    Args:
+        init_path (str): Path to the module's __init__.py file.
+        module_name (str): The name of the module inside the `modules` package.
+
+    Returns:
+        ModuleInfo: The module identity, or None if 'name' or 'version' is missing.
+
+    Raises:
+        ValueError: If `dependencies` is not a module name or a list of module names.
+    """
+    with open(init_path, "rb") as file:
+        tree = ast.parse(file.read(), filename=init_path)
+
+    identity = {}
+    dependencies = ()
+    entry_point = None
+    jobs = False
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                if target.id in ("name", "version") and isinstance(node.value, ast.Constant):
+                    identity[target.id] = node.value.value
+                elif target.id == "dependencies":
+                    value = ast.literal_eval(node.value)
+                    value = (value,) if isinstance(value, str) else value
+                    if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+                        raise ValueError(f"'dependencies' must be a list of module names, not {value!r}")
+                    dependencies = tuple(value)
+        elif isinstance(node, ast.FunctionDef) and node.name == "main":
+            entry_point = "main"
+        elif isinstance(node, ast.FunctionDef) and node.name == "register_jobs":
+            jobs = True
+
+    if "name" not in identity or "version" not in identity:
+        return None
+    return ModuleInfo(module_name, identity["name"], identity["version"], entry_point, dependencies, jobs)
+
+
+class ModuleIndex:
+    """
+    On-disk cache of module identities, keyed by the mtime and size of each module's __init__.py.
+
+    Attributes:
+        modules_path (str): Directory scanned for module packages.
+        index_path (str): Path of the JSON index file.
+    """
+
+    def __init__(self, modules_path=None, index_path=None):
+        """
+        Initializes a new ModuleIndex.
+
+        Args:
+            modules_path (str): Directory containing the module packages. Defaults to the `modules` package.
+            index_path (str): Path of the index file. Defaults to `.module_index.json` inside modules_path.
+        """
+        self.modules_path = modules_path or MODULES_PATH
+        self.index_path = index_path or os.path.join(self.modules_path, INDEX_FILENAME)
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if data.get("format") != INDEX_FORMAT:
+            return {}
+        return data.get("modules", {})
+
+    def _write_index(self, entries):
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump({"format": INDEX_FORMAT, "modules": entries}, file, indent=4, sort_keys=True)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Warning: Failed to write module index {self.index_path}: {e}")
+
+    def scan(self):
+        """
+        Scans the modules directory and returns the identity of every valid module.
+
+        Modules whose __init__.py has the same mtime and size as in the index are taken
+        from the cache; only new or changed modules are parsed again. The index is
+        rewritten only when something changed.
+
+        Returns:
+            dict: Mapping of module name to ModuleInfo, sorted by module name.
+        """
+        cached = self._read_index()
+        entries = {}
+        discovered = {}
+
+        try:
+            candidates = sorted(os.scandir(self.modules_path), key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"Error: Failed to scan modules directory {self.modules_path}: {e}")
+            return {}
+
+        for entry in candidates:
+            if entry.name.startswith(("_", ".")) or not entry.is_dir():
+                continue
+            init_path = os.path.join(entry.path, "__init__.py")
+            try:
+                stat = os.stat(init_path)
+            except OSError:
+                continue
+
+            key = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            cached_entry = cached.get(entry.name)
+            if cached_entry and all(cached_entry.get(k) == v for k, v in key.items()):
+                entries[entry.name] = cached_entry
+            else:
+                try:
+                    info = inspect_module(init_path, entry.name)
+                except (OSError, SyntaxError, ValueError, TypeError) as e:
+                    print(f"Warning: Failed to inspect module '{entry.name}': {e}")
+                    info = None
+                entries[entry.name] = dict(key, info=info._asdict() if info else None)
+
+            info = entries[entry.name]["info"]
+            if info is None:
+                print(f"Warning: Module '{entry.name}' is missing 'name' or 'version' information.")
+                continue
+            info = dict(info, dependencies=tuple(info.get("dependencies", ())))
+            discovered[entry.name] = ModuleInfo(**info)
+
+        if entries != cached:
+            self._write_index(entries)
+        return discovered
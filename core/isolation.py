@@ -0,0 +1,332 @@
+import importlib
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows: memory limits are not enforced there
+    resource = None
+
+# Seconds between two checks for cancellation and timeouts while a worker runs
+POLL_INTERVAL = 0.1
+
+# Seconds a worker is given to exit after being asked to terminate, before it is killed
+TERMINATE_GRACE = 2.0
+
+
+class IsolationError(Exception):
+    """Base class of the errors raised for modules run in a worker process."""
+
+
+class ModuleTimeoutError(IsolationError):
+    """Raised when a module run exceeds its timeout."""
+
+
+class ModuleCancelledError(IsolationError):
+    """Raised when a module run is cancelled."""
+
+
+class ModuleProcessError(IsolationError):
+    """
+    Raised when the entry point raised an exception or the worker process died.
+
+    Attributes:
+        exitcode (int): Exit code of the worker process, negative if it was killed by a signal.
+        details (str): Traceback of the exception raised in the worker, if any.
+    """
+
+    def __init__(self, message, exitcode=None, details=None):
+        super().__init__(message)
+        self.exitcode = exitcode
+        self.details = details
+
+
+def apply_memory_limit(limit):
+    """
+    Caps the address space of the current process.
+
+    Args:
+        limit (int): Maximum size in bytes. Allocations beyond it raise MemoryError.
+    """
+    if resource is None:
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def worker_main(conn, module_path, function_name, args, memory_limit, stdin_fd):
+    """
+    Entry point of a worker process: imports the module, calls the function and sends back the outcome.
+
+    The outcome is sent on conn as ("ok", result) or ("error", message, traceback).
+    Results that cannot be pickled are replaced by None.
+    """
+    if stdin_fd is not None:
+        # multiprocessing redirects stdin to /dev/null; give interactive modules the terminal back
+        sys.stdin = os.fdopen(stdin_fd, "r", closefd=True)
+    try:
+        if memory_limit:
+            apply_memory_limit(memory_limit)
+        module = importlib.import_module(module_path)
+        outcome = ("ok", getattr(module, function_name)(*args))
+    except SystemExit as e:
+        if e.code in (None, 0):
+            outcome = ("ok", None)
+        else:
+            outcome = ("error", f"SystemExit: {e.code}", traceback.format_exc())
+    except BaseException as e:
+        outcome = ("error", f"{type(e).__name__}: {e}", traceback.format_exc())
+    try:
+        try:
+            conn.send(outcome)
+        except Exception:
+            conn.send(("ok", None) if outcome[0] == "ok" else outcome[:2] + ("",))
+    finally:
+        conn.close()
+
+
+def stop_process(process):
+    """
+    Terminates a process, killing it if it does not exit within TERMINATE_GRACE seconds.
+    """
+    if process.is_alive():
+        process.terminate()
+        process.join(TERMINATE_GRACE)
+    if process.is_alive():
+        process.kill()
+    process.join()
+
+
+class ModuleRun:
+    """
+    Handle of an entry point submitted to a ProcessRunner.
+
+    Attributes:
+        module_path (str): Dotted path of the module.
+        function_name (str): Name of the function called in the worker.
+        process (multiprocessing.Process): The worker process, once started.
+        usage (ResourceUsage): Resources used by the worker, when the runner monitors them.
+    """
+
+    def __init__(self, module_path, function_name):
+        self.module_path = module_path
+        self.function_name = function_name
+        self.process = None
+        self.usage = None
+        self.future = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancel_requested(self):
+        """
+        Returns True once cancel() has been called.
+        """
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """
+        Cancels the run: a pending run never starts and a running worker is terminated.
+
+        Returns:
+            bool: False if the run had already finished.
+        """
+        if self.future.done():
+            return False
+        self._cancel.set()
+        self.future.cancel()
+        return True
+
+    def done(self):
+        """
+        Returns True once the run finished, failed or was cancelled.
+        """
+        return self.future.done()
+
+    def result(self, timeout=None):
+        """
+        Waits for the run and returns the value returned by the entry point.
+
+        Args:
+            timeout (float): Seconds to wait for the result. This does not stop the run.
+
+        Raises:
+            ModuleTimeoutError: If the run exceeded its own timeout.
+            ModuleCancelledError: If the run was cancelled.
+            ModuleProcessError: If the entry point raised an exception or the worker died.
+            concurrent.futures.TimeoutError: If the result is not available within timeout.
+        """
+        try:
+            return self.future.result(timeout)
+        except CancelledError:
+            raise ModuleCancelledError(f"Run of {self.module_path} was cancelled.") from None
+
+    def __repr__(self):
+        state = "done" if self.done() else "running" if self.process is not None else "pending"
+        return f"<ModuleRun {self.module_path}.{self.function_name} ({state})>"
+
+
+class ProcessRunner:
+    """
+    Runs module entry points in worker processes, several at a time.
+
+    Each run gets a fresh process, so a hung or leaking module can be stopped and
+    its memory is returned to the system when it ends. A pool of supervisor
+    threads caps the number of workers alive at once; further runs wait for a
+    free slot. Every run can have a timeout and a memory limit, and can be
+    cancelled.
+
+    Attributes:
+        max_workers (int): Maximum number of worker processes alive at once.
+        timeout (float): Default timeout of a run in seconds, None for no limit.
+        memory_limit (int): Default memory limit of a run in bytes, None for no limit.
+        accounting (ResourceAccounting): Samples the resources of each worker, if set.
+    """
+
+    def __init__(self, max_workers=None, timeout=None, memory_limit=None, start_method=None, accounting=None):
+        """
+        Initializes a new ProcessRunner.
+
+        Args:
+            max_workers (int): Maximum number of worker processes alive at once. Defaults to the number of CPUs.
+            timeout (float): Default timeout of a run in seconds.
+            memory_limit (int): Default memory limit of a run in bytes. Ignored on Windows.
+            start_method (str): multiprocessing start method. Defaults to the platform default.
+            accounting (ResourceAccounting): Samples the resources of each worker into ModuleRun.usage.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.accounting = accounting
+        self._context = multiprocessing.get_context(start_method)
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="module-worker")
+        self._runs = set()
+        self._lock = threading.Lock()
+
+    def submit(self, module_path, function_name="main", args=(), timeout=None, memory_limit=None, interactive=False):
+        """
+        Schedules an entry point to run in a worker process.
+
+        Args:
+            module_path (str): Dotted path of the module to import in the worker.
+            function_name (str): Name of the function to call.
+            args (tuple): Picklable arguments passed to the function.
+            timeout (float): Seconds after which the worker is terminated. Defaults to the runner's timeout.
+            memory_limit (int): Address space limit of the worker in bytes. Defaults to the runner's limit.
+            interactive (bool): Connect the worker to this process's stdin. Only possible with the fork start method.
+
+        Returns:
+            ModuleRun: Handle to wait for or cancel the run.
+        """
+        run = ModuleRun(module_path, function_name)
+        timeout = self.timeout if timeout is None else timeout
+        memory_limit = self.memory_limit if memory_limit is None else memory_limit
+        with self._lock:
+            self._runs.add(run)
+        try:
+            run.future = self._executor.submit(self._supervise, run, args, timeout, memory_limit, interactive)
+        except RuntimeError:
+            # The runner has been shut down
+            self._forget(run)
+            raise
+        run.future.add_done_callback(lambda _: self._forget(run))
+        return run
+
+    def run(self, module_path, function_name="main", args=(), timeout=None, memory_limit=None, interactive=False):
+        """
+        Runs an entry point in a worker process and waits for it. See submit() for the arguments.
+
+        Returns:
+            The value returned by the entry point.
+        """
+        return self.submit(module_path, function_name, args, timeout, memory_limit, interactive).result()
+
+    def _forget(self, run):
+        with self._lock:
+            self._runs.discard(run)
+
+    def _supervise(self, run, args, timeout, memory_limit, interactive):
+        if run.cancel_requested:
+            raise ModuleCancelledError(f"Run of {run.module_path} was cancelled.")
+
+        stdin_fd = None
+        if interactive and self._context.get_start_method() == "fork" and sys.stdin is not None:
+            try:
+                stdin_fd = os.dup(sys.stdin.fileno())
+            except (OSError, ValueError):
+                stdin_fd = None
+
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=worker_main,
+            args=(sender, run.module_path, run.function_name, args, memory_limit, stdin_fd),
+            name=f"module-{run.module_path}",
+            daemon=True,
+        )
+        try:
+            process.start()
+        finally:
+            sender.close()
+            if stdin_fd is not None:
+                os.close(stdin_fd)
+        run.process = process
+        monitor = self.accounting.monitor(process.pid) if self.accounting is not None else None
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        outcome = None
+        try:
+            while True:
+                wait = POLL_INTERVAL if deadline is None else max(0, min(POLL_INTERVAL, deadline - time.monotonic()))
+                if receiver.poll(wait):
+                    try:
+                        outcome = receiver.recv()
+                    except EOFError:
+                        pass
+                    break
+                if run.cancel_requested:
+                    stop_process(process)
+                    raise ModuleCancelledError(f"Run of {run.module_path} was cancelled.")
+                if not process.is_alive():
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    stop_process(process)
+                    raise ModuleTimeoutError(f"Run of {run.module_path} exceeded its {timeout}s timeout.")
+            if monitor is not None:
+                # Catch the last state of the worker before it exits
+                monitor.sample()
+            process.join()
+        finally:
+            receiver.close()
+            if monitor is not None:
+                ok = outcome is not None and outcome[0] == "ok"
+                run.usage = monitor.stop(run.module_path, isolated=True, ok=ok)
+
+        if outcome is None:
+            raise ModuleProcessError(f"Worker for {run.module_path} exited with code {process.exitcode}.", process.exitcode)
+        if outcome[0] == "error":
+            raise ModuleProcessError(f"{run.module_path}.{run.function_name} failed: {outcome[1]}", process.exitcode, outcome[2])
+        return outcome[1]
+
+    def cancel_all(self):
+        """
+        Cancels every pending and running run.
+        """
+        with self._lock:
+            runs = list(self._runs)
+        for run in runs:
+            run.cancel()
+
+    def shutdown(self, cancel=False):
+        """
+        Stops accepting runs and waits for the current ones.
+
+        Args:
+            cancel (bool): Cancel the pending and running runs instead of waiting for them.
+        """
+        if cancel:
+            self.cancel_all()
+        self._executor.shutdown(wait=True)
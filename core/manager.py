@@ -1,28 +1,178 @@
 import importlib
+import os
+import sys
+import threading
+from core.discovery import ModuleIndex, MODULES_PATH, inspect_module
+from core.accounting import ResourceAccounting
+from core.profiler import StartupProfiler
+
+# Parallel loading, isolation, jobs and hot reload import their modules on first
+# use, so that importing the manager stays cheap when they are not enabled
+
+class LazyModule:
+    """
+    Lightweight stand-in for a module that has been registered but not imported yet.
+
+    The real module is imported the first time one of its attributes is accessed,
+    so registering a module costs nothing until it is actually used.
+
+    Attributes:
+        module_name (str): The name of the module inside the `modules` package.
+        info (ModuleInfo): Identity read by module discovery, if available.
+    """
+
+    def __init__(self, module_name, info=None):
+        """
+        Initializes a new LazyModule for the given module name.
+
+        Args:
+            module_name (str): The name of the module to import on first use.
+            info (ModuleInfo): Identity of the module, used to answer `name` and
+                `version` without importing it.
+        """
+        self.module_name = module_name
+        self.info = info
+        self._module = None
+
+    @property
+    def is_loaded(self):
+        """
+        Returns True once the underlying module has been imported.
+        """
+        return self._module is not None
+
+    def load(self):
+        """
+        Imports the underlying module if needed and returns it.
+
+        Returns:
+            module: The imported module.
+
+        Raises:
+            ImportError: If the module cannot be imported or if identity information is missing.
+        """
+        if self._module is None:
+            self._module = import_module(self.module_name)
+        return self._module
+
+    def __getattr__(self, attr):
+        if self._module is None and self.info is not None and attr in ("name", "version"):
+            return getattr(self.info, attr)
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyModule '{self.module_name}' ({state})>"
+
+
+def module_keys(module_name):
+    """
+    Returns the sys.modules keys of a module package and all of its submodules.
+
+    Args:
+        module_name (str): The name of the module inside the `modules` package.
+
+    Returns:
+        list: The matching sys.modules keys.
+    """
+    package = f"modules.{module_name}"
+    return [key for key in list(sys.modules) if key == package or key.startswith(f"{package}.")]
+
+
+def import_module(module_name):
+    """
+    Imports a module from the `modules` package and checks its identity information.
+
+    Args:
+        module_name (str): The name of the module to import.
+
+    Returns:
+        module: The imported module.
+
+    Raises:
+        ImportError: If the module cannot be imported or if identity information is missing.
+    """
+    module = importlib.import_module(f"modules.{module_name}")
+    if not hasattr(module, "name") or not hasattr(module, "version"):
+        raise ImportError(f"Module {module_name} is missing 'name' or 'version' information.")
+    return module
+
 
 class ModuleManager:
     """
     ModuleManager class to manage loading, unloading, and handling of modules.
 
     Attributes:
-        modules (dict): Dictionary containing loaded modules.
+        modules (dict): Dictionary containing loaded modules, or lazy proxies for registered ones.
+        profiler (StartupProfiler): Profiler recording the time spent importing each module.
+        accounting (ResourceAccounting): Rolling history of the resources used by each module run.
+        scheduler (Scheduler): Background jobs of the modules, once start_jobs() has been called.
+        notifier (Notifier): Desktop notification backend used by the jobs.
 
     Methods:
         load_module(module_name):
             Loads a module by its name.
 
+        load_modules(module_names, max_workers):
+            Loads several modules concurrently, respecting their dependencies.
+
+        register_module(module_name):
+            Registers a module to be imported on first use.
+
+        discover_modules():
+            Scans the modules package and registers every module found.
+
+        get_module(module_name):
+            Returns a module, importing it if it was registered lazily.
+
+        reload_module(module_name):
+            Re-imports a module and its submodules from source.
+
+        enable_hot_reload():
+            Starts watching loaded modules for source changes.
+
+        reload_changed_modules():
+            Reloads the modules whose source files changed.
+
         unload_module(module_name):
             Unloads a module by its name.
 
         get_modules():
             Returns a list of loaded module names.
+
+        run_module(module_name, isolated, timeout, memory_limit):
+            Runs a module's entry point, in this process or in a worker process.
+
+        submit_module(module_name, timeout, memory_limit, interactive):
+            Starts a module's entry point in a worker process without waiting for it.
+
+        start_jobs(module_names):
+            Starts the scheduler and lets modules register their background jobs.
+
+        notify(title, message):
+            Sends a desktop notification from the scheduler's workers.
+
+        shutdown(cancel):
+            Stops the scheduler and the worker processes.
     """
 
-    def __init__(self):
+    def __init__(self, profiler=None):
         """
         Initializes a new ModuleManager object with an empty dictionary for modules.
+
+        Args:
+            profiler (StartupProfiler): Optional profiler for module imports. Defaults to a disabled one.
         """
+        self.profiler = profiler or StartupProfiler()
         self.modules = {}
+        self.module_info = {}
+        self.watcher = None
+        self.runner = None
+        self.accounting = ResourceAccounting()
+        self.scheduler = None
+        self.notifier = None
+        self._job_modules = set()
+        self._lock = threading.RLock()
 
     def load_module(self, module_name):
         """
@@ -35,29 +185,507 @@ class ModuleManager:
             ImportError: If the module cannot be imported or if identity information is missing.
         """
         try:
-            module = importlib.import_module(f"modules.{module_name}")
-            if not hasattr(module, "name") or not hasattr(module, "version"):
-                raise ImportError(f"Module {module_name} is missing 'name' or 'version' information.")
-            self.modules[module_name] = module
+            with self.profiler.phase(f"import modules.{module_name}"):
+                module = import_module(module_name)
+            with self._lock:
+                self.modules[module_name] = module
+            self._watch(module_name)
             print(f"Module {module_name} loaded successfully! Name: {module.name}, Version: {module.version}")
         except ImportError as e:
             print(f"Error: Failed to load module '{module_name}': {e}. Please ensure the module exists and has 'name' and 'version' attributes.")
             raise ImportError(f"Failed to load module {module_name}: {e}")
 
+    def load_modules(self, module_names=None, max_workers=None):
+        """
+        Loads several modules on a thread pool, in dependency order.
+
+        A module can declare the modules it needs with a `dependencies` list in its
+        __init__.py; it is only imported once all of them are loaded. The list is read
+        from the discovery index, or from the module's __init__.py for modules listed
+        in config.ini, without importing them. Independent
+        modules are imported concurrently. Missing dependencies are loaded as part of
+        the batch. A failing module does not abort the batch, but the modules that
+        depend on it are reported as failed too.
+
+        Args:
+            module_names (iterable): Names of the modules to load. Defaults to every registered module.
+            max_workers (int): Maximum number of concurrent imports. Defaults to the executor's default.
+
+        Returns:
+            dict: Mapping of module name to the exception raised for every module that failed to load.
+        """
+        pending = list(module_names) if module_names is not None else self.get_modules()
+        dependencies = {}
+        while pending:
+            module_name = pending.pop()
+            if module_name in dependencies:
+                continue
+            info = self.inspect(module_name)
+            dependencies[module_name] = set(info.dependencies) if info else set()
+            pending.extend(dependencies[module_name])
+
+        dependents = {module_name: [] for module_name in dependencies}
+        for module_name, requires in dependencies.items():
+            for dependency in requires:
+                dependents[dependency].append(module_name)
+
+        failures = {}
+
+        def fail(module_name, error):
+            failures[module_name] = error
+            dependencies.pop(module_name, None)
+            for dependent in dependents[module_name]:
+                if dependent in dependencies:
+                    fail(dependent, ImportError(f"Failed to load module {dependent}: dependency '{module_name}' failed to load"))
+
+        from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+
+            def submit_ready():
+                for module_name, requires in list(dependencies.items()):
+                    if not requires:
+                        del dependencies[module_name]
+                        running[executor.submit(self.load_module, module_name)] = module_name
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    module_name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        fail(module_name, error)
+                        continue
+                    for dependent in dependents[module_name]:
+                        if dependent in dependencies:
+                            dependencies[dependent].discard(module_name)
+                submit_ready()
+
+        # Whatever is left waits on itself through a dependency cycle
+        for module_name in list(dependencies):
+            if module_name in dependencies:
+                fail(module_name, ImportError(f"Failed to load module {module_name}: circular dependency detected"))
+
+        return failures
+
+    def inspect(self, module_name):
+        """
+        Returns the identity of a module read from its __init__.py, without importing it.
+
+        Modules found by discover_modules() are already known; the others, such as
+        the modules listed in config.ini, are inspected once and remembered.
+
+        Args:
+            module_name (str): The name of the module.
+
+        Returns:
+            ModuleInfo: The module identity, or None if it cannot be read.
+        """
+        info = self.module_info.get(module_name)
+        if info is None:
+            try:
+                info = inspect_module(os.path.join(MODULES_PATH, module_name, "__init__.py"), module_name)
+            except OSError:
+                return None
+            except (SyntaxError, ValueError, TypeError) as e:
+                print(f"Warning: Failed to inspect module '{module_name}': {e}")
+                return None
+            if info is not None:
+                self.module_info[module_name] = info
+        return info
+
+    def register_module(self, module_name):
+        """
+        Registers a module without importing it. The module is imported the first
+        time it is requested through get_module() or one of its attributes is used.
+
+        Args:
+            module_name (str): The name of the module to register.
+        """
+        if module_name not in self.modules:
+            self.modules[module_name] = LazyModule(module_name, self.module_info.get(module_name))
+        self._watch(module_name)
+
+    def _watch(self, module_name):
+        if self.watcher is not None and module_name not in self.watcher.snapshots:
+            self.watcher.watch(module_name)
+
+    def discover_modules(self, modules_path=None, index_path=None):
+        """
+        Scans the modules package for modules and registers them lazily.
+
+        Module identities are cached in an on-disk index keyed by file mtime and size,
+        so nothing is imported and only changed modules are inspected again.
+
+        Args:
+            modules_path (str): Directory containing the module packages. Defaults to the `modules` package.
+            index_path (str): Path of the index file. Defaults to `.module_index.json` inside modules_path.
+
+        Returns:
+            dict: Mapping of module name to ModuleInfo for every discovered module.
+        """
+        with self.profiler.phase("discover modules"):
+            discovered = ModuleIndex(modules_path, index_path).scan()
+        self.module_info.update(discovered)
+        for module_name in discovered:
+            self.register_module(module_name)
+        return discovered
+
+    def get_module(self, module_name):
+        """
+        Returns a module by its name, importing it first if it was registered lazily.
+
+        Args:
+            module_name (str): The name of the module to return.
+
+        Returns:
+            module: The imported module.
+
+        Raises:
+            KeyError: If the module has not been loaded or registered.
+            ImportError: If a lazily registered module fails to import.
+        """
+        try:
+            return self._load_registered(module_name)
+        except ImportError as e:
+            print(f"Error: Failed to load module '{module_name}': {e}. Please ensure the module exists and has 'name' and 'version' attributes.")
+            raise ImportError(f"Failed to load module {module_name}: {e}")
+
+    def _load_registered(self, module_name):
+        module = self.modules[module_name]
+        if isinstance(module, LazyModule):
+            with self.profiler.phase(f"import modules.{module_name}"):
+                module = module.load()
+            self.modules[module_name] = module
+        return module
+
+    def reload_module(self, module_name):
+        """
+        Re-imports a module and all of its submodules from source, then swaps the new
+        version into the modules dictionary. If the new version fails to import, the
+        previous version is restored and stays in use.
+
+        Args:
+            module_name (str): The name of the module to reload.
+
+        Returns:
+            module: The reloaded module.
+
+        Raises:
+            ImportError: If the new version cannot be imported or if identity information is missing.
+        """
+        with self._lock:
+            previous = {key: sys.modules.pop(key) for key in module_keys(module_name)}
+            parent = sys.modules.get("modules")
+            importlib.invalidate_caches()
+            try:
+                with self.profiler.phase(f"reload modules.{module_name}"):
+                    module = import_module(module_name)
+            except Exception as e:
+                for key in module_keys(module_name):
+                    del sys.modules[key]
+                sys.modules.update(previous)
+                if parent is not None and f"modules.{module_name}" in previous:
+                    setattr(parent, module_name, previous[f"modules.{module_name}"])
+                print(f"Error: Failed to reload module '{module_name}': {e}. The previous version is kept.")
+                raise ImportError(f"Failed to reload module {module_name}: {e}")
+            self.modules[module_name] = module
+        print(f"Module {module_name} reloaded successfully! Name: {module.name}, Version: {module.version}")
+        if module_name in self._job_modules:
+            # Replace the jobs of the previous version with those of the new one
+            self.scheduler.cancel_owner(module_name)
+            self._register_jobs(module_name, module)
+        return module
+
+    def enable_hot_reload(self, modules_path=None):
+        """
+        Starts watching the source files of registered modules for changes.
+        Changes are picked up by reload_changed_modules().
+
+        Args:
+            modules_path (str): Directory containing the module packages. Defaults to the `modules` package.
+        """
+        from core.watcher import ModuleWatcher
+
+        self.watcher = ModuleWatcher(modules_path)
+        for module_name in self.modules:
+            self.watcher.watch(module_name)
+
+    def reload_changed_modules(self):
+        """
+        Polls the watched modules and reloads those whose source files changed.
+        Modules that were registered lazily and never used are left alone, since
+        they will be imported from the current source anyway.
+
+        Returns:
+            list: Names of the modules that were reloaded.
+        """
+        if self.watcher is None:
+            return []
+
+        reloaded = []
+        for module_name in self.watcher.poll():
+            module = self.modules.get(module_name)
+            if module is None or (isinstance(module, LazyModule) and not module.is_loaded):
+                continue
+            try:
+                self.reload_module(module_name)
+                reloaded.append(module_name)
+            except ImportError:
+                continue
+        return reloaded
+
     def unload_module(self, module_name):
         """
-        Unloads a module by its name and removes it from the loaded modules dictionary.
+        Unloads a module by its name, removes it from the loaded modules dictionary
+        and drops it and its submodules from sys.modules.
 
         Args:
             module_name (str): The name of the module to unload.
         """
         if module_name in self.modules:
             try:
-                del self.modules[module_name]
+                with self._lock:
+                    del self.modules[module_name]
+                    for key in module_keys(module_name):
+                        del sys.modules[key]
+                if self.watcher is not None:
+                    self.watcher.unwatch(module_name)
+                if module_name in self._job_modules:
+                    self._job_modules.discard(module_name)
+                    self.scheduler.cancel_owner(module_name)
                 print(f"Module {module_name} unloaded successfully!")
             except KeyError as e:
                 print(f"Failed to unload module {module_name}: {e}")
 
+    def entry_point(self, module_name):
+        """
+        Returns the name of a module's entry point function.
+
+        Args:
+            module_name (str): The name of the module.
+
+        Returns:
+            str: The entry point found by discovery, or "main".
+        """
+        info = self.module_info.get(module_name)
+        return info.entry_point if info is not None and info.entry_point else "main"
+
+    def get_runner(self, max_workers=None):
+        """
+        Returns the process runner used for isolated runs, creating it on first use.
+
+        Args:
+            max_workers (int): Maximum number of worker processes alive at once, used
+                when the runner is created. Defaults to the number of CPUs.
+
+        Returns:
+            ProcessRunner: The runner shared by every isolated run of this manager.
+        """
+        from core.isolation import ProcessRunner
+
+        with self._lock:
+            if self.runner is None:
+                self.runner = ProcessRunner(max_workers, accounting=self.accounting)
+            return self.runner
+
+    def submit_module(self, module_name, timeout=None, memory_limit=None, interactive=False):
+        """
+        Starts a module's entry point in a worker process and returns without waiting.
+
+        Several modules can run at once, each in its own process, up to the runner's
+        max_workers. The module is imported in the worker only, so nothing it
+        allocates stays in this process.
+
+        Args:
+            module_name (str): The name of a loaded or registered module.
+            timeout (float): Seconds after which the worker is terminated.
+            memory_limit (int): Address space limit of the worker in bytes.
+            interactive (bool): Give the worker access to the terminal's stdin.
+
+        Returns:
+            ModuleRun: Handle to wait for the result or cancel the run.
+
+        Raises:
+            KeyError: If the module has not been loaded or registered.
+        """
+        if module_name not in self.modules:
+            raise KeyError(module_name)
+        run = self.get_runner().submit(
+            f"modules.{module_name}", self.entry_point(module_name),
+            timeout=timeout, memory_limit=memory_limit, interactive=interactive,
+        )
+        run.future.add_done_callback(lambda _: self._record_usage(module_name, run))
+        return run
+
+    def _record_usage(self, module_name, run):
+        # Runs cancelled before their worker started have no usage
+        if run.usage is not None:
+            self.accounting.record(run.usage._replace(module_name=module_name))
+
+    def run_module(self, module_name, isolated=False, timeout=None, memory_limit=None):
+        """
+        Runs a module's entry point and returns its result.
+
+        The resources used by the run are added to the accounting history.
+
+        Args:
+            module_name (str): The name of a loaded or registered module.
+            isolated (bool): Run the entry point in a worker process, connected to the terminal.
+            timeout (float): Seconds after which an isolated run is terminated.
+            memory_limit (int): Address space limit of an isolated run in bytes.
+
+        Returns:
+            The value returned by the entry point.
+
+        Raises:
+            KeyError: If the module has not been loaded or registered.
+            ImportError: If the module fails to import in this process.
+            IsolationError: If an isolated run times out, is cancelled or fails.
+        """
+        if not isolated:
+            entry_point = getattr(self.get_module(module_name), self.entry_point(module_name))
+            with self.accounting.measure(module_name):
+                return entry_point()
+        run = self.submit_module(module_name, timeout, memory_limit, interactive=True)
+        try:
+            return run.result()
+        except KeyboardInterrupt:
+            run.cancel()
+            raise
+
+    def get_scheduler(self):
+        """
+        Returns the scheduler of background jobs, creating and starting it on first use.
+
+        Returns:
+            Scheduler: The scheduler shared by every module.
+        """
+        from core.notifications import Notifier
+        from core.scheduler import Scheduler
+
+        with self._lock:
+            if self.scheduler is None:
+                self.notifier = Notifier()
+                # Job failures go to the menu through the notification history, not onto the prompt
+                self.scheduler = Scheduler(on_error=self._report_job_error)
+                self.scheduler.start()
+            return self.scheduler
+
+    def _report_job_error(self, job, error):
+        self.notifier.record(f"Job {job.name} failed", str(error))
+
+    def _record(self, title, message):
+        # Background failures are shown by the menu instead of printed over its prompt
+        self.get_scheduler()
+        self.notifier.record(title, message)
+
+    def has_jobs(self, module_name):
+        """
+        Returns True if a module defines a register_jobs() function, without importing it when possible.
+
+        Args:
+            module_name (str): The name of the module.
+        """
+        info = self.module_info.get(module_name)
+        if info is not None:
+            return info.jobs
+        module = self.modules.get(module_name)
+        if isinstance(module, LazyModule) and not module.is_loaded:
+            info = self.inspect(module_name)
+            return info is not None and info.jobs
+        return hasattr(module, "register_jobs")
+
+    def _register_jobs(self, module_name, module):
+        register_jobs = getattr(module, "register_jobs", None)
+        if register_jobs is None:
+            return False
+        from core.scheduler import ModuleScheduler
+
+        try:
+            register_jobs(ModuleScheduler(self.get_scheduler(), module_name, self.notifier))
+        except Exception as e:
+            self.scheduler.cancel_owner(module_name)
+            self._record(f"Jobs of {module_name} not started", f"register_jobs() failed: {e}")
+            return False
+        self._job_modules.add(module_name)
+        return True
+
+    def start_jobs(self, module_names=None):
+        """
+        Starts the scheduler and calls the register_jobs(scheduler) function of every module defining one.
+
+        Modules schedule their periodic or one-shot work there instead of starting
+        their own threads. Modules found by discover_modules() without such a
+        function are not imported.
+
+        Args:
+            module_names (iterable): Names of the modules. Defaults to every loaded or registered module.
+
+        Returns:
+            list: Names of the modules whose jobs were registered.
+        """
+        started = []
+        for module_name in list(module_names if module_names is not None else self.modules):
+            if module_name in self._job_modules or not self.has_jobs(module_name):
+                continue
+            try:
+                module = self._load_registered(module_name)
+            except KeyError:
+                continue
+            except ImportError as e:
+                self._record(f"Jobs of {module_name} not started", f"The module failed to load: {e}")
+                continue
+            if self._register_jobs(module_name, module):
+                started.append(module_name)
+        return started
+
+    def start_jobs_later(self, module_names=None):
+        """
+        Calls start_jobs() from a scheduler worker instead of the calling thread.
+
+        Registering imports the modules defining jobs, so the menu schedules it
+        once it is shown rather than delaying startup. Failures are reported
+        through the notification history.
+
+        Args:
+            module_names (iterable): Names of the modules. Defaults to every loaded or registered module.
+
+        Returns:
+            Job: The one-shot registration job.
+        """
+        module_names = list(module_names) if module_names is not None else None
+        return self.get_scheduler().schedule(self.start_jobs, args=(module_names,), name="start_jobs")
+
+    def notify(self, title, message):
+        """
+        Sends a desktop notification without blocking the caller.
+
+        Args:
+            title (str): The notification title.
+            message (str): The notification body.
+        """
+        scheduler = self.get_scheduler()
+        scheduler.notify(self.notifier, title, message)
+
+    def shutdown(self, cancel=False):
+        """
+        Stops the scheduler and the worker processes of isolated runs.
+
+        Args:
+            cancel (bool): Cancel the runs in progress instead of waiting for them.
+        """
+        with self._lock:
+            runner, self.runner = self.runner, None
+            scheduler, self.scheduler = self.scheduler, None
+            self._job_modules.clear()
+        if scheduler is not None:
+            scheduler.shutdown(wait=not cancel)
+        if runner is not None:
+            runner.shutdown(cancel)
+
     def get_modules(self):
         """
         Returns a list of currently loaded module names.
@@ -0,0 +1,120 @@
+import sys
+import threading
+from collections import deque
+
+try:
+    import notify2
+except ImportError:
+    # Linux desktop notifications through D-Bus
+    notify2 = None
+
+try:
+    from win10toast import ToastNotifier
+except ImportError:
+    ToastNotifier = None
+
+APP_NAME = "ExpandCore"
+
+# Seconds a Windows toast stays visible
+TOAST_DURATION = 5
+
+# Number of notifications kept for the menu when no desktop backend is available
+HISTORY_SIZE = 20
+
+
+class Notifier:
+    """
+    Sends desktop notifications with notify2 on Linux or win10toast on Windows.
+
+    Sending can block (D-Bus calls, win10toast shows the toast for its whole
+    duration), so it should happen off the menu thread, through
+    Scheduler.notify(). Every notification is also kept in a short history,
+    which the menu shows when no desktop backend is available or the backend
+    fails.
+
+    Attributes:
+        backend (str): "notify2", "win10toast" or None.
+    """
+
+    def __init__(self, backend="auto", history_size=HISTORY_SIZE):
+        """
+        Initializes a new Notifier.
+
+        Args:
+            backend (str): "auto" to pick the backend available on this platform,
+                "notify2", "win10toast", or None to only keep the history.
+            history_size (int): Number of notifications kept for the menu.
+        """
+        if backend == "auto":
+            if sys.platform == "win32":
+                backend = "win10toast" if ToastNotifier is not None else None
+            else:
+                backend = "notify2" if notify2 is not None else None
+        self.backend = backend
+        self._history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._toaster = None
+        self._initialized = False
+
+    def _send_notify2(self, title, message):
+        if not self._initialized:
+            notify2.init(APP_NAME)
+            self._initialized = True
+        notify2.Notification(title, message).show()
+
+    def _send_win10toast(self, title, message):
+        if self._toaster is None:
+            self._toaster = ToastNotifier()
+        self._toaster.show_toast(title, message, duration=TOAST_DURATION, threaded=False)
+
+    def send(self, title, message):
+        """
+        Shows a notification. Blocks until the backend returns.
+
+        Args:
+            title (str): The notification title.
+            message (str): The notification body.
+
+        Returns:
+            bool: True if a desktop backend showed the notification.
+        """
+        delivered = False
+        with self._lock:
+            try:
+                if self.backend == "notify2":
+                    self._send_notify2(title, message)
+                    delivered = True
+                elif self.backend == "win10toast":
+                    self._send_win10toast(title, message)
+                    delivered = True
+            except Exception:
+                # No D-Bus session, no notification daemon...: fall back to the menu
+                self.backend = None
+            self._history.append((title, message, delivered))
+        return delivered
+
+    def record(self, title, message):
+        """
+        Keeps a message in the history for the menu, without sending it to the desktop.
+
+        Args:
+            title (str): The message title.
+            message (str): The message body.
+        """
+        with self._lock:
+            self._history.append((title, message, False))
+
+    def pop_undelivered(self):
+        """
+        Returns the notifications no desktop backend showed, and forgets them.
+
+        Returns:
+            list: (title, message) tuples, oldest first.
+        """
+        with self._lock:
+            undelivered = [(title, message) for title, message, delivered in self._history if not delivered]
+            self._history = deque(
+                ((title, message, delivered) for title, message, delivered in self._history if delivered),
+                maxlen=self._history.maxlen,
+            )
+        return undelivered
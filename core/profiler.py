@@ -0,0 +1,165 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_ENV = "EXPANDCORE_PROFILE"
+PROFILE_JSON_ENV = "EXPANDCORE_PROFILE_JSON"
+
+
+class StartupProfiler:
+    """
+    Records the wall time and memory delta of named startup phases.
+
+    When disabled, phase() is a no-op so the profiler can be left in place in
+    production code. Memory is measured with tracemalloc, which is only started
+    when profiling is enabled. Phases that run concurrently (for example parallel
+    module imports) share the same allocator, so their memory deltas overlap.
+
+    Attributes:
+        enabled (bool): Whether phases are recorded.
+        json_path (str): File the report is written to by finish(), if any.
+        records (list): Recorded phases, as dictionaries.
+    """
+
+    def __init__(self, enabled=False, json_path=None):
+        """
+        Initializes a new StartupProfiler.
+
+        Args:
+            enabled (bool): Whether to record phases.
+            json_path (str): Optional path of a JSON file to write the report to.
+        """
+        self.enabled = enabled or json_path is not None
+        self.json_path = json_path
+        self.records = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        # Only stop tracemalloc in finish() if it was started here
+        self._owns_tracing = self.enabled and not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+
+    @classmethod
+    def from_environment(cls, argv=None, environ=None):
+        """
+        Creates a profiler configured from the command line and the environment.
+
+        Profiling is enabled by the `--profile` flag or the EXPANDCORE_PROFILE variable.
+        A JSON report is written when `--profile-json PATH` or EXPANDCORE_PROFILE_JSON is set.
+        The profiling flags are removed from argv.
+
+        Args:
+            argv (list): Command line arguments. Defaults to sys.argv.
+            environ (dict): Environment variables. Defaults to os.environ.
+
+        Returns:
+            StartupProfiler: The configured profiler.
+        """
+        argv = sys.argv if argv is None else argv
+        environ = os.environ if environ is None else environ
+
+        enabled = environ.get(PROFILE_ENV, "").lower() not in ("", "0", "false", "no")
+        json_path = environ.get(PROFILE_JSON_ENV) or None
+
+        if "--profile" in argv:
+            argv.remove("--profile")
+            enabled = True
+        if "--profile-json" in argv:
+            index = argv.index("--profile-json")
+            if index + 1 < len(argv):
+                json_path = argv[index + 1]
+                del argv[index:index + 2]
+            else:
+                del argv[index]
+
+        return cls(enabled, json_path)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Context manager recording the wall time and memory delta of a phase.
+
+        Args:
+            name (str): The name of the phase.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        memory_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            memory_delta = tracemalloc.get_traced_memory()[0] - memory_before
+            with self._lock:
+                self.records.append({"phase": name, "seconds": seconds, "memory_delta": memory_delta})
+
+    def report(self):
+        """
+        Returns the recorded phases, slowest first, with the total startup time.
+
+        Returns:
+            dict: The report with 'total_seconds', 'peak_memory' and 'phases' keys.
+        """
+        with self._lock:
+            phases = sorted(self.records, key=lambda record: record["seconds"], reverse=True)
+        peak_memory = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+        return {
+            "total_seconds": time.perf_counter() - self._started,
+            "peak_memory": peak_memory,
+            "phases": phases,
+        }
+
+    def format_report(self, report=None):
+        """
+        Formats a report as a plain-text table.
+
+        Args:
+            report (dict): The report to format. Defaults to the current report.
+
+        Returns:
+            str: The formatted breakdown.
+        """
+        report = report or self.report()
+        width = max([len(record["phase"]) for record in report["phases"]] + [len("Phase")])
+        lines = [f"{'Phase':<{width}}  {'Time (ms)':>10}  {'Memory (KiB)':>12}"]
+        for record in report["phases"]:
+            lines.append(f"{record['phase']:<{width}}  {record['seconds'] * 1000:>10.2f}  {record['memory_delta'] / 1024:>12.1f}")
+        lines.append(f"{'Total startup':<{width}}  {report['total_seconds'] * 1000:>10.2f}  {report['peak_memory'] / 1024:>12.1f} (peak)")
+        return "\n".join(lines)
+
+    def finish(self):
+        """
+        Prints the startup breakdown and writes it as JSON if a path was configured.
+        Does nothing when profiling is disabled.
+
+        Profiling ends here: later phases are not recorded, and tracemalloc is
+        stopped if the profiler started it, so the rest of the session does not
+        run under allocation tracing.
+
+        Returns:
+            dict: The report, or None when profiling is disabled.
+        """
+        if not self.enabled:
+            return None
+
+        report = self.report()
+        self.enabled = False
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        print(self.format_report(report))
+        if self.json_path:
+            try:
+                with open(self.json_path, "w") as file:
+                    json.dump(report, file, indent=4)
+                print(f"Startup profile written to {self.json_path}")
+            except OSError as e:
+                print(f"Error: Failed to write startup profile to {self.json_path}: {e}")
+        return report
@@ -0,0 +1,314 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# Maximum number of jobs running at the same time
+MAX_WORKERS = 4
+
+
+class Job:
+    """
+    A function run by the Scheduler once or periodically.
+
+    Attributes:
+        name (str): Name of the job, used in error reports.
+        func (callable): The function to run.
+        args (tuple): Positional arguments passed to func.
+        interval (float): Seconds between two runs, or None for a one-shot job.
+        jitter (float): Up to this many seconds are added at random to each run time.
+        coalesce (bool): Run a late periodic job once instead of once per missed run.
+        owner (str): Name of the module that registered the job, if any.
+        next_run (float): time.monotonic() value of the next run.
+        runs (int): Number of completed runs.
+        missed (int): Number of runs skipped because they were late or the job was still running.
+        last_error (str): Traceback of the last run that raised, if any.
+    """
+
+    def __init__(self, func, args=(), interval=None, jitter=0.0, coalesce=True, name=None, owner=None):
+        self.func = func
+        self.args = args
+        self.interval = interval
+        self.jitter = jitter
+        self.coalesce = coalesce
+        self.name = name or getattr(func, "__name__", repr(func))
+        self.owner = owner
+        self.next_run = None
+        self.runs = 0
+        self.missed = 0
+        self.last_error = None
+        self.cancelled = False
+        self._running = False
+        self._pending = 0
+
+    @property
+    def running(self):
+        """
+        Returns True while the job is running in a worker.
+        """
+        return self._running
+
+    def __repr__(self):
+        kind = f"every {self.interval}s" if self.interval is not None else "once"
+        return f"<Job {self.name} ({kind})>"
+
+
+class Scheduler:
+    """
+    Runs jobs at given times from a single timer thread and a bounded pool of workers.
+
+    Jobs are kept in a heap ordered by their next run time. The timer thread
+    sleeps until the earliest one is due, hands it to the worker pool and
+    reschedules periodic jobs, so any number of jobs costs one thread plus at
+    most `max_workers` workers. A job never runs twice at the same time.
+
+    When a periodic job is late (the process was suspended, or every worker was
+    busy), a coalescing job runs once and skips the missed runs, while a
+    non-coalescing job runs once per missed run, one after the other.
+
+    Attributes:
+        max_workers (int): Maximum number of jobs running at the same time.
+        on_error (callable): Called with the job and the exception when a run raises.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, on_error=None):
+        """
+        Initializes a new Scheduler. Jobs only run once start() has been called.
+
+        Args:
+            max_workers (int): Maximum number of jobs running at the same time.
+            on_error (callable): Called from the worker thread with the job and the
+                exception when a run raises. Defaults to printing the error.
+        """
+        self.max_workers = max_workers
+        self.on_error = on_error
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = None
+        self._thread = None
+        self._stopped = False
+
+    def start(self):
+        """
+        Starts the timer thread and the worker pool. Does nothing if already started.
+        """
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="scheduler-job")
+            self._thread = threading.Thread(target=self._timer_loop, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def schedule(self, func, interval=None, delay=None, args=(), jitter=0.0, coalesce=True, name=None, owner=None):
+        """
+        Adds a job.
+
+        Args:
+            func (callable): The function to run. Exceptions it raises are reported and
+                stored in Job.last_error; they do not stop a periodic job.
+            interval (float): Seconds between two runs, or None to run the job once.
+            delay (float): Seconds before the first run. Defaults to interval, or 0 for a one-shot job.
+            args (tuple): Positional arguments passed to func.
+            jitter (float): Up to this many seconds added at random to each run, so jobs
+                registered together do not all wake up at the same time.
+            coalesce (bool): Run a late periodic job once instead of once per missed run.
+            name (str): Name of the job. Defaults to the function name.
+            owner (str): Name of the module registering the job, see cancel_owner().
+
+        Returns:
+            Job: The scheduled job.
+
+        Raises:
+            ValueError: If interval is not positive.
+        """
+        if interval is not None and interval <= 0:
+            raise ValueError(f"Job interval must be positive, got {interval}.")
+        job = Job(func, args, interval, jitter, coalesce, name, owner)
+        if delay is None:
+            delay = interval or 0
+        with self._condition:
+            self._push(job, time.monotonic() + delay)
+        return job
+
+    def notify(self, notifier, title, message):
+        """
+        Sends a desktop notification from a worker, so the caller never waits for the backend.
+
+        Args:
+            notifier (Notifier): The notification backend.
+            title (str): The notification title.
+            message (str): The notification body.
+
+        Returns:
+            Job: The one-shot job sending the notification.
+        """
+        return self.schedule(notifier.send, args=(title, message), name="notification")
+
+    def cancel(self, job):
+        """
+        Cancels a job. A run already in progress is not interrupted.
+
+        Args:
+            job (Job): The job to cancel.
+        """
+        with self._condition:
+            job.cancelled = True
+            # The heap entry is dropped when it comes up
+            self._condition.notify()
+
+    def cancel_owner(self, owner):
+        """
+        Cancels every job registered by a module.
+
+        Args:
+            owner (str): Name of the module.
+
+        Returns:
+            int: Number of jobs cancelled.
+        """
+        with self._condition:
+            jobs = [job for _, _, job in self._heap if job.owner == owner and not job.cancelled]
+            for job in jobs:
+                job.cancelled = True
+            self._condition.notify()
+        return len(jobs)
+
+    def jobs(self, owner=None):
+        """
+        Returns the scheduled jobs, earliest first.
+
+        Args:
+            owner (str): Only return the jobs of this module.
+
+        Returns:
+            list: Job objects.
+        """
+        with self._condition:
+            entries = sorted(self._heap)
+        return [job for _, _, job in entries if not job.cancelled and (owner is None or job.owner == owner)]
+
+    def shutdown(self, wait=True):
+        """
+        Stops the timer thread and the worker pool. Pending jobs are dropped.
+
+        Args:
+            wait (bool): Wait for the jobs in progress to finish.
+        """
+        with self._condition:
+            self._stopped = True
+            self._heap.clear()
+            thread, self._thread = self._thread, None
+            executor, self._executor = self._executor, None
+            self._condition.notify()
+        if thread is not None:
+            thread.join()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _push(self, job, when):
+        if job.jitter:
+            when += random.uniform(0, job.jitter)
+        job.next_run = when
+        heapq.heappush(self._heap, (when, next(self._counter), job))
+        # Wake the timer thread up in case this job is due before the one it waits for
+        self._condition.notify()
+
+    def _timer_loop(self):
+        with self._condition:
+            while not self._stopped:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                when, _, job = self._heap[0]
+                if job.cancelled:
+                    heapq.heappop(self._heap)
+                    continue
+                now = time.monotonic()
+                if when > now:
+                    self._condition.wait(when - now)
+                    continue
+                heapq.heappop(self._heap)
+                self._dispatch(job)
+                if job.interval is not None:
+                    self._push(job, self._next_time(job, when, now))
+
+    def _next_time(self, job, when, now):
+        when += job.interval
+        if job.coalesce and when <= now:
+            # Skip the runs missed while the job was late
+            missed = int((now - when) // job.interval) + 1
+            job.missed += missed
+            when += missed * job.interval
+        return when
+
+    def _dispatch(self, job):
+        if job._running:
+            if job.coalesce:
+                job.missed += 1
+            else:
+                job._pending += 1
+            return
+        job._running = True
+        job._pending = 1
+        self._executor.submit(self._execute, job)
+
+    def _report_error(self, job, error):
+        if self.on_error is None:
+            print(f"Error: Job {job.name} failed: {error}")
+            return
+        try:
+            self.on_error(job, error)
+        except Exception:
+            # A failing error handler must not stop the worker
+            pass
+
+    def _execute(self, job):
+        while True:
+            try:
+                job.func(*job.args)
+                job.last_error = None
+            except Exception as e:
+                job.last_error = traceback.format_exc()
+                self._report_error(job, e)
+            with self._condition:
+                job.runs += 1
+                job._pending -= 1
+                if job._pending <= 0 or job.cancelled or self._stopped:
+                    job._running = False
+                    job._pending = 0
+                    return
+
+
+class ModuleScheduler:
+    """
+    View of the Scheduler given to a module's register_jobs() function.
+
+    Jobs scheduled through it are owned by the module, so they are cancelled when
+    the module is unloaded or reloaded.
+
+    Attributes:
+        module_name (str): The module owning the jobs.
+    """
+
+    def __init__(self, scheduler, module_name, notifier):
+        self._scheduler = scheduler
+        self._notifier = notifier
+        self.module_name = module_name
+
+    def schedule(self, func, interval=None, delay=None, args=(), jitter=0.0, coalesce=True, name=None):
+        """
+        Adds a job owned by the module. See Scheduler.schedule().
+        """
+        name = f"{self.module_name}.{name or getattr(func, '__name__', 'job')}"
+        return self._scheduler.schedule(func, interval, delay, args, jitter, coalesce, name, self.module_name)
+
+    def notify(self, title, message):
+        """
+        Sends a desktop notification without blocking the caller.
+        """
+        return self._scheduler.notify(self._notifier, title, message)
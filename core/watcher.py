@@ -0,0 +1,84 @@
+import os
+from core.discovery import MODULES_PATH
+
+
+def snapshot_sources(module_path):
+    """
+    Returns the modification time of every Python source file of a module.
+
+    Args:
+        module_path (str): Directory of the module package.
+
+    Returns:
+        dict: Mapping of file path to mtime in nanoseconds.
+    """
+    snapshot = {}
+    pending = [module_path]
+    while pending:
+        try:
+            entries = list(os.scandir(pending.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name != "__pycache__":
+                    pending.append(entry.path)
+            elif entry.name.endswith(".py"):
+                try:
+                    snapshot[entry.path] = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+    return snapshot
+
+
+class ModuleWatcher:
+    """
+    Detects changes to module source files by polling their modification times.
+
+    Attributes:
+        modules_path (str): Directory containing the module packages.
+        snapshots (dict): Last known source snapshot of every watched module.
+    """
+
+    def __init__(self, modules_path=None):
+        """
+        Initializes a new ModuleWatcher.
+
+        Args:
+            modules_path (str): Directory containing the module packages. Defaults to the `modules` package.
+        """
+        self.modules_path = modules_path or MODULES_PATH
+        self.snapshots = {}
+
+    def watch(self, module_name):
+        """
+        Starts watching a module, taking the current state of its files as reference.
+
+        Args:
+            module_name (str): The name of the module to watch.
+        """
+        self.snapshots[module_name] = snapshot_sources(os.path.join(self.modules_path, module_name))
+
+    def unwatch(self, module_name):
+        """
+        Stops watching a module.
+
+        Args:
+            module_name (str): The name of the module to stop watching.
+        """
+        self.snapshots.pop(module_name, None)
+
+    def poll(self):
+        """
+        Checks every watched module for added, removed or modified source files.
+
+        Returns:
+            list: Names of the modules that changed since the previous poll.
+        """
+        changed = []
+        for module_name, previous in self.snapshots.items():
+            current = snapshot_sources(os.path.join(self.modules_path, module_name))
+            if current != previous:
+                self.snapshots[module_name] = current
+                changed.append(module_name)
+        return changed
@@ -1,10 +1,19 @@
 import os
 import sys
-from core.manager import ModuleManager
-from config import MODULES, MAX_ATTEMPTS, START_INDEX
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+from core.profiler import StartupProfiler
+
+# Enabled with --profile / --profile-json PATH or EXPANDCORE_PROFILE / EXPANDCORE_PROFILE_JSON
+profiler = StartupProfiler.from_environment()
+
+with profiler.phase("import core.manager"):
+    from core.manager import ModuleManager
+with profiler.phase("load config"):
+    from config import MODULES, MAX_ATTEMPTS, START_INDEX, LAZY_LOADING, AUTO_DISCOVER, HOT_RELOAD
+    from config import ISOLATE_MODULES, MODULE_TIMEOUT, MODULE_MEMORY_LIMIT, RESOURCE_JSON, BACKGROUND_JOBS
+with profiler.phase("import rich"):
+    from rich.console import Console
+    from rich.table import Table
+    from rich.panel import Panel
 
 console = Console()
 
@@ -34,41 +43,146 @@ def display_modules_table(modules):
     console.print(table)
     return True
 
+def display_resource_table(accounting):
+    """Display the resources used by the modules run during this session."""
+    summary = accounting.summary()
+    if not summary:
+        return
+
+    console.print("\n[bold cyan]Resource Usage:[/bold cyan]")
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Module", justify="left")
+    table.add_column("Runs", justify="right")
+    table.add_column("Wall (s)", justify="right")
+    table.add_column("CPU (s)", justify="right")
+    table.add_column("RSS peak (MiB)", justify="right")
+    table.add_column("RSS growth (MiB)", justify="right")
+    table.add_column("FD growth", justify="right")
+    table.add_column("Threads", justify="right")
+
+    for module, usage in summary.items():
+        table.add_row(
+            module,
+            f"{usage['runs']} ({usage['failures']} failed)" if usage["failures"] else str(usage["runs"]),
+            f"{usage['wall_seconds']:.2f}",
+            f"{usage['cpu_seconds']:.2f}",
+            f"{usage['rss_peak'] / 1024 ** 2:.1f}",
+            f"{usage['rss_delta'] / 1024 ** 2:+.1f}",
+            f"{usage['fds_delta']:+d}",
+            str(usage["threads"]),
+        )
+
+    console.print(table)
+
+def display_notifications(notifier):
+    """Display the notifications sent by background jobs that no desktop backend could show."""
+    if notifier is None:
+        return
+    for title, message in notifier.pop_undelivered():
+        console.print(Panel(message, title=f"[bold yellow]{title}[/bold yellow]"))
+
+def exit_session(manager, code):
+    """Stop the worker processes, write the resource usage report if configured and exit."""
+    manager.shutdown(cancel=True)
+    if RESOURCE_JSON and manager.accounting.dump(RESOURCE_JSON):
+        console.print(f"[bold blue]Resource usage written to {RESOURCE_JSON}[/bold blue]")
+    sys.exit(code)
+
+def run_isolated(manager, module_name):
+    """Run a module's entry point in a worker process, reporting timeouts and failures."""
+    from core.isolation import IsolationError
+
+    console.print(f"[bold cyan]Launching module in a worker process: {module_name}[/bold cyan]")
+    try:
+        manager.run_module(
+            module_name,
+            isolated=True,
+            timeout=MODULE_TIMEOUT or None,
+            memory_limit=MODULE_MEMORY_LIMIT * 1024 * 1024 or None,
+        )
+    except KeyboardInterrupt:
+        console.print(f"[bold yellow]Module {module_name} was cancelled.[/bold yellow]")
+    except (KeyError, IsolationError) as e:
+        console.print(f"[bold red]Module {module_name} failed: {e}[/bold red]")
+        pause_for_error()
+        return False
+    return True
+
 def main():
     # Initialize the ModuleManager and load modules
-    manager = ModuleManager()
-    for module in MODULES.values():
-        manager.load_module(module)
+    # In lazy mode, modules are only imported when they are first selected
+    manager = ModuleManager(profiler)
+    if AUTO_DISCOVER:
+        # Build the menu from the cached module index instead of config.ini
+        modules = {str(i + START_INDEX): module for i, module in enumerate(manager.discover_modules())}
+    else:
+        modules = MODULES
+    # A profiled startup imports every module so the report shows their import times
+    if LAZY_LOADING and not profiler.enabled:
+        for module in modules.values():
+            manager.register_module(module)
+    else:
+        failures = manager.load_modules(modules.values())
+        for module, error in failures.items():
+            console.print(f"[bold red]Module {module} could not be loaded: {error}[/bold red]")
 
-    if not MODULES:
+    if not modules:
         console.print(Panel("[bold red]No modules have been configured in MODULES![/bold red]", title="[bold yellow]Error[/bold yellow]"))
         sys.exit(1)
 
+    if profiler.finish() is not None:
+        pause_for_error()
+
+    if HOT_RELOAD:
+        manager.enable_hot_reload()
+
+    # Reminders and maintenance run on the scheduler's threads, never on the menu thread.
+    # Registering them imports their modules, so isolated mode, where modules are only
+    # imported in workers, does not run them.
+    jobs_pending = BACKGROUND_JOBS and not ISOLATE_MODULES
+
     attempts = 0  # Track invalid attempts
 
     # Main menu loop
     while attempts < MAX_ATTEMPTS:
+        # Pick up module source changes made while the previous module was running
+        manager.reload_changed_modules()
         clear_console()
-        if not display_modules_table(MODULES):
+        if not display_modules_table(modules):
             sys.exit(1)
+        display_resource_table(manager.accounting)
+        display_notifications(manager.notifier)
+        if jobs_pending:
+            # Import the modules with jobs while the first menu waits for input
+            manager.start_jobs_later(modules.values())
+            jobs_pending = False
 
-        choice = console.input(f"\n[bold yellow]Select a module to run or {START_INDEX + len(MODULES)} to exit:[/bold yellow] ")
+        choice = console.input(f"\n[bold yellow]Select a module to run or {START_INDEX + len(modules)} to exit:[/bold yellow] ")
         try:
             if choice.isdigit():
                 choice = int(choice)
-                if START_INDEX <= choice < START_INDEX + len(MODULES):
-                    module_name = list(MODULES.values())[choice - START_INDEX]
-                    if module_name in manager.modules:
+                if START_INDEX <= choice < START_INDEX + len(modules):
+                    module_name = list(modules.values())[choice - START_INDEX]
+                    if ISOLATE_MODULES:
+                        # The module is only imported in the worker, never in this process
+                        if run_isolated(manager, module_name):
+                            attempts = 0
+                        continue
+                    try:
+                        module = manager.get_module(module_name)
+                    except (KeyError, ImportError):
+                        module = None
+                    if module is not None:
                         # Run the module's main function
                         console.print(f"[bold cyan]Launching module: {module_name}[/bold cyan]")
-                        manager.modules[module_name].main()
+                        manager.run_module(module_name)
                         attempts = 0  # Reset attempts after a successful execution
                     else:
                         console.print("[bold red]The module is not loaded properly.[/bold red]")
                         pause_for_error()
-                elif choice == START_INDEX + len(MODULES):
+                elif choice == START_INDEX + len(modules):
                     console.print("[bold yellow]Exiting the menu. Goodbye![/bold yellow]")
-                    sys.exit(0)
+                    exit_session(manager, 0)
                 else:
                     raise ValueError
             else:
@@ -79,7 +193,7 @@ def main():
             pause_for_error()
 
     console.print("[bold yellow]Maximum attempts reached. Exiting the program.[/bold yellow]")
-    sys.exit(1)
+    exit_session(manager, 1)
 
 if __name__ == '__main__':
     main()
@@ -1,13 +1,20 @@
 name = "url_todo_list"
 version = "1.0.0"
 
-from .module_runner import run
-
 def main():
     """
     Entry point for the module. This function initializes and launches the main menu.
     """
+    # Imported here so the headless CLI can use the package without loading rich
+    from .module_runner import run
     run()
 
+def register_jobs(scheduler):
+    """
+    Registers the background jobs of the module: stale URL reminders and database maintenance.
+    """
+    from .jobs import register_jobs
+    register_jobs(scheduler)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
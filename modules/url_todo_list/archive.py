@@ -0,0 +1,240 @@
+import os
+from collections import namedtuple
+from contextlib import contextmanager
+from modules.url_todo_list.bulk import bulk_conditions
+from modules.url_todo_list.cache import invalidate
+from modules.url_todo_list.connection import is_memory_database
+from modules.url_todo_list.repository import URL_COLUMNS, ITER_BATCH_SIZE, filter_conditions, make_record, where_clause
+
+# Rows moved per transaction, so the writer lock is released regularly during a large archive
+ARCHIVE_BATCH_SIZE = 5000
+
+# Schema name of the archive database while it is attached
+ARCHIVE_SCHEMA = "archive"
+
+# Columns copied between the urls tables of the two databases
+ARCHIVED_COLUMNS = ("id", "url", "description", "category", "status", "timestamp", "url_hash",
+                    "http_status", "final_url", "check_error", "checked_at")
+
+# Archived rows keep their id. url is not unique, as a URL added again after being
+# archived may be archived a second time under another id.
+ARCHIVE_TABLE_SQL = f'''
+CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.urls (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    description TEXT,
+    category TEXT,
+    status BOOLEAN NOT NULL DEFAULT 0,
+    timestamp DATETIME,
+    url_hash INTEGER,
+    http_status INTEGER,
+    final_url TEXT,
+    check_error TEXT,
+    checked_at DATETIME,
+    archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+)'''
+
+ARCHIVE_INDEXES_SQL = (
+    f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_urls_url_hash ON urls(url_hash)",
+    f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_urls_category ON urls(category)",
+)
+
+COPY_COLUMNS = ", ".join(ARCHIVED_COLUMNS)
+
+# Rows of the archive that are the exact copy of an active row
+SAME_ROW = " AND ".join(f"m.{column} IS a.{column}" for column in ARCHIVED_COLUMNS[1:])
+
+SELECT_ARCHIVED_SQL = f"SELECT {', '.join(URL_COLUMNS)} FROM {ARCHIVE_SCHEMA}.urls"
+
+# Active and archived URLs in ID order. A row copied to the archive but not deleted
+# from urls yet only appears once.
+SELECT_ALL_URLS_SQL = f'''
+SELECT {', '.join(URL_COLUMNS)} FROM main.urls
+UNION ALL
+SELECT {', '.join(URL_COLUMNS)} FROM {ARCHIVE_SCHEMA}.urls WHERE id NOT IN (SELECT id FROM main.urls)
+ORDER BY id'''
+
+# matched: rows selected by the filter; moved: rows actually moved (none in a dry run);
+# freed_pages: database pages returned to the file system by the incremental vacuum
+ArchiveResult = namedtuple("ArchiveResult", ["matched", "moved", "freed_pages", "dry_run"])
+
+
+def archive_path(db_file):
+    """Return the default archive database of a database file: todos.db -> todos.archive.db"""
+    root, extension = os.path.splitext(db_file)
+    return f"{root}.archive{extension or '.db'}"
+
+
+def default_archive_file(conn):
+    """Return the archive database next to the main database of a connection, or None in memory"""
+    for _, name, path in conn.execute("PRAGMA database_list"):
+        if name == "main":
+            return archive_path(path) if path and not is_memory_database(path) else None
+    return None
+
+
+def is_attached(conn, schema=ARCHIVE_SCHEMA):
+    """Return True if a database is attached under `schema`"""
+    return any(name == schema for _, name, _ in conn.execute("PRAGMA database_list"))
+
+
+@contextmanager
+def attached_archive(conn, archive_file=None):
+    """Attach the archive database for the duration of the block, creating it if needed.
+
+    ATTACH and DETACH cannot run inside a transaction, so pending changes are
+    committed first. The archive uses incremental auto_vacuum from its creation.
+    Nested blocks reuse the attachment of the outer one.
+    """
+    if is_attached(conn):
+        yield ARCHIVE_SCHEMA
+        return
+    archive_file = archive_file or default_archive_file(conn)
+    if archive_file is None:
+        raise ValueError("An in-memory database needs an explicit archive file")
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (archive_file,))
+    try:
+        conn.execute(f"PRAGMA {ARCHIVE_SCHEMA}.auto_vacuum = INCREMENTAL")
+        conn.execute(f"PRAGMA {ARCHIVE_SCHEMA}.journal_mode = WAL")
+        conn.execute(f"PRAGMA {ARCHIVE_SCHEMA}.synchronous = NORMAL")
+        conn.execute(ARCHIVE_TABLE_SQL)
+        for sql in ARCHIVE_INDEXES_SQL:
+            conn.execute(sql)
+        conn.commit()
+        yield ARCHIVE_SCHEMA
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+
+
+def incremental_vacuum(conn, schema="main", pages=None):
+    """Return the free pages of a database to the file system. Returns the number of pages freed.
+
+    auto_vacuum can only be switched on from NONE by a full VACUUM, so a database
+    created before it was enabled is rebuilt once; later calls only truncate the
+    free pages, which is fast. Must be called outside a transaction.
+    """
+    before = conn.execute(f"PRAGMA {schema}.freelist_count").fetchone()[0]
+    if conn.execute(f"PRAGMA {schema}.auto_vacuum").fetchone()[0] == 0:
+        conn.execute(f"PRAGMA {schema}.auto_vacuum = INCREMENTAL")
+        conn.execute(f"VACUUM {schema}")
+    else:
+        # execute() steps a pragma once, which frees a single page; a script runs it to completion
+        limit = f"({int(pages)})" if pages else ""
+        conn.executescript(f"PRAGMA {schema}.incremental_vacuum{limit}")
+    return before - conn.execute(f"PRAGMA {schema}.freelist_count").fetchone()[0]
+
+
+def move_batches(conn, source, target, conditions, params, batch_size):
+    """Move the rows of source.urls matching the conditions to target.urls. Returns the number moved.
+
+    Every batch is copied in one transaction and deleted from the source in the next.
+    A transaction spanning two WAL databases is not atomic across them, so rows are
+    never deleted before their copy is committed: an interruption can only leave a
+    duplicate, which the next run replaces. Rows modified between the two steps no
+    longer match their copy and stay in the source.
+    """
+    where = where_clause(conditions + ["id > ?"])
+    moved = 0
+    last_id = 0
+    while True:
+        ids = conn.execute(f"SELECT id FROM {source}.urls{where} ORDER BY id LIMIT ?",
+                           params + [last_id, batch_size]).fetchall()
+        if not ids:
+            return moved
+        batch_where = where + " AND id <= ?"
+        batch_params = params + [last_id, ids[-1][0]]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"INSERT OR REPLACE INTO {target}.urls({COPY_COLUMNS}) "
+                         f"SELECT {COPY_COLUMNS} FROM {source}.urls{batch_where}", batch_params)
+            conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+            cur = conn.execute(f'''
+                DELETE FROM {source}.urls WHERE id IN (
+                    SELECT m.id FROM {source}.urls m JOIN {target}.urls a ON a.id = m.id
+                    WHERE m.id > ? AND m.id <= ? AND {SAME_ROW})''', (last_id, ids[-1][0]))
+            moved += cur.rowcount
+            conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            invalidate(conn)
+        last_id = ids[-1][0]
+
+
+def archive_urls(conn, url_filter, archive_file=None, batch_size=ARCHIVE_BATCH_SIZE, dry_run=False, vacuum=True):
+    """Move the URLs matching a URLFilter to the archive database, then vacuum the freed pages.
+
+    The urls table, its indexes and its search tables shrink to the active rows, so
+    they stay in the page cache. Triggers keep url_stats and the search index in
+    sync as for any delete. In a dry run only the matching rows are counted.
+    """
+    conditions, params = bulk_conditions(conn, url_filter)
+    if dry_run:
+        matched = conn.execute("SELECT COUNT(*) FROM urls" + where_clause(conditions), params).fetchone()[0]
+        return ArchiveResult(matched, 0, 0, True)
+    with attached_archive(conn, archive_file):
+        # Unqualified tables in the filter resolve to the main database
+        moved = move_batches(conn, "main", ARCHIVE_SCHEMA, conditions, params, batch_size)
+    freed = incremental_vacuum(conn) if vacuum and moved else 0
+    return ArchiveResult(moved, moved, freed, False)
+
+
+def restore_urls(conn, status=None, category=None, archive_file=None, batch_size=ARCHIVE_BATCH_SIZE):
+    """Move archived URLs back to the urls table. Returns the number of URLs restored.
+
+    Archived URLs whose canonical form was added again in the meantime stay archived.
+    """
+    conditions, params = filter_conditions(status, category)
+    conditions.append("url_hash NOT IN (SELECT url_hash FROM main.urls WHERE url_hash IS NOT NULL)")
+    with attached_archive(conn, archive_file):
+        restored = move_batches(conn, ARCHIVE_SCHEMA, "main", conditions, params, batch_size)
+        if restored:
+            incremental_vacuum(conn, ARCHIVE_SCHEMA)
+    return restored
+
+
+def iter_archived_urls(conn, status=None, category=None, archive_file=None, batch_size=ITER_BATCH_SIZE):
+    """Yield the archived URLs matching the filters in ID order, as URLRecord rows"""
+    if not os.path.exists(archive_file or default_archive_file(conn) or ""):
+        return
+    conditions, params = filter_conditions(status, category)
+    with attached_archive(conn, archive_file):
+        yield from iter_query(conn, SELECT_ARCHIVED_SQL + where_clause(conditions) + " ORDER BY id", params, batch_size)
+
+
+def iter_all_urls(conn, archive_file=None, batch_size=ITER_BATCH_SIZE):
+    """Yield the active and the archived URLs together in ID order, as URLRecord rows"""
+    if not os.path.exists(archive_file or default_archive_file(conn) or ""):
+        yield from iter_query(conn, "SELECT " + ", ".join(URL_COLUMNS) + " FROM urls ORDER BY id", [], batch_size)
+        return
+    with attached_archive(conn, archive_file):
+        yield from iter_query(conn, SELECT_ALL_URLS_SQL, [], batch_size)
+
+
+def iter_query(conn, sql, params, batch_size):
+    """Yield the rows of a query as URLRecord rows, fetching them in batches"""
+    cur = conn.execute(sql, params)
+    try:
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from map(make_record, rows)
+    finally:
+        # DETACH fails while a statement still reads the archive
+        cur.close()
+
+
+def count_archived_urls(conn, archive_file=None):
+    """Return the number of archived URLs, 0 when there is no archive yet"""
+    if not os.path.exists(archive_file or default_archive_file(conn) or ""):
+        return 0
+    with attached_archive(conn, archive_file):
+        return conn.execute(f"SELECT COUNT(*) FROM {ARCHIVE_SCHEMA}.urls").fetchone()[0]
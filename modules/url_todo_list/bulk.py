@@ -0,0 +1,129 @@
+from collections import namedtuple
+from modules.url_todo_list.cache import invalidate
+from modules.url_todo_list.migrations import table_exists
+from modules.url_todo_list.repository import SELECT_URLS_SQL, make_record, where_clause
+from modules.url_todo_list.search import build_match_query, escape_like
+
+# Rows shown by a dry run
+PREVIEW_SIZE = 10
+
+# Selection of URLs for a bulk operation; None fields do not filter. IDs and times are inclusive.
+# Times are UTC, like the timestamp column; an end_time without a time of day covers that whole day.
+URLFilter = namedtuple("URLFilter", ["status", "category", "min_id", "max_id", "start_time", "end_time", "search"],
+                       defaults=[None] * 7)
+
+# matched: rows selected by the filter; changed: rows actually modified (or that would be, in a dry run)
+BulkResult = namedtuple("BulkResult", ["matched", "changed", "preview", "dry_run"])
+
+
+def filter_is_empty(url_filter):
+    """Return True if the filter selects every URL"""
+    return all(value is None for value in url_filter)
+
+
+def is_date(value):
+    """Check if a time filter is a date alone (YYYY-MM-DD), without a time of day"""
+    return isinstance(value, str) and len(value.strip()) == len("YYYY-MM-DD")
+
+
+def bulk_conditions(conn, url_filter):
+    """Return the WHERE conditions and parameters selecting the URLs of a filter"""
+    conditions = []
+    params = []
+    if url_filter.status is not None:
+        conditions.append("status = ?")
+        params.append(url_filter.status)
+    if url_filter.category is not None:
+        conditions.append("category = ?")
+        params.append(url_filter.category)
+    if url_filter.min_id is not None:
+        conditions.append("id >= ?")
+        params.append(url_filter.min_id)
+    if url_filter.max_id is not None:
+        conditions.append("id <= ?")
+        params.append(url_filter.max_id)
+    if url_filter.start_time is not None:
+        conditions.append("timestamp >= ?")
+        params.append(url_filter.start_time)
+    if url_filter.end_time is not None:
+        # Timestamps compare as text, so a bare date would stop at midnight
+        conditions.append("timestamp < date(?, '+1 day')" if is_date(url_filter.end_time) else "timestamp <= ?")
+        params.append(url_filter.end_time)
+    if url_filter.search is not None:
+        match = build_match_query(url_filter.search)
+        if not match:
+            # No word to look for: nothing matches
+            conditions.append("0")
+        elif table_exists(conn, "urls_fts"):
+            conditions.append("id IN (SELECT rowid FROM urls_fts WHERE urls_fts MATCH ?)")
+            params.append(match)
+        else:
+            pattern = f"%{escape_like(url_filter.search.strip())}%"
+            conditions.append("(url LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\' OR category LIKE ? ESCAPE '\\')")
+            params.extend([pattern] * 3)
+    return conditions, params
+
+
+def preview(conn, where, params, limit=PREVIEW_SIZE):
+    """Return the first records selected by a WHERE clause"""
+    cur = conn.execute(SELECT_URLS_SQL + where + " ORDER BY id LIMIT ?", params + [limit])
+    return list(map(make_record, cur))
+
+
+def apply_bulk(conn, url_filter, assignments=None, dry_run=False, commit=True):
+    """Update the filtered URLs with `assignments` ({column: value}), or delete them when None.
+
+    The count and the change run in one transaction, as a single set-based statement,
+    so triggers and indexes are maintained once per row without a round trip per URL.
+    Rows already holding the new values are not rewritten. In a dry run nothing is
+    written and the first matching rows are returned as a preview.
+    """
+    conditions, params = bulk_conditions(conn, url_filter)
+    where = where_clause(conditions)
+
+    # Only rewrite the rows whose values actually change
+    change_conditions = list(conditions)
+    change_params = list(params)
+    if assignments:
+        change_conditions.append("(" + " OR ".join(f"{column} IS NOT ?" for column in assignments) + ")")
+        change_params.extend(assignments.values())
+    change_where = where_clause(change_conditions)
+
+    started = not conn.in_transaction
+    if started and not dry_run:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        matched = conn.execute("SELECT COUNT(*) FROM urls" + where, params).fetchone()[0]
+        if dry_run:
+            changed = conn.execute("SELECT COUNT(*) FROM urls" + change_where, change_params).fetchone()[0]
+            return BulkResult(matched, changed, preview(conn, where, params), True)
+        if assignments:
+            columns = ", ".join(f"{column} = ?" for column in assignments)
+            cur = conn.execute(f"UPDATE urls SET {columns}" + change_where, list(assignments.values()) + change_params)
+        else:
+            cur = conn.execute("DELETE FROM urls" + where, params)
+        changed = cur.rowcount
+        invalidate(conn)
+        if commit:
+            conn.commit()
+    except BaseException:
+        if started and conn.in_transaction:
+            conn.rollback()
+            invalidate(conn)
+        raise
+    return BulkResult(matched, changed, [], False)
+
+
+def bulk_set_status(conn, url_filter, status, dry_run=False, commit=True):
+    """Mark the filtered URLs as read or unread"""
+    return apply_bulk(conn, url_filter, {"status": bool(status)}, dry_run, commit)
+
+
+def bulk_set_category(conn, url_filter, category, dry_run=False, commit=True):
+    """Move the filtered URLs to another category"""
+    return apply_bulk(conn, url_filter, {"category": category}, dry_run, commit)
+
+
+def bulk_delete(conn, url_filter, dry_run=False, commit=True):
+    """Delete the filtered URLs"""
+    return apply_bulk(conn, url_filter, None, dry_run, commit)
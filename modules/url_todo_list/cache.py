@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+
+# Number of distinct queries remembered per connection
+CACHE_SIZE = 64
+
+# Total number of rows kept per connection, across every cached result
+MAX_CACHED_ROWS = 50000
+
+
+class QueryCache:
+    """
+    Size-bounded LRU cache of query results for one connection.
+
+    The least recently used entries are evicted when there are more than
+    max_entries of them or when they hold more than max_rows rows in total.
+    A result larger than max_rows on its own is not kept.
+
+    Entries are only valid for the state of the database they were read from,
+    identified by a token made of:
+
+    - the generation counter, bumped by the write paths through invalidate()
+    - the total number of rows changed by the connection, which covers writes
+      made without going through those paths (imports, migrations)
+    - PRAGMA data_version, which changes when another connection commits
+
+    Any change of the token drops every entry, so a stale result is never returned.
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE, max_rows=MAX_CACHED_ROWS):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.rows = 0
+        self._entries = OrderedDict()
+        self._token = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def invalidate(self):
+        """Drop every entry, after a write"""
+        with self._lock:
+            self.generation += 1
+            self._clear()
+
+    def _clear(self):
+        self._entries.clear()
+        self.rows = 0
+
+    def _store(self, key, rows):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.rows -= len(previous)
+        self._entries[key] = rows
+        self.rows += len(rows)
+        while len(self._entries) > self.max_entries or self.rows > self.max_rows:
+            self.rows -= len(self._entries.popitem(last=False)[1])
+
+    def current_token(self, conn):
+        """Identify the state of the database as seen by the connection"""
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        return (self.generation, conn.total_changes, data_version)
+
+    def fetchall(self, conn, sql, params=(), factory=None):
+        """Return the rows of a query, built with factory if given, from the cache when the database did not change"""
+        key = (sql, tuple(params), factory)
+        token = self.current_token(conn)
+        with self._lock:
+            if token != self._token:
+                self._clear()
+                self._token = token
+            rows = self._entries.get(key)
+            if rows is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(rows)
+            self.misses += 1
+
+        rows = conn.execute(sql, params).fetchall()
+        if factory is not None:
+            rows = list(map(factory, rows))
+        if len(rows) <= self.max_rows:
+            with self._lock:
+                if self._token == token:
+                    self._store(key, tuple(rows))
+        return rows
+
+
+def get_query_cache(conn):
+    """Return the query cache of a connection, or None if it cannot hold one"""
+    cache = getattr(conn, "query_cache", None)
+    if cache is None:
+        try:
+            cache = conn.query_cache = QueryCache()
+        except AttributeError:
+            # Plain sqlite3 connections do not accept new attributes
+            return None
+    return cache
+
+
+def cached_fetchall(conn, sql, params=(), factory=None):
+    """Run a read query through the connection's cache when it has one, building rows with factory if given"""
+    cache = get_query_cache(conn)
+    if cache is not None:
+        return cache.fetchall(conn, sql, params, factory)
+    rows = conn.execute(sql, params).fetchall()
+    return rows if factory is None else list(map(factory, rows))
+
+
+def invalidate(conn):
+    """Invalidate the cached results of a connection after a write"""
+    cache = getattr(conn, "query_cache", None)
+    if cache is not None:
+        cache.invalidate()
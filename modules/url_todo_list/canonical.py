@@ -0,0 +1,81 @@
+import hashlib
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid",
+    "mc_cid", "mc_eid", "igshid", "_ga", "_gl", "ref_src",
+})
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Queries made of unreserved characters only, which parse_qsl and urlencode would
+# leave unchanged, so they can be split and joined directly
+SIMPLE_FIELD = r"[A-Za-z0-9_.~-]+(?:=[A-Za-z0-9_.~-]*)?"
+SIMPLE_QUERY = re.compile(rf"{SIMPLE_FIELD}(?:&{SIMPLE_FIELD})*")
+
+
+def is_tracking_param(name):
+    """Check if a query parameter is a known tracking parameter"""
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonical_query(query):
+    """Return a query string without tracking parameters, with the remaining parameters sorted"""
+    if not query:
+        return ""
+    if SIMPLE_QUERY.fullmatch(query):
+        fields = sorted(field.partition("=")[::2] for field in query.split("&"))
+        return "&".join(f"{name}={value}" for name, value in fields if not is_tracking_param(name))
+    return urlencode(sorted(
+        (name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+        if not is_tracking_param(name)
+    ))
+
+
+def canonicalize_url(url):
+    """Return the canonical form of a URL.
+
+    The scheme and host are lowercased, default ports, tracking parameters, the
+    fragment and trailing slashes are dropped, and the remaining query parameters
+    are sorted. URLs without a scheme are treated as http.
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = "http://" + url
+    try:
+        parts = urlsplit(url)
+        # hostname and port parse the netloc again, which only matters with a port or userinfo
+        simple_netloc = ":" not in parts.netloc and "@" not in parts.netloc
+        port = None if simple_netloc else parts.port
+    except ValueError:
+        return url.lower()
+
+    scheme = parts.scheme.lower()
+    hostname = parts.netloc.lower() if simple_netloc else parts.hostname
+    netloc = (hostname or "").rstrip(".")
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    if parts.username:
+        userinfo = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{userinfo}@{netloc}"
+
+    path = parts.path.rstrip("/")
+    return urlunsplit((scheme, netloc, path, canonical_query(parts.query), ""))
+
+
+def url_identity(url):
+    """Return the string identifying a URL for deduplication: its canonical form, with http and https treated alike"""
+    canonical = canonicalize_url(url)
+    if canonical.startswith("http://"):
+        return "https://" + canonical[len("http://"):]
+    return canonical
+
+
+def url_hash(url):
+    """Return a compact 64-bit hash of the URL identity, stored in the indexed url_hash column"""
+    digest = hashlib.blake2b(url_identity(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
@@ -0,0 +1,417 @@
+import argparse
+import shlex
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from config import DATABASE
+from modules.url_todo_list.database import (
+    create_connection, create_table, add_url, url_exists, delete_url, iter_urls,
+    merge_duplicates, bulk_update_status, bulk_update_category, bulk_delete_urls, archive_matching_urls,
+    restore_archived_urls
+)
+from modules.url_todo_list.archive import iter_archived_urls, iter_all_urls, ARCHIVE_BATCH_SIZE
+from modules.url_todo_list.bulk import URLFilter, filter_is_empty
+from modules.url_todo_list.importer import import_urls
+from modules.url_todo_list.repository import URLRepository
+from modules.url_todo_list.link_checker import check_links, CONCURRENCY, PER_HOST_LIMIT, TIMEOUT
+from modules.url_todo_list.stats import fetch_category_stats, fetch_totals
+from modules.url_todo_list.search import search_urls, search_url_substring, SEARCH_LIMIT
+from modules.url_todo_list.server import serve, DEFAULT_HOST, DEFAULT_PORT, MAX_READERS
+from modules.url_todo_list.tracing import enable_tracing, disable_tracing, get_tracer
+from modules.url_todo_list.utils import (
+    is_valid_url, export_to_csv, export_to_json, export_to_xml
+)
+
+# Number of batch operations grouped in a single transaction
+BATCH_COMMIT_SIZE = 1000
+
+EXPORTERS = {
+    "csv": export_to_csv,
+    "json": export_to_json,
+    "xml": export_to_xml,
+}
+
+
+class CommandError(Exception):
+    """Raised when a command cannot be executed"""
+
+
+class BatchArgumentParser(argparse.ArgumentParser):
+    """Argument parser that raises CommandError instead of exiting, for batch lines"""
+
+    def error(self, message):
+        raise CommandError(message)
+
+
+def parse_status(value):
+    """Convert a status argument (read/unread, true/false, 1/0) to a boolean"""
+    normalized = value.strip().lower()
+    if normalized in ("read", "true", "1", "yes"):
+        return True
+    if normalized in ("unread", "false", "0", "no"):
+        return False
+    raise argparse.ArgumentTypeError(f"invalid status '{value}' (expected read or unread)")
+
+
+def cmd_add(conn, args, commit=True):
+    """Add a new URL"""
+    if not is_valid_url(args.url):
+        raise CommandError(f"Invalid URL format: {args.url}")
+    url_id = add_url(conn, args.url, args.description, args.category, commit=commit)
+    if url_id is not None:
+        sys.stdout.write(f"{url_id}\n")
+    elif url_exists(conn, args.url):
+        sys.stderr.write(f"Warning: URL '{args.url}' already exists.\n")
+
+
+def cmd_delete(conn, args, commit=True):
+    """Delete one or more URLs by ID"""
+    missing = []
+    for url_id in args.ids:
+        deleted = delete_url(conn, url_id, commit=commit)
+        if deleted is None:
+            raise CommandError(f"Failed to delete URL with ID {url_id}")
+        if not deleted:
+            missing.append(str(url_id))
+    if missing:
+        raise CommandError(f"No URL with ID {', '.join(missing)}")
+
+
+def cmd_update(conn, args, commit=True):
+    """Update the description and/or status of a URL"""
+    if args.description is None and args.status is None:
+        raise CommandError("Nothing to update: use --description and/or --status")
+    if not URLRepository(conn).update(args.id, args.description, args.status, commit=commit):
+        raise CommandError(f"No URL with ID {args.id}")
+
+
+def write_rows(rows):
+    """Print URL rows as tab-separated lines"""
+    write = sys.stdout.write
+    for row in rows:
+        write(f"{row.id}\t{row.url}\t{row.description or ''}\t{row.category or ''}\t{row.status}\n")
+
+
+def cmd_list(conn, args, commit=True):
+    """Print URLs as tab-separated lines, streaming them in batches"""
+    if args.archived:
+        write_rows(iter_archived_urls(conn, args.status, args.category, args.archive_db))
+    else:
+        write_rows(URLRepository(conn).iter(args.status, args.category))
+
+
+def cmd_search(conn, args, commit=True):
+    """Print the URLs matching a full-text or substring search"""
+    if args.substring:
+        write_rows(search_url_substring(conn, args.query, args.limit))
+    else:
+        write_rows(search_urls(conn, args.query, args.limit))
+
+
+def cmd_export(conn, args, commit=True):
+    """Stream URLs to a file"""
+    compress = True if args.gzip else None
+    urls = iter_all_urls(conn, args.archive_db) if args.include_archived else iter_urls(conn)
+    if args.format == "json":
+        export_to_json(urls, args.filename, ndjson=args.ndjson, compress=compress)
+    else:
+        EXPORTERS[args.format](urls, args.filename, compress=compress)
+
+
+def cmd_import(conn, args, commit=True):
+    """Import URLs from a CSV, JSON or XML file"""
+    conn.commit()
+    try:
+        result = import_urls(conn, args.filename, args.format)
+    except ValueError as e:
+        raise CommandError(str(e))
+    sys.stdout.write(f"Read {result.read}, imported {result.inserted}, skipped {result.duplicates} duplicate(s) and {result.invalid} invalid URL(s)\n")
+
+
+def cmd_dedupe(conn, args, commit=True):
+    """Merge URLs sharing the same canonical form"""
+    conn.commit()
+    groups, removed = merge_duplicates(conn, dry_run=args.dry_run)
+    action = "Would remove" if args.dry_run else "Removed"
+    sys.stdout.write(f"{action} {removed} duplicate(s) in {groups} group(s)\n")
+
+
+def cmd_check(conn, args, commit=True):
+    """Check the URLs for dead links"""
+    conn.commit()
+    summary = check_links(conn, unchecked_only=args.unchecked, concurrency=args.concurrency,
+                          per_host=args.per_host, timeout=args.timeout)
+    sys.stdout.write(f"Checked {summary.checked}: {summary.ok} ok, {summary.broken} broken, {summary.errors} unreachable\n")
+
+
+def cmd_stats(conn, args, commit=True):
+    """Print the read, unread and total counts per category, then the overall totals"""
+    write = sys.stdout.write
+    for stats in fetch_category_stats(conn):
+        write(f"{stats.category}\t{stats.read}\t{stats.unread}\t{stats.total}\n")
+    totals = fetch_totals(conn)
+    write(f"total\t{totals.read}\t{totals.unread}\t{totals.total}\n")
+
+
+def cmd_batch(conn, args, commit=True):
+    """Run commands read from a file or stdin, one per line, over a single connection"""
+    parser = build_parser(BatchArgumentParser)
+    source = sys.stdin if args.file == "-" else open(args.file, "r")
+    failures = 0
+    pending = 0
+    try:
+        for line_number, line in enumerate(source, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                command = parser.parse_args(shlex.split(line))
+                if command.handler is cmd_batch:
+                    raise CommandError("Nested batch commands are not supported")
+                if command.handler is cmd_serve:
+                    raise CommandError("The server cannot be started from a batch")
+                command.archive_db = command.archive_db or args.archive_db
+                command.handler(conn, command, commit=False)
+            except (CommandError, ValueError, sqlite3.Error) as e:
+                failures += 1
+                sys.stderr.write(f"Line {line_number}: {e}\n")
+                continue
+            pending += 1
+            if pending >= BATCH_COMMIT_SIZE:
+                conn.commit()
+                pending = 0
+    finally:
+        conn.commit()
+        if source is not sys.stdin:
+            source.close()
+    if failures:
+        raise CommandError(f"{failures} command(s) failed")
+
+
+def parse_id_range(value):
+    """Convert an ID range argument (5, 5-10, 5- or -10) to a (min_id, max_id) tuple"""
+    start, separator, end = value.strip().partition("-")
+    try:
+        if not separator:
+            return int(start), int(start)
+        return (int(start) if start else None), (int(end) if end else None)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ID range '{value}' (expected N, N-M, N- or -M)")
+
+
+def bulk_filter(args):
+    """Build the URLFilter of a bulk command, refusing to select every URL without --all"""
+    min_id, max_id = args.ids or (None, None)
+    url_filter = URLFilter(args.status, args.category, min_id, max_id, args.since, args.until, args.match)
+    if filter_is_empty(url_filter) and not args.all:
+        raise CommandError("No filter given: use --all to select every URL")
+    return url_filter
+
+
+def report_bulk(result, action):
+    """Print the outcome of a bulk command, with the preview of a dry run"""
+    if result is None:
+        raise CommandError(f"Failed to {action} URLs")
+    if result.dry_run:
+        sys.stdout.write(f"Would {action} {result.changed} of {result.matched} matching URL(s)\n")
+        write_rows(result.preview)
+    else:
+        sys.stdout.write(f"{action.capitalize()}d {result.changed} of {result.matched} matching URL(s)\n")
+
+
+def cmd_bulk_status(conn, args, commit=True):
+    """Mark every URL matching the filter as read or unread"""
+    report_bulk(bulk_update_status(conn, bulk_filter(args), args.new_status, args.dry_run, commit), "update")
+
+
+def cmd_bulk_category(conn, args, commit=True):
+    """Move every URL matching the filter to a category"""
+    report_bulk(bulk_update_category(conn, bulk_filter(args), args.new_category, args.dry_run, commit), "update")
+
+
+def cmd_bulk_delete(conn, args, commit=True):
+    """Delete every URL matching the filter"""
+    report_bulk(bulk_delete_urls(conn, bulk_filter(args), args.dry_run, commit), "delete")
+
+
+def cmd_archive(conn, args, commit=True):
+    """Move the URLs matching the filter to the archive database, read URLs by default"""
+    min_id, max_id = args.ids or (None, None)
+    until = args.until
+    if args.older_than is not None:
+        until = datetime_days_ago(args.older_than)
+    url_filter = URLFilter(args.status, args.category, min_id, max_id, args.since, until, args.match)
+    if filter_is_empty(url_filter) and not args.all:
+        url_filter = url_filter._replace(status=True)
+    conn.commit()
+    result = archive_matching_urls(conn, url_filter, args.archive_db, args.batch_size, args.dry_run)
+    if result is None:
+        raise CommandError("Failed to archive URLs")
+    if result.dry_run:
+        sys.stdout.write(f"Would archive {result.matched} URL(s)\n")
+    else:
+        sys.stdout.write(f"Archived {result.moved} URL(s), freed {result.freed_pages} page(s)\n")
+
+
+def cmd_restore(conn, args, commit=True):
+    """Move archived URLs back to the active list"""
+    conn.commit()
+    restored = restore_archived_urls(conn, args.status, args.category, args.archive_db)
+    if restored is None:
+        raise CommandError("Failed to restore URLs")
+    sys.stdout.write(f"Restored {restored} URL(s)\n")
+
+
+def cmd_serve(conn, args, commit=True):
+    """Serve the JSON API until interrupted"""
+    conn.close()
+    serve(args.database, args.host, args.port, args.readers, args.verbose)
+
+
+def datetime_days_ago(days):
+    """Return the UTC time `days` days ago in the format of the timestamp column"""
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def add_filter_arguments(parser):
+    """Add the URL selection options shared by the bulk commands"""
+    parser.add_argument("-s", "--status", type=parse_status, help="Only URLs with this status")
+    parser.add_argument("-c", "--category", help="Only URLs in this category")
+    parser.add_argument("--ids", type=parse_id_range, help="Only URLs in this ID range, e.g. 100-200")
+    parser.add_argument("--since", help="Only URLs added at or after this UTC time (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--until", help="Only URLs added at or before this UTC time (YYYY-MM-DD[ HH:MM:SS]); "
+                                        "a date alone includes the whole day")
+    parser.add_argument("--match", help="Only URLs matching this full-text search")
+    parser.add_argument("--all", action="store_true", help="Allow selecting every URL when no filter is given")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the URLs that would change")
+
+
+def build_parser(parser_class=argparse.ArgumentParser):
+    """Build the argument parser for the headless commands"""
+    parser = parser_class(prog="url_todo_list", description="Manage the URL to-do list without the interactive menu.")
+    parser.add_argument("--archive-db", help="Path to the archive database (default: next to the database)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    add = subparsers.add_parser("add", help="Add a URL")
+    add.add_argument("url")
+    add.add_argument("-d", "--description", default="")
+    add.add_argument("-c", "--category", default="")
+    add.set_defaults(handler=cmd_add)
+
+    delete = subparsers.add_parser("delete", help="Delete URLs by ID")
+    delete.add_argument("ids", nargs="+", type=int)
+    delete.set_defaults(handler=cmd_delete)
+
+    update = subparsers.add_parser("update", help="Update a URL")
+    update.add_argument("id", type=int)
+    update.add_argument("-d", "--description")
+    update.add_argument("-s", "--status", type=parse_status)
+    update.set_defaults(handler=cmd_update)
+
+    list_ = subparsers.add_parser("list", help="List URLs")
+    list_.add_argument("-s", "--status", type=parse_status)
+    list_.add_argument("-c", "--category")
+    list_.add_argument("--archived", action="store_true", help="List the archived URLs instead")
+    list_.set_defaults(handler=cmd_list)
+
+    search = subparsers.add_parser("search", help="Search URLs, descriptions and categories")
+    search.add_argument("query")
+    search.add_argument("--substring", action="store_true", help="Match the text anywhere inside URLs")
+    search.add_argument("-n", "--limit", type=int, default=SEARCH_LIMIT)
+    search.set_defaults(handler=cmd_search)
+
+    export = subparsers.add_parser("export", help="Export URLs to a file")
+    export.add_argument("format", choices=sorted(EXPORTERS))
+    export.add_argument("filename")
+    export.add_argument("--ndjson", action="store_true", help="Write JSON as one object per line")
+    export.add_argument("--gzip", action="store_true", help="Compress the output (implied by a .gz filename)")
+    export.add_argument("--include-archived", action="store_true", help="Also export the archived URLs")
+    export.set_defaults(handler=cmd_export)
+
+    import_ = subparsers.add_parser("import", help="Import URLs from a CSV, JSON or XML file")
+    import_.add_argument("filename")
+    import_.add_argument("-f", "--format", choices=sorted(EXPORTERS), help="File format, guessed from the extension by default")
+    import_.set_defaults(handler=cmd_import)
+
+    dedupe = subparsers.add_parser("dedupe", help="Merge URLs sharing the same canonical form")
+    dedupe.add_argument("--dry-run", action="store_true", help="Only report the duplicates")
+    dedupe.set_defaults(handler=cmd_dedupe)
+
+    check = subparsers.add_parser("check", help="Check the URLs for dead links")
+    check.add_argument("--unchecked", action="store_true", help="Only check URLs never checked before")
+    check.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Requests in flight at once")
+    check.add_argument("--per-host", type=int, default=PER_HOST_LIMIT, help="Requests in flight at once per host")
+    check.add_argument("--timeout", type=float, default=TIMEOUT, help="Seconds allowed per request")
+    check.set_defaults(handler=cmd_check)
+
+    bulk_status = subparsers.add_parser("bulk-status", help="Mark every URL matching a filter as read or unread")
+    bulk_status.add_argument("new_status", type=parse_status, metavar="status")
+    add_filter_arguments(bulk_status)
+    bulk_status.set_defaults(handler=cmd_bulk_status)
+
+    bulk_category = subparsers.add_parser("bulk-category", help="Move every URL matching a filter to a category")
+    bulk_category.add_argument("new_category", metavar="category")
+    add_filter_arguments(bulk_category)
+    bulk_category.set_defaults(handler=cmd_bulk_category)
+
+    bulk_delete = subparsers.add_parser("bulk-delete", help="Delete every URL matching a filter")
+    add_filter_arguments(bulk_delete)
+    bulk_delete.set_defaults(handler=cmd_bulk_delete)
+
+    archive = subparsers.add_parser("archive", help="Move URLs to the archive database, read URLs by default")
+    add_filter_arguments(archive)
+    archive.add_argument("--older-than", type=int, metavar="DAYS", help="Only URLs added more than DAYS days ago")
+    archive.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="URLs moved per transaction")
+    archive.set_defaults(handler=cmd_archive)
+
+    restore = subparsers.add_parser("restore", help="Move archived URLs back to the active list")
+    restore.add_argument("-s", "--status", type=parse_status, help="Only URLs with this status")
+    restore.add_argument("-c", "--category", help="Only URLs in this category")
+    restore.set_defaults(handler=cmd_restore)
+
+    serve_ = subparsers.add_parser("serve", help="Serve a local JSON API over HTTP")
+    serve_.add_argument("--host", default=DEFAULT_HOST, help="Address to listen on")
+    serve_.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    serve_.add_argument("--readers", type=int, default=MAX_READERS, help="Read-only connections in the pool")
+    serve_.add_argument("--verbose", action="store_true", help="Log every request")
+    serve_.set_defaults(handler=cmd_serve)
+
+    stats = subparsers.add_parser("stats", help="Show read and unread counts per category")
+    stats.set_defaults(handler=cmd_stats)
+
+    batch = subparsers.add_parser("batch", help="Run commands from a file or stdin")
+    batch.add_argument("file", nargs="?", default="-")
+    batch.set_defaults(handler=cmd_batch)
+
+    return parser
+
+
+def main(argv=None):
+    """Entry point for the headless command interface"""
+    parser = build_parser()
+    parser.add_argument("--database", default=DATABASE, help="Path to the SQLite database")
+    parser.add_argument("--trace", metavar="FILE", help="Write SQL latency histograms to FILE in the Prometheus text format")
+    args = parser.parse_args(argv)
+
+    was_tracing = get_tracer() is not None
+    tracer = enable_tracing() if args.trace else None
+    conn = create_connection(args.database)
+    if not conn:
+        return 1
+    try:
+        create_table(conn)
+        args.handler(conn, args)
+    except (CommandError, OSError, sqlite3.Error) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    finally:
+        conn.close()
+        if tracer is not None:
+            tracer.dump_prometheus(args.trace)
+            if not was_tracing:
+                disable_tracing()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.request import pathname2url
+
+# Pragmas applied to every connection. journal_mode and auto_vacuum are persistent
+# in the database file, so they are only set by writers. auto_vacuum only takes
+# effect on a new database; archive.incremental_vacuum() converts older ones.
+WRITER_PRAGMAS = (
+    ("auto_vacuum", "INCREMENTAL"),
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+)
+COMMON_PRAGMAS = (
+    ("mmap_size", 256 * 1024 * 1024),
+    ("cache_size", -16000),  # In KiB when negative
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", 5000),
+)
+
+# Number of prepared statements kept per connection by the sqlite3 module
+CACHED_STATEMENTS = 256
+
+MAX_READERS = 4
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no read-only connection becomes free within the timeout"""
+
+
+class Connection(sqlite3.Connection):
+    """sqlite3 connection that can carry per-connection state such as the query cache"""
+
+    query_cache = None
+
+    # QueryTracer set by tracing.enable_tracing(), for every connection
+    tracer = None
+
+    def cursor(self, factory=None):
+        """Open a cursor, timing its statements when tracing is enabled"""
+        if factory is None:
+            if self.tracer is None:
+                return super().cursor()
+            factory = self.tracer.cursor_factory
+        return super().cursor(factory)
+
+    # sqlite3.Connection.execute() does not go through cursor(), so route it there while tracing
+    def execute(self, sql, parameters=()):
+        """Execute a statement on a new cursor"""
+        if self.tracer is None:
+            return super().execute(sql, parameters)
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        """Execute a statement for every set of parameters on a new cursor"""
+        if self.tracer is None:
+            return super().executemany(sql, seq_of_parameters)
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def is_memory_database(db_file):
+    """Return True if the database only lives in memory"""
+    return db_file == ":memory:" or str(db_file).startswith("file::memory:")
+
+
+def apply_pragmas(conn, read_only=False):
+    """Apply the tuned pragmas to a connection"""
+    pragmas = COMMON_PRAGMAS if read_only else WRITER_PRAGMAS + COMMON_PRAGMAS
+    for pragma, value in pragmas:
+        conn.execute(f"PRAGMA {pragma} = {value}")
+
+
+def connect(db_file, read_only=False, check_same_thread=True):
+    """Open a tuned connection to the SQLite database"""
+    if read_only and not is_memory_database(db_file):
+        uri = f"file:{pathname2url(os.path.abspath(db_file))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, cached_statements=CACHED_STATEMENTS, check_same_thread=check_same_thread,
+                               factory=Connection)
+    else:
+        conn = sqlite3.connect(db_file, cached_statements=CACHED_STATEMENTS, check_same_thread=check_same_thread,
+                               factory=Connection)
+    apply_pragmas(conn, read_only)
+    return conn
+
+
+class ConnectionManager:
+    """
+    Hands out a single writer connection and a pool of read-only connections.
+
+    In WAL mode readers never block the writer and the writer never blocks readers.
+    Writes are serialized through a lock around the single writer connection.
+    In-memory databases cannot be shared between connections, so all reads go
+    through the writer in that case.
+    """
+
+    def __init__(self, db_file, max_readers=MAX_READERS):
+        self.db_file = db_file
+        self.max_readers = max_readers
+        self.write_lock = threading.RLock()
+        self._writer = None
+        self._readers = queue.LifoQueue()
+        self._reader_count = 0
+        self._pool_lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def writer(self):
+        """The single writer connection, opened on first use"""
+        with self.write_lock:
+            if self._writer is None:
+                self._writer = connect(self.db_file, check_same_thread=False)
+            return self._writer
+
+    @contextmanager
+    def write(self):
+        """Hold the writer for a transaction, committed on success and rolled back on error"""
+        with self.write_lock:
+            conn = self.writer
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    @contextmanager
+    def read(self, timeout=None):
+        """Borrow a read-only connection from the pool.
+
+        When every reader is busy, waits for one to be returned, for at most
+        `timeout` seconds if given, then raises PoolTimeoutError.
+        """
+        if is_memory_database(self.db_file):
+            with self.write_lock:
+                yield self.writer
+            return
+
+        conn = self._acquire_reader(timeout)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed:
+                conn.close()
+            else:
+                self._readers.put(conn)
+
+    def _acquire_reader(self, timeout=None):
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._pool_lock:
+            if self._reader_count < self.max_readers:
+                self._reader_count += 1
+                create = True
+            else:
+                create = False
+        if not create:
+            try:
+                return self._readers.get(timeout=timeout)
+            except queue.Empty:
+                raise PoolTimeoutError(f"No read connection free after {timeout} seconds")
+        try:
+            # Make sure the database file and its WAL setting exist before opening readers
+            self.writer
+            return connect(self.db_file, read_only=True, check_same_thread=False)
+        except sqlite3.Error:
+            with self._pool_lock:
+                self._reader_count -= 1
+            raise
+
+    def close(self):
+        """Close the writer and every idle reader"""
+        self._closed = True
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self.write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
@@ -1,129 +1,198 @@
 import sqlite3
+from modules.url_todo_list.connection import connect
+from modules.url_todo_list.migrations import migrate, backfill_url_hashes
+from modules.url_todo_list.canonical import url_identity
+from modules.url_todo_list.cache import invalidate
+from modules.url_todo_list.bulk import bulk_set_status, bulk_set_category, bulk_delete
+from modules.url_todo_list.archive import archive_urls, restore_urls, ARCHIVE_BATCH_SIZE
+from modules.url_todo_list.repository import (
+    URLRepository, SELECT_URLS_SQL, DELETE_URL_SQL, make_record
+)
 
 def create_connection(db_file):
-    """Create a database connection to the SQLite database"""
+    """Create a tuned database connection to the SQLite database"""
     try:
-        conn = sqlite3.connect(db_file)
+        conn = connect(db_file)
         return conn
     except sqlite3.Error as e:
         print(f"Failed to create connection to database {db_file}: {e}")
         return None
 
 def create_table(conn):
-    """Create a table for URLs"""
-    create_table_sql = """
-    CREATE TABLE IF NOT EXISTS urls (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        url TEXT NOT NULL UNIQUE,
-        description TEXT,
-        category TEXT,
-        status BOOLEAN DEFAULT 0,
-        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-    );"""
-    try:
-        c = conn.cursor()
-        c.execute(create_table_sql)
-        conn.commit()
+    """Create the table for URLs, or upgrade it to the current schema"""
+    try:
+        migrate(conn)
     except sqlite3.Error as e:
         print(f"Failed to create table: {e}")
 
-def add_url(conn, url, description, category):
-    """Add a new URL to the table"""
-    if url_exists(conn, url):
-        print(f"Warning: URL '{url}' already exists.")
-        return None
-    sql = '''INSERT INTO urls(url, description, category, status) VALUES (?, ?, ?, ?)'''
+def add_url(conn, url, description, category, commit=True):
+    """Add a new URL to the table. Returns its ID, or None if it already exists or on error"""
     try:
-        cur = conn.cursor()
-        cur.execute(sql, (url, description, category, False))
-        conn.commit()
-        return cur.lastrowid
+        return URLRepository(conn).add(url, description, category, commit=commit)
     except sqlite3.Error as e:
         print(f"Failed to add URL: {e}")
         return None
 
 def url_exists(conn, url):
-    """Check if a URL already exists in the table"""
-    sql = '''SELECT 1 FROM urls WHERE url=?'''
+    """Check if a URL, or another form of the same canonical URL, already exists in the table"""
     try:
-        cur = conn.cursor()
-        cur.execute(sql, (url,))
-        return cur.fetchone() is not None
+        return URLRepository(conn).exists(url)
     except sqlite3.Error as e:
         print(f"Failed to check URL existence: {e}")
         return False
 
-def update_url_status(conn, url_id, status):
+def update_url_status(conn, url_id, status, commit=True):
     """Update the status of a URL"""
-    sql = '''UPDATE urls SET status = ? WHERE id = ?'''
     try:
-        cur = conn.cursor()
-        cur.execute(sql, (status, url_id))
-        conn.commit()
+        URLRepository(conn).update(url_id, status=status, commit=commit)
     except sqlite3.Error as e:
         print(f"Failed to update URL status: {e}")
 
-def update_url_description(conn, url_id, description):
+def update_url_description(conn, url_id, description, commit=True):
     """Update the description of a URL"""
-    sql = '''UPDATE urls SET description = ? WHERE id = ?'''
     try:
-        cur = conn.cursor()
-        cur.execute(sql, (description, url_id))
-        conn.commit()
+        URLRepository(conn).update(url_id, description=description, commit=commit)
     except sqlite3.Error as e:
         print(f"Failed to update URL description: {e}")
 
 def fetch_all_urls(conn):
     """Fetch all URLs from the table"""
-    sql = '''SELECT * FROM urls'''
     try:
-        cur = conn.cursor()
-        cur.execute(sql)
-        return cur.fetchall()
+        return URLRepository(conn).list()
     except sqlite3.Error as e:
         print(f"Failed to fetch all URLs: {e}")
         return []
 
 def fetch_urls_by_status(conn, status):
     """Fetch URLs by status"""
-    sql = '''SELECT * FROM urls WHERE status = ?'''
     try:
-        cur = conn.cursor()
-        cur.execute(sql, (status,))
-        return cur.fetchall()
+        return URLRepository(conn).list(status=status)
     except sqlite3.Error as e:
         print(f"Failed to fetch URLs by status: {e}")
         return []
 
 def fetch_urls_by_category(conn, category):
     """Fetch URLs by category"""
-    sql = '''SELECT * FROM urls WHERE category = ?'''
     try:
-        cur = conn.cursor()
-        cur.execute(sql, (category,))
-        return cur.fetchall()
+        return URLRepository(conn).list(category=category)
     except sqlite3.Error as e:
         print(f"Failed to fetch URLs by category: {e}")
         return []
 
-def delete_url(conn, url_id):
-    """Delete a URL from the table by its ID"""
-    sql = '''DELETE FROM urls WHERE id = ?'''
+def delete_url(conn, url_id, commit=True):
+    """Delete a URL from the table by its ID. Returns True if it existed, False if not, None on error"""
     try:
-        cur = conn.cursor()
-        cur.execute(sql, (url_id,))
-        conn.commit()
-        print(f"URL with ID {url_id} deleted successfully!")
+        return URLRepository(conn).delete(url_id, commit=commit)
     except sqlite3.Error as e:
         print(f"Failed to delete URL: {e}")
+        return None
+
+def bulk_update_status(conn, url_filter, status, dry_run=False, commit=True):
+    """Mark every URL matching a filter as read or unread. Returns a BulkResult, or None on error"""
+    try:
+        return bulk_set_status(conn, url_filter, status, dry_run, commit)
+    except sqlite3.Error as e:
+        print(f"Failed to update URL statuses: {e}")
+        return None
+
+def bulk_update_category(conn, url_filter, category, dry_run=False, commit=True):
+    """Move every URL matching a filter to a category. Returns a BulkResult, or None on error"""
+    try:
+        return bulk_set_category(conn, url_filter, category, dry_run, commit)
+    except sqlite3.Error as e:
+        print(f"Failed to update URL categories: {e}")
+        return None
+
+def bulk_delete_urls(conn, url_filter, dry_run=False, commit=True):
+    """Delete every URL matching a filter. Returns a BulkResult, or None on error"""
+    try:
+        return bulk_delete(conn, url_filter, dry_run, commit)
+    except sqlite3.Error as e:
+        print(f"Failed to delete URLs: {e}")
+        return None
+
+def archive_matching_urls(conn, url_filter, archive_file=None, batch_size=ARCHIVE_BATCH_SIZE, dry_run=False):
+    """Move every URL matching a filter to the archive database. Returns an ArchiveResult, or None on error"""
+    try:
+        return archive_urls(conn, url_filter, archive_file, batch_size, dry_run)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Failed to archive URLs: {e}")
+        return None
+
+def restore_archived_urls(conn, status=None, category=None, archive_file=None):
+    """Move archived URLs back to the active list. Returns the number restored, or None on error"""
+    try:
+        return restore_urls(conn, status, category, archive_file)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Failed to restore archived URLs: {e}")
+        return None
+
+def fetch_urls(conn, status=None, category=None):
+    """Fetch URLs, optionally filtered by status and/or category"""
+    try:
+        return URLRepository(conn).list(status, category)
+    except sqlite3.Error as e:
+        print(f"Failed to fetch URLs: {e}")
+        return []
+
+def iter_urls(conn, batch_size=1000):
+    """Yield all URLs as records, fetching them in batches"""
+    try:
+        yield from URLRepository(conn).iter(batch_size=batch_size)
+    except sqlite3.Error as e:
+        print(f"Failed to fetch all URLs: {e}")
+
+def fetch_urls_page(conn, after_id=None, before_id=None, limit=20, status=None, category=None):
+    """Fetch one page of URLs ordered by ID using keyset pagination"""
+    try:
+        return URLRepository(conn).page(after_id, before_id, limit, status, category)
+    except sqlite3.Error as e:
+        print(f"Failed to fetch URLs page: {e}")
+        return []
 
 def fetch_urls_by_time(conn, start_time, end_time):
     """Fetch URLs by timestamp range"""
-    sql = '''SELECT * FROM urls WHERE timestamp BETWEEN ? AND ?'''
     try:
-        cur = conn.cursor()
-        cur.execute(sql, (start_time, end_time))
-        return cur.fetchall()
+        return URLRepository(conn).between(start_time, end_time)
     except sqlite3.Error as e:
         print(f"Failed to fetch URLs by time range: {e}")
         return []
+
+def merge_duplicates(conn, dry_run=False):
+    """Merge rows that share the same canonical URL.
+
+    The oldest row of each group is kept. It is marked as read if any duplicate was
+    read, and takes the first non-empty description and category of the group. The
+    other rows are deleted in the same transaction. Returns (groups, removed).
+    """
+    try:
+        backfill_url_hashes(conn)
+        cur = conn.execute(SELECT_URLS_SQL + '''
+            WHERE url_hash IN (SELECT url_hash FROM urls GROUP BY url_hash HAVING COUNT(*) > 1)
+            ORDER BY url_hash, id''')
+        groups = {}
+        for record in map(make_record, cur):
+            groups.setdefault(url_identity(record.url), []).append(record)
+
+        merged = removed = 0
+        for rows in groups.values():
+            if len(rows) < 2:
+                continue
+            merged += 1
+            removed += len(rows) - 1
+            if dry_run:
+                continue
+            keep = rows[0]
+            description = next((row.description for row in rows if row.description), keep.description)
+            category = next((row.category for row in rows if row.category), keep.category)
+            status = any(row.status for row in rows)
+            conn.executemany(DELETE_URL_SQL, [(row.id,) for row in rows[1:]])
+            conn.execute('''UPDATE urls SET description = ?, category = ?, status = ? WHERE id = ?''',
+                         (description, category, status, keep.id))
+        invalidate(conn)
+        conn.commit()
+        return merged, removed
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"Failed to merge duplicate URLs: {e}")
+        return 0, 0
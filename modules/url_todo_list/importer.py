@@ -0,0 +1,228 @@
+import csv
+import json
+import os
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from contextlib import contextmanager
+from modules.url_todo_list.canonical import url_hash
+from modules.url_todo_list.migrations import migrate, deferred_search_index
+from modules.url_todo_list.utils import validate_urls, open_file, is_gzip_filename
+
+# Number of records validated and inserted per transaction
+IMPORT_BATCH_SIZE = 50000
+
+# Page cache of the connection during an import, in KiB when negative. The
+# indexes of the table and the search tables outgrow the default cache after a
+# few hundred thousand rows, and every batch then reads them back from disk.
+IMPORT_CACHE_SIZE = -256 * 1024
+
+JSON_CHUNK_SIZE = 64 * 1024
+
+# Rows are checked against url_hash by the batch, so the insert itself needs no guard
+IMPORT_URL_SQL = "INSERT INTO urls(url, description, category, status, url_hash) VALUES (?, ?, ?, ?, ?)"
+
+# url_hash values looked up per query, under the historical limit of 999 SQL variables
+HASH_LOOKUP_SIZE = 500
+
+ImportResult = namedtuple("ImportResult", ["read", "inserted", "duplicates", "invalid"])
+
+# Errors of the format parsers, reported as ValueError like the other bad input
+PARSE_ERRORS = (csv.Error, json.JSONDecodeError, ET.ParseError)
+
+COLUMNS = ("url", "description", "category", "status")
+
+# Fast path for the status values written by the exporters
+STATUS_VALUES = {"True": 1, "False": 0, "1": 1, "0": 0, True: 1, False: 0, 1: 1, 0: 0, None: 0, "": 0}
+
+
+def parse_status(value):
+    """Convert an exported status (True/False, 1/0, true/false) to 0 or 1"""
+    try:
+        return STATUS_VALUES[value]
+    except (KeyError, TypeError):
+        pass
+    if isinstance(value, str):
+        return 1 if value.strip().lower() in ("true", "1", "yes", "read") else 0
+    return 1 if value else 0
+
+
+def record_from_mapping(mapping):
+    """Build a (url, description, category, status) record from a mapping with case-insensitive keys"""
+    mapping = {str(key).lower(): value for key, value in mapping.items()}
+    return tuple(mapping.get(column) for column in COLUMNS)
+
+
+def iter_csv_records(file):
+    """Yield records from a CSV file written by export_to_csv"""
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [column.strip().lower() for column in header]
+    positions = [columns.index(column) if column in columns else None for column in COLUMNS]
+    if positions == [1, 2, 3, 4]:
+        # Layout written by export_to_csv
+        for row in reader:
+            yield tuple(row[1:5]) if len(row) >= 5 else record_from_mapping(dict(zip(columns, row)))
+        return
+    for row in reader:
+        yield tuple(row[position] if position is not None and position < len(row) else None for position in positions)
+
+
+def iter_json_records(file):
+    """Yield records from a JSON array written by export_to_json, or from NDJSON, without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    in_array = None
+
+    while True:
+        # Skip whitespace and separators between values, reading more data when needed
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            buffer = file.read(JSON_CHUNK_SIZE)
+            position = 0
+            eof = not buffer
+
+        if position >= len(buffer):
+            return
+
+        if in_array is None:
+            in_array = buffer[position] == "["
+            if in_array:
+                position += 1
+                continue
+        if in_array and buffer[position] == "]":
+            return
+
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = file.read(JSON_CHUNK_SIZE)
+            if not chunk:
+                raise
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        position = end
+        if isinstance(record, dict):
+            yield record_from_mapping(record)
+
+
+def iter_xml_records(file):
+    """Yield records from an XML file written by export_to_xml, clearing parsed elements as it goes"""
+    root = None
+    for event, element in ET.iterparse(file, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            continue
+        if element.tag == "url":
+            yield record_from_mapping({child.tag: child.text for child in element})
+            root.clear()
+
+
+READERS = {
+    "csv": (iter_csv_records, {"mode": "r", "newline": "", "encoding": "utf-8"}),
+    "json": (iter_json_records, {"mode": "r", "encoding": "utf-8"}),
+    "xml": (iter_xml_records, {"mode": "rb"}),
+}
+
+
+def detect_format(filename):
+    """Guess the import format from the file extension, ignoring a trailing .gz"""
+    if is_gzip_filename(filename):
+        filename = filename[:-3]
+    extension = os.path.splitext(filename)[1].lstrip(".").lower()
+    if extension in ("ndjson", "jsonl"):
+        return "json"
+    return extension if extension in READERS else None
+
+
+def existing_hashes(conn, hashes):
+    """Return the set of the given url_hash values already stored"""
+    found = set()
+    for start in range(0, len(hashes), HASH_LOOKUP_SIZE):
+        chunk = hashes[start:start + HASH_LOOKUP_SIZE]
+        sql = f"SELECT url_hash FROM urls WHERE url_hash IN ({', '.join('?' * len(chunk))})"
+        found.update(hashed for (hashed,) in conn.execute(sql, chunk))
+    return found
+
+
+@contextmanager
+def import_cache_size(conn, size=IMPORT_CACHE_SIZE):
+    """Set the page cache size of the connection for the duration of the block"""
+    previous = conn.execute("PRAGMA cache_size").fetchone()[0]
+    conn.execute(f"PRAGMA cache_size = {int(size)}")
+    try:
+        yield
+    finally:
+        conn.execute(f"PRAGMA cache_size = {int(previous)}")
+
+
+def insert_batch(conn, batch):
+    """Validate and insert a batch of records in one transaction. Returns (inserted, invalid)"""
+    valid = validate_urls([record[0] for record in batch])
+    # The whole batch is canonicalized and hashed before touching the database
+    rows = [
+        (url, description, category, parse_status(status), url_hash(url))
+        for (url, description, category, status), is_valid in zip(batch, valid)
+        if is_valid
+    ]
+
+    if not rows:
+        return 0, len(batch)
+
+    with deferred_search_index(conn):
+        # Duplicates, including other forms of the same canonical URL, are found with
+        # one lookup per few hundred hashes instead of a guarded INSERT per row; the
+        # set also skips repeats inside the batch
+        seen = existing_hashes(conn, [row[4] for row in rows])
+        fresh = []
+        for row in rows:
+            if row[4] not in seen:
+                seen.add(row[4])
+                fresh.append(row)
+        if fresh:
+            conn.executemany(IMPORT_URL_SQL, fresh)
+    conn.commit()
+    return len(fresh), len(batch) - len(rows)
+
+
+def import_urls(conn, filename, file_format=None, batch_size=IMPORT_BATCH_SIZE):
+    """Stream URLs from a CSV, JSON or XML export (optionally gzipped) into the table, skipping invalid and duplicate URLs"""
+    file_format = file_format or detect_format(filename)
+    if file_format not in READERS:
+        raise ValueError(f"Unsupported import format for {filename}")
+    iter_records, open_args = READERS[file_format]
+
+    # The canonical schema provides the unique and url_hash indexes the inserts rely on
+    migrate(conn)
+
+    read = inserted = invalid = 0
+    batch = []
+    with import_cache_size(conn), open_file(filename, **open_args) as file:
+        try:
+            for record in iter_records(file):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    batch_inserted, batch_invalid = insert_batch(conn, batch)
+                    read += len(batch)
+                    inserted += batch_inserted
+                    invalid += batch_invalid
+                    batch = []
+        except PARSE_ERRORS as e:
+            # The batches before the error stay imported
+            raise ValueError(f"Malformed {file_format.upper()} file {filename}: {e}") from e
+        if batch:
+            batch_inserted, batch_invalid = insert_batch(conn, batch)
+            read += len(batch)
+            inserted += batch_inserted
+            invalid += batch_invalid
+
+    return ImportResult(read, inserted, read - inserted - invalid, invalid)
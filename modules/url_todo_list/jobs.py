@@ -0,0 +1,57 @@
+import os
+import sqlite3
+from config import DATABASE
+from modules.url_todo_list.connection import connect
+
+# Unread URLs added more than this many days ago are reported as stale
+STALE_DAYS = 7
+
+# Seconds between two stale URL reminders
+REMINDER_INTERVAL = 6 * 3600
+
+# Seconds between two runs of the database maintenance
+MAINTENANCE_INTERVAL = 24 * 3600
+
+# Random delay added to each run, so jobs do not wake up together with the menu
+JITTER = 60
+
+STALE_COUNT_SQL = '''SELECT COUNT(*) FROM urls WHERE status = 0 AND timestamp < datetime('now', ?)'''
+
+
+def count_stale_urls(conn, days=STALE_DAYS):
+    """Count the unread URLs added more than `days` days ago"""
+    return conn.execute(STALE_COUNT_SQL, (f"-{days} days",)).fetchone()[0]
+
+
+def remind_stale_urls(scheduler, db_path):
+    """Send a notification when unread URLs have been waiting for more than STALE_DAYS days"""
+    if not os.path.exists(db_path):
+        return
+    conn = connect(db_path, read_only=True)
+    try:
+        count = count_stale_urls(conn)
+    except sqlite3.OperationalError:
+        # The database has not been created by the module yet
+        return
+    finally:
+        conn.close()
+    if count:
+        scheduler.notify("URL Todo List", f"{count} unread URLs are older than {STALE_DAYS} days.")
+
+
+def maintain_database(db_path):
+    """Refresh the query planner statistics and checkpoint the WAL"""
+    if not os.path.exists(db_path):
+        return
+    conn = connect(db_path)
+    try:
+        conn.execute("PRAGMA optimize")
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    finally:
+        conn.close()
+
+
+def register_jobs(scheduler, db_path=DATABASE):
+    """Schedule the stale URL reminder and the database maintenance"""
+    scheduler.schedule(remind_stale_urls, REMINDER_INTERVAL, delay=JITTER, args=(scheduler, db_path), jitter=JITTER)
+    scheduler.schedule(maintain_database, MAINTENANCE_INTERVAL, args=(db_path,), jitter=JITTER)
@@ -0,0 +1,234 @@
+import asyncio
+import ssl
+from collections import namedtuple
+from urllib.parse import urlsplit, urljoin, quote
+from modules.url_todo_list.migrations import migrate
+
+# Number of requests in flight at once, across all hosts
+CONCURRENCY = 100
+
+# Number of requests in flight at once against a single host
+PER_HOST_LIMIT = 4
+
+# Seconds allowed for a whole request, from connecting to reading the headers
+TIMEOUT = 10
+
+MAX_REDIRECTS = 5
+
+# Number of rows read from the table, and of results written back, per transaction
+CHECK_BATCH_SIZE = 500
+
+USER_AGENT = "ExpandCore-LinkChecker/1.0"
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Servers answering these to HEAD are asked again with GET
+HEAD_NOT_SUPPORTED = (403, 405, 501)
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+PATH_SAFE_CHARS = "/%:@!$&'()*+,;=-._~"
+
+CheckResult = namedtuple("CheckResult", ["url_id", "status", "final_url", "error"])
+
+CheckSummary = namedtuple("CheckSummary", ["checked", "ok", "broken", "errors"])
+
+SELECT_BATCH_SQL = '''SELECT id, url FROM urls WHERE id > ? {condition} ORDER BY id LIMIT ?'''
+
+UPDATE_RESULT_SQL = '''UPDATE urls SET http_status = ?, final_url = ?, check_error = ?,
+                       checked_at = CURRENT_TIMESTAMP WHERE id = ?'''
+
+
+def is_broken(status):
+    """Return True if an HTTP status means the link is dead"""
+    return status is None or status >= 400
+
+
+def with_scheme(url):
+    """Return the URL with http:// prepended when it has no scheme, as canonicalize_url() does"""
+    url = url.strip()
+    return url if "://" in url else "http://" + url
+
+
+async def request_status(url, method="HEAD", ssl_context=None):
+    """Send a single request and return (status, location) without reading the body"""
+    parts = urlsplit(with_scheme(url))
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        raise ValueError(f"unsupported URL {url}")
+    host = parts.hostname.encode("idna").decode("ascii")
+    port = parts.port or DEFAULT_PORTS[scheme]
+
+    if scheme == "https":
+        context = ssl_context or ssl.create_default_context()
+        reader, writer = await asyncio.open_connection(host, port, ssl=context, server_hostname=host)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        target = quote(parts.path or "/", safe=PATH_SAFE_CHARS)
+        if parts.query:
+            target += "?" + quote(parts.query, safe=PATH_SAFE_CHARS + "?")
+        host_header = host if parts.port is None else f"{host}:{port}"
+        writer.write((
+            f"{method} {target} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            f"User-Agent: {USER_AGENT}\r\n"
+            "Accept: */*\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("ascii"))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        fields = status_line.decode("latin-1").split(None, 2)
+        if len(fields) < 2 or not fields[0].startswith("HTTP/") or not fields[1].isdigit():
+            raise ValueError(f"invalid HTTP response from {host}")
+        status = int(fields[1])
+
+        location = None
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "location":
+                location = value.strip()
+        return status, location
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+
+async def check_url(url, timeout=TIMEOUT, ssl_context=None):
+    """Follow a URL through its redirects and return (status, final_url)"""
+    url = with_scheme(url)
+    method = "HEAD"
+    for _ in range(MAX_REDIRECTS + 1):
+        status, location = await asyncio.wait_for(request_status(url, method, ssl_context), timeout)
+        if method == "HEAD" and status in HEAD_NOT_SUPPORTED:
+            method = "GET"
+            continue
+        if status in REDIRECT_STATUSES and location:
+            url = urljoin(url, location)
+            method = "HEAD"
+            continue
+        return status, url
+    raise ValueError(f"more than {MAX_REDIRECTS} redirects")
+
+
+class LinkChecker:
+    """
+    Checks the URLs of the table with a bounded number of concurrent requests.
+
+    A fixed pool of workers consumes rows read from the table in keyset-paginated
+    batches, so memory use does not depend on the size of the table. The size of
+    the pool caps the requests in flight and a semaphore per host keeps a single
+    server from being flooded. Results are written back in batches, each in its
+    own transaction.
+    """
+
+    def __init__(self, conn, concurrency=CONCURRENCY, per_host=PER_HOST_LIMIT, timeout=TIMEOUT, batch_size=CHECK_BATCH_SIZE):
+        self.conn = conn
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.ssl_context = ssl.create_default_context()
+        self._host_limits = {}
+        self._results = []
+        self._counts = {"checked": 0, "ok": 0, "broken": 0, "errors": 0}
+
+    def iter_batches(self, unchecked_only=False):
+        """Yield batches of (id, url) rows in id order"""
+        condition = "AND checked_at IS NULL" if unchecked_only else ""
+        sql = SELECT_BATCH_SQL.format(condition=condition)
+        last_id = 0
+        while True:
+            rows = self.conn.execute(sql, (last_id, self.batch_size)).fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    def flush(self):
+        """Write the pending results back to the table"""
+        if not self._results:
+            return
+        self.conn.executemany(UPDATE_RESULT_SQL, [
+            (result.status, result.final_url, result.error, result.url_id) for result in self._results
+        ])
+        self.conn.commit()
+        self._results = []
+
+    def record(self, result):
+        """Queue a result for writing and update the counters"""
+        self._results.append(result)
+        self._counts["checked"] += 1
+        if result.error is not None:
+            self._counts["errors"] += 1
+        elif is_broken(result.status):
+            self._counts["broken"] += 1
+        else:
+            self._counts["ok"] += 1
+        if len(self._results) >= self.batch_size:
+            self.flush()
+
+    async def check(self, url_id, url):
+        """Check one URL under the per-host limit"""
+        try:
+            host = urlsplit(with_scheme(url)).hostname or ""
+        except ValueError as e:
+            return CheckResult(url_id, None, None, str(e))
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = [asyncio.Semaphore(self.per_host), 0]
+        limit[1] += 1
+        try:
+            async with limit[0]:
+                status, final_url = await check_url(url, self.timeout, self.ssl_context)
+            return CheckResult(url_id, status, final_url, None)
+        except asyncio.TimeoutError:
+            return CheckResult(url_id, None, None, "timeout")
+        except (OSError, ValueError, UnicodeError) as e:
+            return CheckResult(url_id, None, None, str(e) or type(e).__name__)
+        finally:
+            # Forget idle hosts so the table does not grow with every host ever seen
+            limit[1] -= 1
+            if limit[1] == 0:
+                del self._host_limits[host]
+
+    async def worker(self, queue):
+        """Check rows from the queue until it yields None"""
+        while True:
+            row = await queue.get()
+            if row is None:
+                return
+            self.record(await self.check(*row))
+
+    async def run(self, unchecked_only=False):
+        """Check every URL, or only those never checked, and return a CheckSummary"""
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        workers = [asyncio.create_task(self.worker(queue)) for _ in range(self.concurrency)]
+        try:
+            for rows in self.iter_batches(unchecked_only):
+                for row in rows:
+                    await queue.put(row)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            self.flush()
+        return CheckSummary(**self._counts)
+
+
+def check_links(conn, unchecked_only=False, concurrency=CONCURRENCY, per_host=PER_HOST_LIMIT, timeout=TIMEOUT, batch_size=CHECK_BATCH_SIZE):
+    """Check the URLs of the table and record their HTTP status, final URL and check time"""
+    migrate(conn)
+    if conn.in_transaction:
+        conn.commit()
+    checker = LinkChecker(conn, concurrency, per_host, timeout, batch_size)
+    return asyncio.run(checker.run(unchecked_only))
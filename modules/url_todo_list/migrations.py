@@ -0,0 +1,287 @@
+import sqlite3
+from contextlib import contextmanager
+from modules.url_todo_list.canonical import url_hash
+
+# Canonical definition of the urls table
+URLS_TABLE_SQL = """
+CREATE TABLE {table} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    description TEXT,
+    category TEXT,
+    status BOOLEAN NOT NULL DEFAULT 0 CHECK (status IN (0, 1)),
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+);"""
+
+
+def table_exists(conn, table):
+    """Check if a table exists in the main database"""
+    sql = '''SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?'''
+    return conn.execute(sql, (table,)).fetchone() is not None
+
+
+def table_columns(conn, table):
+    """Return the column names of a table"""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def create_canonical_table(conn):
+    """Create the canonical urls table, rebuilding any table created by an older schema.
+
+    Older databases may lack the UNIQUE constraint on url, the timestamp column or the
+    status check. Rows are copied into a fresh table, keeping the first row of any
+    duplicated URL.
+    """
+    if not table_exists(conn, "urls"):
+        conn.execute(URLS_TABLE_SQL.format(table="urls"))
+        return
+
+    columns = table_columns(conn, "urls")
+    timestamp = "timestamp" if "timestamp" in columns else "CURRENT_TIMESTAMP"
+    conn.execute("DROP TABLE IF EXISTS urls_migrated")
+    conn.execute(URLS_TABLE_SQL.format(table="urls_migrated"))
+    conn.execute(f'''
+        INSERT INTO urls_migrated(id, url, description, category, status, timestamp)
+        SELECT id, url, description, category, CASE WHEN status THEN 1 ELSE 0 END, {timestamp}
+        FROM urls
+        WHERE url IS NOT NULL AND id IN (SELECT MIN(id) FROM urls GROUP BY url)''')
+    # Keep the AUTOINCREMENT counter so ids of deleted rows are never reused
+    sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'urls'").fetchone()
+    conn.execute("DROP TABLE urls")
+    conn.execute("ALTER TABLE urls_migrated RENAME TO urls")
+    if sequence is not None:
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = 'urls'")
+        conn.execute("INSERT INTO sqlite_sequence(name, seq) SELECT 'urls', MAX(?, IFNULL(MAX(id), 0)) FROM urls", sequence)
+
+
+def create_filter_indexes(conn):
+    """Index the columns used by the filtered views"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_urls_status ON urls(status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_urls_category ON urls(category)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_urls_timestamp ON urls(timestamp)")
+
+
+SEARCH_TRIGGERS = (
+    '''CREATE TRIGGER urls_fts_insert AFTER INSERT ON urls BEGIN
+        INSERT INTO urls_fts(rowid, url, description, category)
+        VALUES (new.id, new.url, new.description, new.category);
+    END''',
+    '''CREATE TRIGGER urls_fts_delete AFTER DELETE ON urls BEGIN
+        INSERT INTO urls_fts(urls_fts, rowid, url, description, category)
+        VALUES ('delete', old.id, old.url, old.description, old.category);
+    END''',
+    '''CREATE TRIGGER urls_fts_update AFTER UPDATE OF url, description, category ON urls BEGIN
+        INSERT INTO urls_fts(urls_fts, rowid, url, description, category)
+        VALUES ('delete', old.id, old.url, old.description, old.category);
+        INSERT INTO urls_fts(rowid, url, description, category)
+        VALUES (new.id, new.url, new.description, new.category);
+    END''',
+)
+
+TRIGRAM_TRIGGERS = (
+    '''CREATE TRIGGER urls_trigram_insert AFTER INSERT ON urls BEGIN
+        INSERT INTO urls_trigram(rowid, url) VALUES (new.id, new.url);
+    END''',
+    '''CREATE TRIGGER urls_trigram_delete AFTER DELETE ON urls BEGIN
+        INSERT INTO urls_trigram(urls_trigram, rowid, url) VALUES ('delete', old.id, old.url);
+    END''',
+    '''CREATE TRIGGER urls_trigram_update AFTER UPDATE OF url ON urls BEGIN
+        INSERT INTO urls_trigram(urls_trigram, rowid, url) VALUES ('delete', old.id, old.url);
+        INSERT INTO urls_trigram(rowid, url) VALUES (new.id, new.url);
+    END''',
+)
+
+
+def create_search_index(conn):
+    """Create the full-text search tables and the triggers keeping them in sync with urls.
+
+    urls_fts indexes the words of the URL, description and category for ranked and
+    prefix searches; urls_trigram indexes the URL with the trigram tokenizer for
+    substring matches. Both are external-content tables, so the text is not stored
+    twice. SQLite builds without FTS5 or the trigram tokenizer skip the matching
+    table, and searches fall back to LIKE.
+    """
+    try:
+        conn.execute('''
+            CREATE VIRTUAL TABLE urls_fts USING fts5(
+                url, description, category,
+                content='urls', content_rowid='id', prefix='2 3'
+            )''')
+    except sqlite3.OperationalError:
+        return
+    for trigger in SEARCH_TRIGGERS:
+        conn.execute(trigger)
+    conn.execute("INSERT INTO urls_fts(urls_fts) VALUES ('rebuild')")
+
+    try:
+        conn.execute('''
+            CREATE VIRTUAL TABLE urls_trigram USING fts5(
+                url, content='urls', content_rowid='id', tokenize='trigram'
+            )''')
+    except sqlite3.OperationalError:
+        return
+    for trigger in TRIGRAM_TRIGGERS:
+        conn.execute(trigger)
+    conn.execute("INSERT INTO urls_trigram(urls_trigram) VALUES ('rebuild')")
+
+
+def backfill_url_hashes(conn, batch_size=10000):
+    """Compute url_hash for the rows that do not have one yet. Returns the number of rows updated"""
+    updated = 0
+    while True:
+        rows = conn.execute("SELECT id, url FROM urls WHERE url_hash IS NULL LIMIT ?", (batch_size,)).fetchall()
+        if not rows:
+            return updated
+        conn.executemany("UPDATE urls SET url_hash = ? WHERE id = ?", [(url_hash(url), url_id) for url_id, url in rows])
+        updated += len(rows)
+
+
+def add_url_hash(conn):
+    """Add the indexed url_hash column used to detect duplicates of the canonical URL"""
+    conn.execute("ALTER TABLE urls ADD COLUMN url_hash INTEGER")
+    backfill_url_hashes(conn)
+    conn.execute("CREATE INDEX idx_urls_url_hash ON urls(url_hash)")
+
+
+def add_link_check_columns(conn):
+    """Add the columns filled by the link checker"""
+    conn.execute("ALTER TABLE urls ADD COLUMN http_status INTEGER")
+    conn.execute("ALTER TABLE urls ADD COLUMN final_url TEXT")
+    conn.execute("ALTER TABLE urls ADD COLUMN check_error TEXT")
+    conn.execute("ALTER TABLE urls ADD COLUMN checked_at DATETIME")
+    conn.execute("CREATE INDEX idx_urls_checked_at ON urls(checked_at)")
+
+
+STATS_TRIGGERS = (
+    '''CREATE TRIGGER url_stats_insert AFTER INSERT ON urls BEGIN
+        INSERT INTO url_stats(category, status, count) VALUES (IFNULL(new.category, ''), new.status, 1)
+        ON CONFLICT(category, status) DO UPDATE SET count = count + 1;
+    END''',
+    '''CREATE TRIGGER url_stats_delete AFTER DELETE ON urls BEGIN
+        UPDATE url_stats SET count = count - 1 WHERE category = IFNULL(old.category, '') AND status = old.status;
+        DELETE FROM url_stats WHERE category = IFNULL(old.category, '') AND status = old.status AND count <= 0;
+    END''',
+    '''CREATE TRIGGER url_stats_update AFTER UPDATE OF category, status ON urls
+    WHEN old.category IS NOT new.category OR old.status IS NOT new.status BEGIN
+        UPDATE url_stats SET count = count - 1 WHERE category = IFNULL(old.category, '') AND status = old.status;
+        DELETE FROM url_stats WHERE category = IFNULL(old.category, '') AND status = old.status AND count <= 0;
+        INSERT INTO url_stats(category, status, count) VALUES (IFNULL(new.category, ''), new.status, 1)
+        ON CONFLICT(category, status) DO UPDATE SET count = count + 1;
+    END''',
+)
+
+
+def rebuild_stats(conn):
+    """Recount the url_stats summary table from the urls table"""
+    conn.execute("DELETE FROM url_stats")
+    conn.execute('''
+        INSERT INTO url_stats(category, status, count)
+        SELECT IFNULL(category, ''), status, COUNT(*) FROM urls GROUP BY IFNULL(category, ''), status''')
+
+
+def create_stats_table(conn):
+    """Create the url_stats summary table, kept up to date by triggers on urls"""
+    conn.execute('''
+        CREATE TABLE url_stats (
+            category TEXT NOT NULL,
+            status INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (category, status)
+        ) WITHOUT ROWID''')
+    for trigger in STATS_TRIGGERS:
+        conn.execute(trigger)
+    rebuild_stats(conn)
+
+
+# Statements indexing or counting the rows above an id, by table, with the insert trigger they replace
+BULK_INDEX_SQL = {
+    "urls_fts": ("urls_fts_insert", SEARCH_TRIGGERS[0], '''
+        INSERT INTO urls_fts(rowid, url, description, category)
+        SELECT id, url, description, category FROM urls WHERE id > ?'''),
+    "urls_trigram": ("urls_trigram_insert", TRIGRAM_TRIGGERS[0], '''
+        INSERT INTO urls_trigram(rowid, url) SELECT id, url FROM urls WHERE id > ?'''),
+    "url_stats": ("url_stats_insert", STATS_TRIGGERS[0], '''
+        INSERT INTO url_stats(category, status, count)
+        SELECT IFNULL(category, ''), status, COUNT(*) FROM urls WHERE id > ? GROUP BY IFNULL(category, ''), status
+        ON CONFLICT(category, status) DO UPDATE SET count = count + excluded.count'''),
+}
+
+
+@contextmanager
+def deferred_search_index(conn):
+    """Index and count the rows inserted inside the block with one statement per table.
+
+    FTS5 flushes its pending terms at the end of every statement, so indexing
+    through the insert triggers writes one tiny segment per row during an
+    executemany and gets slower as the index grows; the url_stats trigger adds
+    an upsert per row. The insert triggers of the search tables and of url_stats
+    are dropped for the duration of the block, and the new rows are indexed and
+    counted at the end. A transaction started here is BEGIN IMMEDIATE, so no
+    other connection writes between the reads and the inserts of the block.
+    Everything happens in the caller's transaction, which must be committed
+    afterwards, so other connections never see the urls table without its
+    triggers. If the block raises, the transaction is rolled back, which
+    restores the triggers and discards the partial batch.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    tables = [table for table in BULK_INDEX_SQL if table_exists(conn, table)]
+    last_id = conn.execute("SELECT IFNULL(MAX(id), 0) FROM urls").fetchone()[0]
+    for table in tables:
+        conn.execute(f"DROP TRIGGER IF EXISTS {BULK_INDEX_SQL[table][0]}")
+    try:
+        yield
+    except BaseException:
+        conn.rollback()
+        raise
+    for table in tables:
+        _, trigger, index_sql = BULK_INDEX_SQL[table]
+        conn.execute(index_sql, (last_id,))
+        conn.execute(trigger)
+
+
+# Ordered list of migrations. Migration N brings the database to user_version N.
+# Never reorder or edit a released migration: append a new one instead.
+MIGRATIONS = [
+    create_canonical_table,
+    create_filter_indexes,
+    create_search_index,
+    add_url_hash,
+    add_link_check_columns,
+    create_stats_table,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn):
+    """Return the schema version stored in PRAGMA user_version"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Bring the database up to the current schema version.
+
+    Each migration runs in its own transaction together with the user_version bump,
+    so an interrupted upgrade resumes from the last completed step. Statistics are
+    refreshed with ANALYZE once the schema changed.
+    """
+    version = get_schema_version(conn)
+    if version >= SCHEMA_VERSION:
+        return version
+
+    if conn.in_transaction:
+        conn.commit()
+    for number in range(version + 1, SCHEMA_VERSION + 1):
+        try:
+            conn.execute("BEGIN")
+            MIGRATIONS[number - 1](conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+    conn.execute("ANALYZE")
+    conn.commit()
+    return SCHEMA_VERSION
@@ -2,17 +2,37 @@ import os
 import sys
 import sqlite3
 from datetime import datetime
+from itertools import islice
 from rich.console import Console
 from rich.table import Table
-from config import DATABASE
+from config import DATABASE, PAGE_SIZE, SQL_TRACE
+from modules.url_todo_list.connection import connect
+from modules.url_todo_list.importer import import_urls
+from modules.url_todo_list.link_checker import check_links
+from modules.url_todo_list.migrations import migrate
+from modules.url_todo_list.database import iter_urls, fetch_urls_page
+from modules.url_todo_list.bulk import (
+    URLFilter, filter_is_empty, bulk_set_status, bulk_set_category, bulk_delete
+)
+from modules.url_todo_list.archive import (
+    archive_urls, restore_urls, iter_archived_urls, iter_all_urls, count_archived_urls
+)
+from modules.url_todo_list.repository import URLRepository
+from modules.url_todo_list.stats import fetch_category_stats, fetch_totals
+from modules.url_todo_list.search import search_urls, search_url_substring
+from modules.url_todo_list.tracing import enable_tracing, get_tracer
 from modules.url_todo_list.utils import (
     is_valid_url, export_to_csv, export_to_json, export_to_xml
 )
 
 console = Console()
 
+# Number of statements shown by the query statistics view, the most time consuming first
+QUERY_STATS_ROWS = 20
+
 def clear_console():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # Clear with escape codes rather than spawning a shell on every redraw
+    console.clear()
 
 def pause_for_error():
     console.print("[bold blue]Press any key to continue...[/bold blue]")
@@ -27,40 +47,26 @@ def get_database_path(db_name=None):
 
 
 def create_connection(db_file):
-    """Create a database connection to the SQLite database"""
+    """Create a tuned database connection to the SQLite database"""
     conn = None
     try:
-        conn = sqlite3.connect(db_file)
+        conn = connect(db_file)
         return conn
     except sqlite3.Error as e:
         console.print(f"[bold red]Failed to create connection to database {db_file}: {e}[/bold red]")
         return conn
 
 def initialize_database(conn):
-    """Initialize the database with the required table if it doesn't exist"""
-    create_table_sql = """
-    CREATE TABLE IF NOT EXISTS urls (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        url TEXT NOT NULL,
-        description TEXT,
-        category TEXT,
-        status BOOLEAN NOT NULL CHECK (status IN (0, 1))
-    );
-    """
+    """Initialize the database with the required table, upgrading older schemas"""
     try:
-        cur = conn.cursor()
-        cur.execute(create_table_sql)
-        conn.commit()
+        migrate(conn)
     except sqlite3.Error as e:
         console.print(f"[bold red]Failed to initialize database: {e}[/bold red]")
 
 def fetch_all_urls(conn):
     """Fetch all URLs from the table"""
     try:
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM urls")
-        rows = cur.fetchall()
-        return rows
+        return URLRepository(conn).list()
     except sqlite3.Error as e:
         console.print(f"[bold red]Failed to fetch all URLs: {e}[/bold red]")
         return []
@@ -68,10 +74,7 @@ def fetch_all_urls(conn):
 def fetch_urls_by_status(conn, status):
     """Fetch URLs by status"""
     try:
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM urls WHERE status=?", (status,))
-        rows = cur.fetchall()
-        return rows
+        return URLRepository(conn).list(status=status)
     except sqlite3.Error as e:
         console.print(f"[bold red]Failed to fetch URLs by status: {e}[/bold red]")
         return []
@@ -79,10 +82,7 @@ def fetch_urls_by_status(conn, status):
 def fetch_urls_by_category(conn, category):
     """Fetch URLs by category"""
     try:
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM urls WHERE category=?", (category,))
-        rows = cur.fetchall()
-        return rows
+        return URLRepository(conn).list(category=category)
     except sqlite3.Error as e:
         console.print(f"[bold red]Failed to fetch URLs by category: {e}[/bold red]")
         return []
@@ -99,45 +99,115 @@ def add_url(conn):
         pause_for_error()
         return
 
-    sql = ''' INSERT INTO urls(url, description, category, status)
-              VALUES(?,?,?,?) '''
     try:
-        cur = conn.cursor()
-        cur.execute(sql, (url, description, category, False))
-        conn.commit()
-        console.print(f"[bold green]URL '{url}' added successfully![/bold green]")
+        if URLRepository(conn).add(url, description, category) is None:
+            console.print(f"[bold red]URL '{url}' already exists.[/bold red]")
+        else:
+            console.print(f"[bold green]URL '{url}' added successfully![/bold green]")
     except sqlite3.Error as e:
         console.print(f"[bold red]Failed to add URL: {e}[/bold red]")
     finally:
         pause_for_error()
 
+# Upper bound for SQLite integer IDs
+MAX_ID = 2 ** 63 - 1
+
+def display_urls_table(rows):
+    """Print a table of URL rows"""
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("ID", style="dim", width=6)
+    table.add_column("URL", justify="left")
+    table.add_column("Description", justify="left")
+    table.add_column("Category", justify="left")
+    table.add_column("Status", justify="left")
+    for row in rows:
+        table.add_row(str(row.id), row.url, row.description, row.category, str(bool(row.status)))
+    console.print(table)
+
+def describe_filter(status, category):
+    """Describe the active filters of the URL browser"""
+    filters = []
+    if status is not None:
+        filters.append("read" if status else "unread")
+    if category is not None:
+        filters.append(f"category '{category}'")
+    return ", ".join(filters) if filters else "all URLs"
+
+def browse_urls(conn, status=None, category=None, select_prompt=None):
+    """Browse URLs one page at a time.
+
+    Only the visible page is fetched, using keyset pagination on the ID, so moving
+    through the list costs the same whatever the size of the table. When
+    select_prompt is given, entering an ID returns it; otherwise returns None.
+    """
+    page = fetch_urls_page(conn, limit=PAGE_SIZE + 1, status=status, category=category)
+    has_previous = False
+
+    while True:
+        has_next = len(page) > PAGE_SIZE
+        rows = page[:PAGE_SIZE]
+
+        clear_console()
+        console.print(f"\n[bold cyan]URLs ({describe_filter(status, category)}):[/bold cyan]")
+        if rows:
+            display_urls_table(rows)
+            console.print(f"[dim]IDs {rows[0][0]} to {rows[-1][0]}[/dim]")
+        else:
+            console.print("[bold red]No URLs found.[/bold red]")
+
+        commands = []
+        if has_next:
+            commands.append("[n]ext")
+        if has_previous:
+            commands.append("[p]revious")
+        commands += ["[g <id>] go to ID", "[f]ilter", "[q]uit"]
+        prompt = select_prompt + " or " if select_prompt else "Select "
+        choice = console.input(f"\n[bold yellow]{prompt}{', '.join(commands)}:[/bold yellow] ").strip().lower()
+
+        if choice == "q" or choice == "":
+            return None
+        elif choice == "n" and has_next:
+            page = fetch_urls_page(conn, after_id=rows[-1][0], limit=PAGE_SIZE + 1, status=status, category=category)
+            has_previous = True
+        elif choice == "p" and has_previous:
+            # After jumping past the end, the previous page is the last one
+            before_id = rows[0][0] if rows else MAX_ID
+            previous = fetch_urls_page(conn, before_id=before_id, limit=PAGE_SIZE + 1, status=status, category=category)
+            if len(previous) > PAGE_SIZE:
+                # Keep the current first row after the page so "next" stays available
+                page = previous[1:] + rows[:1]
+                has_previous = True
+            else:
+                page = fetch_urls_page(conn, limit=PAGE_SIZE + 1, status=status, category=category)
+                has_previous = False
+        elif choice.startswith("g") and choice[1:].strip().isdigit():
+            start_id = int(choice[1:].strip())
+            page = fetch_urls_page(conn, after_id=start_id - 1, limit=PAGE_SIZE + 1, status=status, category=category)
+            has_previous = bool(fetch_urls_page(conn, before_id=start_id, limit=1, status=status, category=category))
+        elif choice == "f":
+            status_input = console.input("\n[bold yellow]Status (read/unread, leave blank for all):[/bold yellow] ").strip().lower()
+            category_input = console.input("\n[bold yellow]Category (leave blank for all):[/bold yellow] ").strip()
+            status = {"read": True, "unread": False}.get(status_input)
+            category = category_input or None
+            page = fetch_urls_page(conn, limit=PAGE_SIZE + 1, status=status, category=category)
+            has_previous = False
+        elif select_prompt and choice.isdigit():
+            return int(choice)
+        else:
+            console.print("[bold red]Invalid selection.[/bold red]")
+            pause_for_error()
+
 def delete_url(conn):
     """Delete a URL from the table by its ID"""
-    clear_console()
-    console.print("\n[bold cyan]Existing URLs:[/bold cyan]")
-    urls = fetch_all_urls(conn)
-    if urls:
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("ID", style="dim", width=6)
-        table.add_column("URL", justify="left")
-        table.add_column("Description", justify="left")
-        table.add_column("Category", justify="left")
-        table.add_column("Status", justify="left")
-        for row in urls:
-            table.add_row(str(row[0]), row[1], row[2], row[3], str(row[4]))
-        console.print(table)
-    else:
-        console.print("[bold red]No URLs found.[/bold red]")
-        pause_for_error()
+    url_id = browse_urls(conn, select_prompt="Enter the ID of the URL to delete")
+    if url_id is None:
         return
 
-    url_id = console.input("\n[bold yellow]Enter the ID of the URL to delete:[/bold yellow] ")
-    sql = ''' DELETE FROM urls WHERE id=? '''
     try:
-        cur = conn.cursor()
-        cur.execute(sql, (url_id,))
-        conn.commit()
-        console.print(f"[bold green]URL with ID {url_id} deleted successfully![bold green]")
+        if URLRepository(conn).delete(url_id):
+            console.print(f"[bold green]URL with ID {url_id} deleted successfully![/bold green]")
+        else:
+            console.print(f"[bold red]No URL with ID {url_id}.[/bold red]")
     except sqlite3.Error as e:
         console.print(f"[bold red]Failed to delete URL: {e}[/bold red]")
     finally:
@@ -145,49 +215,24 @@ def delete_url(conn):
 
 def update_url(conn):
     """Update the description and/or status of a URL"""
-    clear_console()
-    console.print("\n[bold cyan]Existing URLs:[/bold cyan]")
-    urls = fetch_all_urls(conn)
-    if urls:
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("ID", style="dim", width=6)
-        table.add_column("URL", justify="left")
-        table.add_column("Description", justify="left")
-        table.add_column("Category", justify="left")
-        table.add_column("Status", justify="left")
-        for row in urls:
-            table.add_row(str(row[0]), row[1], row[2], row[3], str(row[4]))
-        console.print(table)
-    else:
-        console.print("[bold red]No URLs found.[/bold red]")
-        pause_for_error()
+    url_id = browse_urls(conn, select_prompt="Enter the ID of the URL to update")
+    if url_id is None:
         return
 
-    url_id = console.input("\n[bold yellow]Enter the ID of the URL to update:[/bold yellow] ")
     description = console.input("\n[bold yellow]Enter new description (leave blank to keep the same):[/bold yellow] ")
     status_input = console.input("\n[bold yellow]Enter new status (True/False) (leave blank to keep the same):[/bold yellow] ")
 
-    # Prepare the SQL update
-    sql = "UPDATE urls SET "
-    params = []
-
-    if description:
-        sql += "description = ?, "
-        params.append(description)
-
-    if status_input:
-        sql += "status = ?, "
-        params.append(status_input.lower() == 'true')
-
-    sql = sql.rstrip(', ')  # Remove the trailing comma
-    sql += " WHERE id = ?"
-    params.append(url_id)
+    if not description and not status_input:
+        console.print("[bold yellow]Nothing to update.[/bold yellow]")
+        pause_for_error()
+        return
 
+    status = status_input.lower() == 'true' if status_input else None
     try:
-        cur = conn.cursor()
-        cur.execute(sql, tuple(params))
-        conn.commit()
-        console.print(f"[bold green]URL with ID {url_id} updated successfully![bold green]")
+        if URLRepository(conn).update(url_id, description=description or None, status=status):
+            console.print(f"[bold green]URL with ID {url_id} updated successfully![/bold green]")
+        else:
+            console.print(f"[bold red]No URL with ID {url_id}.[/bold red]")
     except sqlite3.Error as e:
         console.print(f"[bold red]Failed to update URL: {e}[/bold red]")
     finally:
@@ -205,7 +250,9 @@ def view_urls(conn):
         "1": "All URLs",
         "2": "Read URLs",
         "3": "Unread URLs",
-        "4": "By Category"
+        "4": "By Category",
+        "5": "Search",
+        "6": "URL Contains"
     }
 
     for key, option in view_options.items():
@@ -216,35 +263,27 @@ def view_urls(conn):
     choice = console.input("\n[bold yellow]Select a view option:[/bold yellow] ")
 
     if choice == "1":
-        urls = fetch_all_urls(conn)
+        browse_urls(conn)
     elif choice == "2":
-        urls = fetch_urls_by_status(conn, True)
+        browse_urls(conn, status=True)
     elif choice == "3":
-        urls = fetch_urls_by_status(conn, False)
+        browse_urls(conn, status=False)
     elif choice == "4":
         category = console.input("\n[bold yellow]Enter the category:[/bold yellow] ")
-        urls = fetch_urls_by_category(conn, category)
+        browse_urls(conn, category=category)
+    elif choice in ("5", "6"):
+        query = console.input("\n[bold yellow]Enter the search text:[/bold yellow] ")
+        urls = search_urls(conn, query, PAGE_SIZE) if choice == "5" else search_url_substring(conn, query, PAGE_SIZE)
+        clear_console()
+        console.print(f"\n[bold cyan]Best matches for '{query}':[/bold cyan]")
+        if urls:
+            display_urls_table(urls)
+        else:
+            console.print("[bold red]No URLs found.[/bold red]")
+        pause_for_error()
     else:
         console.print("[bold red]Invalid selection.[/bold red]")
         pause_for_error()
-        return
-
-    if urls:
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("ID", style="dim", width=6)
-        table.add_column("URL", justify="left")
-        table.add_column("Description", justify="left")
-        table.add_column("Category", justify="left")
-        table.add_column("Status", justify="left")
-
-        for row in urls:
-            table.add_row(str(row[0]), row[1], row[2], row[3], str(row[4]))
-
-        console.print(table)
-    else:
-        console.print("[bold red]No URLs found.[/bold red]")
-        # pause_for_error(False)
-    pause_for_error()
 
 def export_urls(conn):
     """Export URLs to a file"""
@@ -256,7 +295,7 @@ def export_urls(conn):
 
     export_options = {
         "1": "CSV",
-        "2": "JSON",
+        "2": "JSON / NDJSON",
         "3": "XML"
     }
 
@@ -268,11 +307,14 @@ def export_urls(conn):
     choice = console.input("\n[bold yellow]Select an export format:[/bold yellow] ")
     filename = console.input("\n[bold yellow]Enter the filename:[/bold yellow] ")
 
-    urls = fetch_all_urls(conn)
+    include_archived = console.input("\n[bold yellow]Include archived URLs? (y/n):[/bold yellow] ").strip().lower() == "y"
+
+    # Rows are streamed from the database to the file; a .gz filename compresses the output
+    urls = iter_all_urls(conn) if include_archived else iter_urls(conn)
     if choice == "1":
         export_to_csv(urls, filename)
     elif choice == "2":
-        export_to_json(urls, filename)
+        export_to_json(urls, filename, ndjson=filename.lower().endswith((".ndjson", ".ndjson.gz")))
     elif choice == "3":
         export_to_xml(urls, filename)
     else:
@@ -283,7 +325,215 @@ def export_urls(conn):
     console.print(f"[bold green]URLs exported successfully to {filename}.[/bold green]")
     pause_for_error()
 
+def import_urls_menu(conn):
+    """Import URLs from a CSV, JSON or XML file"""
+    clear_console()
+    filename = console.input("\n[bold yellow]Enter the filename to import:[/bold yellow] ")
+    try:
+        result = import_urls(conn, filename)
+        console.print(f"[bold green]Read {result.read} URLs: {result.inserted} imported, {result.duplicates} duplicate(s) and {result.invalid} invalid URL(s) skipped.[/bold green]")
+    except (OSError, ValueError, sqlite3.Error) as e:
+        console.print(f"[bold red]Failed to import URLs: {e}[/bold red]")
+    pause_for_error()
+
+def check_links_menu(conn):
+    """Check every URL for dead links"""
+    clear_console()
+    unchecked_only = console.input("\n[bold yellow]Only check URLs never checked before? (y/n):[/bold yellow] ").strip().lower() == "y"
+    console.print("[bold cyan]Checking links...[/bold cyan]")
+    try:
+        summary = check_links(conn, unchecked_only=unchecked_only)
+        console.print(f"[bold green]Checked {summary.checked} URLs: {summary.ok} ok, {summary.broken} broken, {summary.errors} unreachable.[/bold green]")
+    except sqlite3.Error as e:
+        console.print(f"[bold red]Failed to check links: {e}[/bold red]")
+    pause_for_error()
+
+def show_stats(conn):
+    """Show the read and unread counts per category"""
+    clear_console()
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Category", justify="left")
+    table.add_column("Read", justify="right")
+    table.add_column("Unread", justify="right")
+    table.add_column("Total", justify="right")
+    for stats in fetch_category_stats(conn):
+        table.add_row(stats.category or "(none)", str(stats.read), str(stats.unread), str(stats.total))
+    totals = fetch_totals(conn)
+    table.add_row("[bold]All[/bold]", str(totals.read), str(totals.unread), str(totals.total))
+    console.print(table)
+    pause_for_error()
+
+def prompt_url_filter():
+    """Ask for the filters of a bulk action, every one optional"""
+    console.print("\n[bold cyan]Select the URLs (leave blank to skip a filter):[/bold cyan]")
+    status_input = console.input("[bold yellow]Status (read/unread):[/bold yellow] ").strip().lower()
+    category = console.input("[bold yellow]Category:[/bold yellow] ").strip()
+    min_id = console.input("[bold yellow]From ID:[/bold yellow] ").strip()
+    max_id = console.input("[bold yellow]To ID:[/bold yellow] ").strip()
+    since = console.input("[bold yellow]Added since (YYYY-MM-DD, UTC):[/bold yellow] ").strip()
+    until = console.input("[bold yellow]Added until (YYYY-MM-DD, UTC):[/bold yellow] ").strip()
+    search = console.input("[bold yellow]Matching text:[/bold yellow] ").strip()
+    if status_input and status_input not in ("read", "unread"):
+        raise ValueError("status must be read or unread")
+    return URLFilter(
+        status=(status_input == "read") if status_input else None,
+        category=category or None,
+        min_id=int(min_id) if min_id else None,
+        max_id=int(max_id) if max_id else None,
+        start_time=since or None,
+        end_time=until or None,
+        search=search or None,
+    )
+
+def bulk_actions(conn):
+    """Mark, recategorize or delete every URL matching a filter, after a preview"""
+    clear_console()
+    console.print("\n[bold cyan]Bulk Actions:[/bold cyan]")
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Option", style="dim", width=12)
+    table.add_column("Action", justify="left")
+    bulk_options = {
+        "1": "Mark as read",
+        "2": "Mark as unread",
+        "3": "Change category",
+        "4": "Delete"
+    }
+    for key, option in bulk_options.items():
+        table.add_row(key, option)
+    console.print(table)
+
+    choice = console.input("\n[bold yellow]Select an action:[/bold yellow] ").strip()
+    if choice == "1":
+        action = lambda dry_run: bulk_set_status(conn, url_filter, True, dry_run)
+    elif choice == "2":
+        action = lambda dry_run: bulk_set_status(conn, url_filter, False, dry_run)
+    elif choice == "3":
+        category = console.input("\n[bold yellow]New category:[/bold yellow] ").strip()
+        action = lambda dry_run: bulk_set_category(conn, url_filter, category, dry_run)
+    elif choice == "4":
+        action = lambda dry_run: bulk_delete(conn, url_filter, dry_run)
+    else:
+        console.print("[bold red]Invalid selection.[/bold red]")
+        pause_for_error()
+        return
+
+    try:
+        url_filter = prompt_url_filter()
+    except ValueError as e:
+        console.print(f"[bold red]Invalid filter: {e}[/bold red]")
+        pause_for_error()
+        return
+    if filter_is_empty(url_filter):
+        confirm = console.input("\n[bold red]No filter given: apply to every URL? (y/n):[/bold red] ")
+        if confirm.strip().lower() != "y":
+            return
+
+    try:
+        preview = action(dry_run=True)
+        console.print(f"\n[bold cyan]{preview.changed} of {preview.matched} matching URLs would change. First matches:[/bold cyan]")
+        display_urls_table(preview.preview)
+        if not preview.changed:
+            pause_for_error()
+            return
+        confirm = console.input(f"\n[bold yellow]{bulk_options[choice]} {preview.changed} URLs? (y/n):[/bold yellow] ")
+        if confirm.strip().lower() != "y":
+            return
+        result = action(dry_run=False)
+        console.print(f"[bold green]{result.changed} URLs changed.[/bold green]")
+    except sqlite3.Error as e:
+        console.print(f"[bold red]Bulk action failed: {e}[/bold red]")
+    pause_for_error()
+
+def prompt_archive_cutoff(conn):
+    """Ask for a number of days until it is valid, returning the time that many days ago or None for all URLs"""
+    while True:
+        days = console.input("\n[bold yellow]Only URLs added more than N days ago (blank for all):[/bold yellow] ").strip()
+        if not days:
+            return None
+        if days.isdecimal():
+            # datetime() returns NULL for dates out of its range, which would select every URL
+            end_time = conn.execute("SELECT datetime('now', ?)", (f"-{int(days)} days",)).fetchone()[0]
+            if end_time is not None:
+                return end_time
+        console.print("[bold red]Enter a whole number of days, 0 or more.[/bold red]")
+
+def archive_menu(conn):
+    """Move read URLs to the archive database, browse or restore the archived ones"""
+    clear_console()
+    console.print(f"\n[bold cyan]Archive:[/bold cyan] {count_archived_urls(conn)} archived URLs")
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Option", style="dim", width=12)
+    table.add_column("Action", justify="left")
+    archive_options = {
+        "1": "Archive read URLs",
+        "2": "View archived URLs",
+        "3": "Restore archived URLs"
+    }
+    for key, option in archive_options.items():
+        table.add_row(key, option)
+    console.print(table)
+
+    choice = console.input("\n[bold yellow]Select an action:[/bold yellow] ").strip()
+    try:
+        if choice == "1":
+            url_filter = URLFilter(status=True, end_time=prompt_archive_cutoff(conn))
+            preview = archive_urls(conn, url_filter, dry_run=True)
+            confirm = console.input(f"\n[bold yellow]Archive {preview.matched} read URLs? (y/n):[/bold yellow] ")
+            if confirm.strip().lower() != "y":
+                return
+            result = archive_urls(conn, url_filter)
+            console.print(f"[bold green]{result.moved} URLs archived, {result.freed_pages} database pages freed.[/bold green]")
+        elif choice == "2":
+            archived = iter_archived_urls(conn)
+            display_urls_table(list(islice(archived, PAGE_SIZE)))
+            # Detach the archive now rather than when the generator is collected
+            archived.close()
+        elif choice == "3":
+            category = console.input("\n[bold yellow]Category to restore (blank for all):[/bold yellow] ").strip()
+            restored = restore_urls(conn, category=category or None)
+            console.print(f"[bold green]{restored} URLs restored.[/bold green]")
+        else:
+            console.print("[bold red]Invalid selection.[/bold red]")
+    except (sqlite3.Error, ValueError) as e:
+        console.print(f"[bold red]Archive action failed: {e}[/bold red]")
+    pause_for_error()
+
+def show_query_stats(conn):
+    """Show the latency, row and call counts of the SQL statements run so far"""
+    clear_console()
+    tracer = get_tracer()
+    if tracer is None:
+        enable = console.input("\n[bold yellow]Query tracing is off. Enable it for this session? (y/n):[/bold yellow] ")
+        if enable.strip().lower() == "y":
+            enable_tracing()
+            console.print("[bold green]Query tracing enabled.[/bold green]")
+        pause_for_error()
+        return
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Query", justify="left", overflow="fold")
+    table.add_column("Calls", justify="right")
+    table.add_column("Rows", justify="right")
+    table.add_column("Total (ms)", justify="right")
+    table.add_column("Mean (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    table.add_column("Max (ms)", justify="right")
+    table.add_column("Errors", justify="right")
+    for stats in tracer.summary()[:QUERY_STATS_ROWS]:
+        table.add_row(stats.query, str(stats.calls), str(stats.rows), f"{stats.total_seconds * 1000:.2f}",
+                      f"{stats.mean_seconds * 1000:.3f}", f"{stats.p95_seconds * 1000:.3f}",
+                      f"{stats.max_seconds * 1000:.3f}", str(stats.errors))
+    console.print(table)
+
+    filename = console.input("\n[bold yellow]Write a Prometheus file (filename, empty to skip):[/bold yellow] ").strip()
+    if filename and tracer.dump_prometheus(filename):
+        console.print(f"[bold green]Query statistics written to {filename}.[/bold green]")
+    pause_for_error()
+
 def run():
+    if SQL_TRACE:
+        enable_tracing()
+
     # Get the database path
     db_path = get_database_path(DATABASE)
     conn = create_connection(db_path)
@@ -296,7 +546,8 @@ def run():
     while True:
         # Interactive Console Menu
         clear_console()
-        console.print("\n[bold cyan]Main Menu:[/bold cyan]")
+        totals = fetch_totals(conn)
+        console.print(f"\n[bold cyan]Main Menu:[/bold cyan] {totals.total} URLs, {totals.unread} unread")
         table = Table(show_header=True, header_style="bold magenta")
         table.add_column("Option", style="dim", width=12)
         table.add_column("Action", justify="left")
@@ -307,7 +558,13 @@ def run():
             "3": "View URLs",
             "4": "Update URL",
             "5": "Export URLs",
-            "6": "Exit"
+            "6": "Import URLs",
+            "7": "Check Links",
+            "8": "Statistics",
+            "9": "Bulk Actions",
+            "10": "Archive",
+            "11": "Query Statistics",
+            "12": "Exit"
         }
 
         for key, option in main_options.items():
@@ -328,6 +585,18 @@ def run():
         elif choice == "5":
             export_urls(conn)
         elif choice == "6":
+            import_urls_menu(conn)
+        elif choice == "7":
+            check_links_menu(conn)
+        elif choice == "8":
+            show_stats(conn)
+        elif choice == "9":
+            bulk_actions(conn)
+        elif choice == "10":
+            archive_menu(conn)
+        elif choice == "11":
+            show_query_stats(conn)
+        elif choice == "12":
             console.print("[bold cyan]Exiting...[/bold cyan]")
             break
         else:
@@ -0,0 +1,161 @@
+from collections import namedtuple
+from functools import partial
+from modules.url_todo_list.cache import cached_fetchall, invalidate
+from modules.url_todo_list.canonical import url_hash
+
+# Columns shown and exported everywhere. The timestamp and link check columns are
+# only read by the queries that need them.
+URL_COLUMNS = ("id", "url", "description", "category", "status")
+
+# Immutable row of the urls table. Being a tuple, it stays compatible with code
+# indexing rows by position, without a per-row __dict__.
+URLRecord = namedtuple("URLRecord", URL_COLUMNS)
+
+# Same as URLRecord._make without its length check, about twice as fast; the
+# queries below always select URL_COLUMNS
+make_record = partial(tuple.__new__, URLRecord)
+
+SELECT_URLS_SQL = f"SELECT {', '.join(URL_COLUMNS)} FROM urls"
+
+# Inserts a URL unless its canonical form is already stored: one probe of idx_urls_url_hash.
+# The same URL always has the same hash, so the guard alone skips duplicates, and a
+# plain INSERT lets NOT NULL, CHECK and UNIQUE violations raise instead of being ignored.
+INSERT_URL_SQL = '''INSERT INTO urls(url, description, category, status, url_hash)
+                    SELECT ?, ?, ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM urls WHERE url_hash = ?)'''
+
+URL_EXISTS_SQL = '''SELECT 1 FROM urls WHERE url_hash = ?'''
+
+DELETE_URL_SQL = '''DELETE FROM urls WHERE id = ?'''
+
+ITER_BATCH_SIZE = 1000
+
+
+def insert_url_params(url, description, category, status=False):
+    """Build the parameters of INSERT_URL_SQL for a URL"""
+    hashed = url_hash(url)
+    return (url, description, category, status, hashed, hashed)
+
+
+def filter_conditions(status=None, category=None):
+    """Return the WHERE conditions and parameters for the optional status and category filters"""
+    conditions = []
+    params = []
+    if status is not None:
+        conditions.append("status = ?")
+        params.append(status)
+    if category is not None:
+        conditions.append("category = ?")
+        params.append(category)
+    return conditions, params
+
+
+def where_clause(conditions):
+    """Join WHERE conditions, or return an empty string if there are none"""
+    return " WHERE " + " AND ".join(conditions) if conditions else ""
+
+
+class URLRepository:
+    """
+    Single access point to the urls table.
+
+    Every query names its columns and returns URLRecord rows. Statements are
+    built from module-level constants, so the sqlite3 statement cache of the
+    connection prepares each of them once. Reads that return lists go through
+    the query cache of the connection and writes invalidate it. iter() streams
+    rows instead of building a list.
+
+    Methods raise sqlite3.Error; the functions of database.py report them.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def commit(self):
+        self.conn.commit()
+
+    def add(self, url, description, category, status=False, commit=True):
+        """Insert a URL. Returns its ID, or None if the same canonical URL is already stored"""
+        cur = self.conn.execute(INSERT_URL_SQL, insert_url_params(url, description, category, status))
+        invalidate(self.conn)
+        if commit:
+            self.conn.commit()
+        return cur.lastrowid if cur.rowcount else None
+
+    def exists(self, url):
+        """Check if a URL, or another form of the same canonical URL, is stored"""
+        return self.conn.execute(URL_EXISTS_SQL, (url_hash(url),)).fetchone() is not None
+
+    def get(self, url_id):
+        """Return the record of an ID, or None"""
+        row = self.conn.execute(SELECT_URLS_SQL + " WHERE id = ?", (url_id,)).fetchone()
+        return None if row is None else make_record(row)
+
+    def update(self, url_id, description=None, status=None, commit=True):
+        """Change the description and/or status of a URL. Returns True if the URL exists"""
+        assignments = []
+        params = []
+        if description is not None:
+            assignments.append("description = ?")
+            params.append(description)
+        if status is not None:
+            assignments.append("status = ?")
+            params.append(status)
+        if not assignments:
+            return self.get(url_id) is not None
+        params.append(url_id)
+        cur = self.conn.execute(f"UPDATE urls SET {', '.join(assignments)} WHERE id = ?", params)
+        invalidate(self.conn)
+        if commit:
+            self.conn.commit()
+        return cur.rowcount > 0
+
+    def delete(self, url_id, commit=True):
+        """Delete a URL by ID. Returns True if it existed"""
+        cur = self.conn.execute(DELETE_URL_SQL, (url_id,))
+        invalidate(self.conn)
+        if commit:
+            self.conn.commit()
+        return cur.rowcount > 0
+
+    def list(self, status=None, category=None):
+        """Return the URLs matching the filters as a list, in ID order"""
+        conditions, params = filter_conditions(status, category)
+        sql = SELECT_URLS_SQL + where_clause(conditions) + " ORDER BY id"
+        return cached_fetchall(self.conn, sql, params, make_record)
+
+    def iter(self, status=None, category=None, batch_size=ITER_BATCH_SIZE):
+        """Yield the URLs matching the filters in ID order, fetching them in batches"""
+        conditions, params = filter_conditions(status, category)
+        cur = self.conn.execute(SELECT_URLS_SQL + where_clause(conditions) + " ORDER BY id", params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from map(make_record, rows)
+
+    def page(self, after_id=None, before_id=None, limit=20, status=None, category=None):
+        """Return one page of URLs ordered by ID using keyset pagination.
+
+        Returns the first `limit` rows with an ID greater than after_id, or the last
+        `limit` rows with an ID lower than before_id, so the cost of a page does not
+        depend on its position in the table.
+        """
+        conditions, params = filter_conditions(status, category)
+        if before_id is not None:
+            conditions.append("id < ?")
+            params.append(before_id)
+            order = "DESC"
+        else:
+            if after_id is not None:
+                conditions.append("id > ?")
+                params.append(after_id)
+            order = "ASC"
+        params.append(limit)
+        sql = SELECT_URLS_SQL + where_clause(conditions) + f" ORDER BY id {order} LIMIT ?"
+        rows = cached_fetchall(self.conn, sql, params, make_record)
+        return rows[::-1] if before_id is not None else rows
+
+    def between(self, start_time, end_time):
+        """Return the URLs added between two timestamps"""
+        sql = SELECT_URLS_SQL + " WHERE timestamp BETWEEN ? AND ? ORDER BY id"
+        return cached_fetchall(self.conn, sql, (start_time, end_time), make_record)
@@ -0,0 +1,74 @@
+import re
+import sqlite3
+from modules.url_todo_list.migrations import table_exists
+from modules.url_todo_list.repository import SELECT_URLS_SQL, make_record
+
+SEARCH_LIMIT = 50
+
+# The trigram tokenizer needs at least three characters to match
+TRIGRAM_MIN_LENGTH = 3
+
+TOKEN_REGEX = re.compile(r"\w+", re.UNICODE)
+
+RANKED_SEARCH_SQL = '''
+    SELECT urls.id, urls.url, urls.description, urls.category, urls.status
+    FROM urls_fts JOIN urls ON urls.id = urls_fts.rowid
+    WHERE urls_fts MATCH ?
+    ORDER BY bm25(urls_fts, 1.0, 2.0, 1.5)
+    LIMIT ?'''
+
+SUBSTRING_SEARCH_SQL = '''
+    SELECT urls.id, urls.url, urls.description, urls.category, urls.status
+    FROM urls_trigram JOIN urls ON urls.id = urls_trigram.rowid
+    WHERE urls_trigram MATCH ?
+    ORDER BY urls.id
+    LIMIT ?'''
+
+LIKE_SEARCH_SQL = SELECT_URLS_SQL + ''' WHERE {conditions} ORDER BY id LIMIT ?'''
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query where every word is a quoted prefix and all must match"""
+    tokens = TOKEN_REGEX.findall(text)
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def escape_like(text):
+    """Escape LIKE wildcards so the text matches literally"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def like_search(conn, text, columns, limit):
+    """Fallback search scanning the table with LIKE"""
+    pattern = f"%{escape_like(text)}%"
+    conditions = " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column in columns)
+    cur = conn.execute(LIKE_SEARCH_SQL.format(conditions=conditions), [pattern] * len(columns) + [limit])
+    return list(map(make_record, cur))
+
+
+def search_urls(conn, query, limit=SEARCH_LIMIT):
+    """Search URLs, descriptions and categories by words or word prefixes, best matches first"""
+    match = build_match_query(query)
+    if not match:
+        return []
+    try:
+        if table_exists(conn, "urls_fts"):
+            return list(map(make_record, conn.execute(RANKED_SEARCH_SQL, (match, limit))))
+        return like_search(conn, query.strip(), ("url", "description", "category"), limit)
+    except sqlite3.Error as e:
+        print(f"Failed to search URLs: {e}")
+        return []
+
+
+def search_url_substring(conn, text, limit=SEARCH_LIMIT):
+    """Find URLs containing the given text anywhere, using the trigram index when possible"""
+    text = text.strip()
+    if not text:
+        return []
+    try:
+        if len(text) >= TRIGRAM_MIN_LENGTH and table_exists(conn, "urls_trigram"):
+            return list(map(make_record, conn.execute(SUBSTRING_SEARCH_SQL, ('"' + text.replace('"', '""') + '"', limit))))
+        return like_search(conn, text, ("url",), limit)
+    except sqlite3.Error as e:
+        print(f"Failed to search URLs: {e}")
+        return []
@@ -0,0 +1,567 @@
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from modules.url_todo_list.connection import (
+    ConnectionManager, PoolTimeoutError, connect, is_memory_database, MAX_READERS
+)
+from modules.url_todo_list.migrations import migrate
+from modules.url_todo_list.repository import URLRepository
+from modules.url_todo_list.search import search_urls, search_url_substring, SEARCH_LIMIT
+from modules.url_todo_list.stats import fetch_category_stats, fetch_totals
+from modules.url_todo_list.utils import is_valid_url, write_csv, write_json, write_xml
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Rows per page of GET /urls?limit=N
+MAX_PAGE_LIMIT = 1000
+
+# Largest value of an SQLite INTEGER; larger IDs and parameters are refused with 400
+MAX_INTEGER = 2 ** 63 - 1
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 64 * 1024
+
+# Bytes buffered before a chunk of a streamed response is sent
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Rendered responses kept per server, and the largest one kept
+RESPONSE_CACHE_SIZE = 256
+MAX_CACHED_BODY = 256 * 1024
+
+# Seconds a client socket may stay silent, or refuse to take more of a response,
+# before it is dropped. A streamed response holds a pooled reader, and its WAL
+# snapshot, until it is fully sent, so stalled clients must not keep it forever.
+REQUEST_TIMEOUT = 30
+
+# Seconds a request waits for a free read connection before answering 503
+READER_TIMEOUT = 5
+
+# Pending connections queued by the kernel before accept(), for bursts of clients
+REQUEST_QUEUE_SIZE = 128
+
+# Media type and writer of each export format; writers take the URLs and a text file object
+EXPORT_FORMATS = {
+    "json": ("application/json", lambda urls, out: write_json(urls, out.write)),
+    "ndjson": ("application/x-ndjson", lambda urls, out: write_json(urls, out.write, ndjson=True)),
+    "csv": ("text/csv", write_csv),
+    "xml": ("application/xml", lambda urls, out: write_xml(urls, out.write)),
+}
+
+JSON_TYPE = "application/json"
+
+# Host names always accepted in the Host and Origin headers, besides the bound address
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+class APIError(Exception):
+    """Raised by a request handler to answer with an HTTP error"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def record_to_dict(record):
+    """Convert a URLRecord to its JSON representation"""
+    return {
+        "id": record.id,
+        "url": record.url,
+        "description": record.description,
+        "category": record.category,
+        "status": bool(record.status),
+    }
+
+
+def encode_json(data):
+    """Serialize a response body"""
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def parse_int(params, name, default=None, minimum=0, maximum=MAX_INTEGER):
+    """Read an integer query parameter, raising APIError if it is malformed or out of range"""
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"'{name}' must be an integer")
+    if number < minimum or number > maximum:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"'{name}' must be between {minimum} and {maximum}")
+    return number
+
+
+def parse_id(value):
+    """Convert the URL ID of a path to an integer, raising APIError if SQLite cannot store it"""
+    url_id = int(value)
+    if url_id > MAX_INTEGER:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"ID {value} is out of range")
+    return url_id
+
+
+def header_host(value):
+    """Return the lowercased host of a Host header or an Origin URL, without port or brackets"""
+    if "://" in value:
+        value = urlsplit(value).netloc
+    value = value.strip().lower()
+    if value.startswith("["):
+        return value[1:].partition("]")[0]
+    return value.rpartition(":")[0] if value.count(":") == 1 else value
+
+
+def parse_status(value):
+    """Convert a status parameter (read/unread, true/false, 1/0) to a boolean, None when absent"""
+    if value is None:
+        return None
+    normalized = value.strip().lower()
+    if normalized in ("read", "true", "1", "yes"):
+        return True
+    if normalized in ("unread", "false", "0", "no"):
+        return False
+    raise APIError(HTTPStatus.BAD_REQUEST, f"invalid status '{value}' (expected read or unread)")
+
+
+class DatabaseVersion:
+    """
+    Identifies the state of the database for ETags and the response cache.
+
+    PRAGMA data_version changes whenever another connection commits, so a
+    dedicated connection that never writes sees a new value after every commit,
+    whether it comes from the server's writer or from another process such as
+    the menu or the command line. Reading it costs no page access. The ETag
+    also holds a per-server nonce, since the counter restarts with the server.
+    In-memory databases are only written through the server's writer, whose
+    change counter is used instead.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.nonce = uuid.uuid4().hex[:8]
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def current(self):
+        """Return the current version number"""
+        if is_memory_database(self.manager.db_file):
+            with self.manager.write_lock:
+                return self.manager.writer.total_changes
+        with self._lock:
+            if self._conn is None:
+                self._conn = connect(self.manager.db_file, read_only=True, check_same_thread=False)
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def etag(self, version):
+        """Return the ETag of the responses rendered at a version"""
+        return f'"{self.nonce}-{version}"'
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class ResponseCache:
+    """
+    LRU cache of rendered GET responses, keyed by request target.
+
+    An entry is only served for the database version it was rendered at. The
+    version is read before the query, so a body is never older than its version;
+    at worst a commit landing in between makes the entry newer than its ETag and
+    it is rendered once more on the next request.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE, max_body=MAX_CACHED_BODY):
+        self.max_entries = max_entries
+        self.max_body = max_body
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        """Return the body cached for a target at a version, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, version, body):
+        """Remember the body of a target rendered at a version"""
+        if len(body) > self.max_body:
+            return
+        with self._lock:
+            self._entries[key] = (version, body)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class ChunkedWriter:
+    """Text file object sending what is written as an HTTP/1.1 chunked body, STREAM_CHUNK_SIZE bytes at a time"""
+
+    def __init__(self, wfile, chunk_size=STREAM_CHUNK_SIZE):
+        self.wfile = wfile
+        self.chunk_size = chunk_size
+        self._buffer = []
+        self._size = 0
+
+    def write(self, text):
+        data = text.encode("utf-8")
+        self._buffer.append(data)
+        self._size += len(data)
+        if self._size >= self.chunk_size:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self._size:
+            data = b"".join(self._buffer)
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self._buffer = []
+            self._size = 0
+
+    def close(self):
+        """Send the buffered data and the last chunk"""
+        self.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def write_records(urls, out):
+    """Write records as the JSON array of GET /urls, one at a time"""
+    separator = "["
+    for record in urls:
+        out.write(separator)
+        out.write(json.dumps(record_to_dict(record), separators=(",", ":")))
+        separator = ","
+    out.write("[]" if separator == "[" else "]")
+
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API over the urls table.
+
+    GET  /urls                  every URL, streamed (?status=, ?category=)
+    GET  /urls?limit=N          one page in ID order (?after_id=), with next_after_id
+    GET  /urls/<id>             one URL
+    GET  /search?q=             full-text search (?substring=1, ?limit=)
+    GET  /stats                 read and unread counts per category
+    GET  /export?format=        streamed export: json, ndjson, csv or xml
+    POST /urls                  add a URL: {"url", "description", "category"}
+    PATCH /urls/<id>            change {"description", "status"}
+    DELETE /urls/<id>           delete a URL
+
+    Reads run on the pooled read-only connections of the server and writes on
+    its single writer, one at a time. GET responses carry an ETag derived from
+    the database version and answer If-None-Match with 304 Not Modified.
+
+    Web pages open in a browser can reach a local server: requests whose Host
+    or Origin is not the bound address or a loopback name are refused, which
+    defeats DNS rebinding, and bodies must be sent as application/json, which a
+    cross-origin page cannot do without a preflight the server never grants.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "url_todo_list"
+    # Headers and body are separate writes: do not hold the body back until the headers are acknowledged
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        # Socket timeout of StreamRequestHandler: a stalled client raises instead of blocking its thread
+        self.timeout = self.server.request_timeout
+        super().setup()
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def dispatch(self, method):
+        """Route a request to its handler and turn errors into JSON responses"""
+        target = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(target.query).items()}
+        try:
+            self.check_origin()
+            # Read the body first, so the connection stays usable whatever the response
+            body = self.read_body(method)
+            allowed = []
+            for route_method, pattern, name in ROUTES:
+                match = pattern.fullmatch(target.path)
+                if match is None:
+                    continue
+                if route_method == method:
+                    getattr(self, name)(params, body, *match.groups())
+                    return
+                allowed.append(route_method)
+            if allowed:
+                raise APIError(HTTPStatus.METHOD_NOT_ALLOWED, f"Use {', '.join(allowed)} on {target.path}")
+            raise APIError(HTTPStatus.NOT_FOUND, f"No route for {target.path}")
+        except APIError as e:
+            self.send_json(e.status, {"error": e.message})
+        except PoolTimeoutError:
+            self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Too many requests in progress, retry later"},
+                           headers=[("Retry-After", "1")])
+        except sqlite3.Error as e:
+            self.send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Database error: {e}"})
+
+    def check_origin(self):
+        """Refuse requests naming another host, as sent by pages of other sites"""
+        host = self.headers.get("Host")
+        if host is None or header_host(host) not in self.server.allowed_hosts:
+            self.close_connection = True
+            raise APIError(HTTPStatus.FORBIDDEN, f"Host '{host}' is not allowed")
+        origin = self.headers.get("Origin")
+        if origin is not None and header_host(origin) not in self.server.allowed_hosts:
+            self.close_connection = True
+            raise APIError(HTTPStatus.FORBIDDEN, f"Origin '{origin}' is not allowed")
+
+    def read_body(self, method):
+        """Read and decode the JSON body of the request, {} when there is none"""
+        if method in ("POST", "PATCH"):
+            content_type = self.headers.get("Content-Type", "").partition(";")[0].strip().lower()
+            if content_type != JSON_TYPE:
+                self.close_connection = True
+                raise APIError(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, f"Send the body as {JSON_TYPE}")
+        length = self.headers.get("Content-Length")
+        if not length:
+            return {}
+        try:
+            length = int(length)
+        except ValueError:
+            self.close_connection = True
+            raise APIError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            raise APIError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Request bodies are limited to {MAX_BODY_SIZE} bytes")
+        try:
+            data = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise APIError(HTTPStatus.BAD_REQUEST, "Invalid JSON body")
+        if not isinstance(data, dict):
+            raise APIError(HTTPStatus.BAD_REQUEST, "The body must be a JSON object")
+        return data
+
+    def send_body(self, status, body, content_type=JSON_TYPE, etag=None, headers=()):
+        """Send a complete response"""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, data, headers=()):
+        self.send_body(status, encode_json(data), headers=headers)
+
+    def not_modified(self, etag):
+        """Answer 304 if the client already holds the current version. Returns True if it did"""
+        header = self.headers.get("If-None-Match")
+        if header is None:
+            return False
+        candidates = [candidate.strip() for candidate in header.split(",")]
+        if etag not in candidates and f"W/{etag}" not in candidates and "*" not in candidates:
+            return False
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_header("ETag", etag)
+        self.end_headers()
+        return True
+
+    def send_cacheable(self, render):
+        """Answer a GET with the JSON rendered by render(conn), from the response cache when still current"""
+        version = self.server.version.current()
+        etag = self.server.version.etag(version)
+        if self.not_modified(etag):
+            return
+        body = self.server.cache.get(self.path, version)
+        if body is None:
+            with self.server.manager.read(self.server.reader_timeout) as conn:
+                body = encode_json(render(conn))
+            self.server.cache.put(self.path, version, body)
+        self.send_body(HTTPStatus.OK, body, etag=etag)
+
+    def send_stream(self, content_type, write, headers=()):
+        """Answer a GET with the output of write(conn, out), sent in chunks while rows are read"""
+        etag = self.server.version.etag(self.server.version.current())
+        if self.not_modified(etag):
+            return
+        with self.server.manager.read(self.server.reader_timeout) as conn:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("ETag", etag)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            out = ChunkedWriter(self.wfile)
+            try:
+                write(conn, out)
+                out.close()
+            except (sqlite3.Error, OSError):
+                # The status line is already sent: drop the connection so the client sees a truncated body
+                self.close_connection = True
+
+    def list_urls(self, params, body):
+        status = parse_status(params.get("status"))
+        category = params.get("category")
+        limit = parse_int(params, "limit", minimum=1, maximum=MAX_PAGE_LIMIT)
+        if limit is None:
+            self.send_stream(JSON_TYPE, lambda conn, out: write_records(URLRepository(conn).iter(status, category), out))
+            return
+        after_id = parse_int(params, "after_id")
+
+        def render(conn):
+            rows = URLRepository(conn).page(after_id=after_id, limit=limit, status=status, category=category)
+            return {
+                "urls": [record_to_dict(record) for record in rows],
+                "next_after_id": rows[-1].id if len(rows) == limit else None,
+            }
+        self.send_cacheable(render)
+
+    def get_url(self, params, body, url_id):
+        url_id = parse_id(url_id)
+
+        def render(conn):
+            record = URLRepository(conn).get(url_id)
+            if record is None:
+                raise APIError(HTTPStatus.NOT_FOUND, f"No URL with ID {url_id}")
+            return record_to_dict(record)
+        self.send_cacheable(render)
+
+    def search(self, params, body):
+        query = params.get("q", "")
+        limit = parse_int(params, "limit", SEARCH_LIMIT, minimum=1, maximum=MAX_PAGE_LIMIT)
+        search = search_url_substring if params.get("substring") in ("1", "true", "yes") else search_urls
+        self.send_cacheable(lambda conn: {"urls": [record_to_dict(record) for record in search(conn, query, limit)]})
+
+    def stats(self, params, body):
+        def render(conn):
+            totals = fetch_totals(conn)
+            return {
+                "totals": totals._asdict(),
+                "categories": [stats._asdict() for stats in fetch_category_stats(conn)],
+            }
+        self.send_cacheable(render)
+
+    def export(self, params, body):
+        name = params.get("format", "json")
+        if name not in EXPORT_FORMATS:
+            raise APIError(HTTPStatus.BAD_REQUEST, f"format must be one of {', '.join(sorted(EXPORT_FORMATS))}")
+        content_type, writer = EXPORT_FORMATS[name]
+        self.send_stream(f"{content_type}; charset=utf-8", lambda conn, out: writer(URLRepository(conn).iter(), out),
+                         headers=[("Content-Disposition", f'attachment; filename="urls.{name}"')])
+
+    def add_url(self, params, body):
+        url = body.get("url")
+        description = body.get("description", "")
+        category = body.get("category", "")
+        if not isinstance(url, str) or not is_valid_url(url):
+            raise APIError(HTTPStatus.BAD_REQUEST, f"Invalid URL format: {url}")
+        if not isinstance(description, str) or not isinstance(category, str):
+            raise APIError(HTTPStatus.BAD_REQUEST, "description and category must be strings")
+        with self.server.manager.write() as conn:
+            repository = URLRepository(conn)
+            url_id = repository.add(url, description, category, commit=False)
+            if url_id is None:
+                raise APIError(HTTPStatus.CONFLICT, f"URL '{url}' already exists")
+            record = repository.get(url_id)
+        self.send_json(HTTPStatus.CREATED, record_to_dict(record), headers=[("Location", f"/urls/{url_id}")])
+
+    def update_url(self, params, body, url_id):
+        url_id = parse_id(url_id)
+        description = body.get("description")
+        status = body.get("status")
+        if description is not None and not isinstance(description, str):
+            raise APIError(HTTPStatus.BAD_REQUEST, "description must be a string")
+        if status is not None and not isinstance(status, bool):
+            raise APIError(HTTPStatus.BAD_REQUEST, "status must be true or false")
+        with self.server.manager.write() as conn:
+            repository = URLRepository(conn)
+            if not repository.update(url_id, description, status, commit=False):
+                raise APIError(HTTPStatus.NOT_FOUND, f"No URL with ID {url_id}")
+            record = repository.get(url_id)
+        self.send_json(HTTPStatus.OK, record_to_dict(record))
+
+    def delete_url(self, params, body, url_id):
+        url_id = parse_id(url_id)
+        with self.server.manager.write() as conn:
+            if not URLRepository(conn).delete(url_id, commit=False):
+                raise APIError(HTTPStatus.NOT_FOUND, f"No URL with ID {url_id}")
+        self.send_response(HTTPStatus.NO_CONTENT)
+        self.end_headers()
+
+
+# (method, path pattern, handler method); groups of the pattern are passed to the handler
+ROUTES = [
+    ("GET", re.compile(r"/urls/?"), "list_urls"),
+    ("POST", re.compile(r"/urls/?"), "add_url"),
+    ("GET", re.compile(r"/urls/(\d+)"), "get_url"),
+    ("PATCH", re.compile(r"/urls/(\d+)"), "update_url"),
+    ("DELETE", re.compile(r"/urls/(\d+)"), "delete_url"),
+    ("GET", re.compile(r"/search"), "search"),
+    ("GET", re.compile(r"/stats"), "stats"),
+    ("GET", re.compile(r"/export"), "export"),
+]
+
+
+class APIServer(ThreadingHTTPServer):
+    """HTTP server of the JSON API, one thread per client connection, sharing a ConnectionManager"""
+
+    daemon_threads = True
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+    def __init__(self, db_file, host=DEFAULT_HOST, port=DEFAULT_PORT, max_readers=MAX_READERS, verbose=False,
+                 request_timeout=REQUEST_TIMEOUT, reader_timeout=READER_TIMEOUT):
+        self.request_timeout = request_timeout
+        self.reader_timeout = reader_timeout
+        self.manager = ConnectionManager(db_file, max_readers)
+        with self.manager.write() as conn:
+            migrate(conn)
+        self.version = DatabaseVersion(self.manager)
+        self.cache = ResponseCache()
+        self.verbose = verbose
+        self.allowed_hosts = {header_host(host), *LOOPBACK_HOSTS}
+        try:
+            super().__init__((host, port), APIRequestHandler)
+        except OSError:
+            self.version.close()
+            self.manager.close()
+            raise
+
+    def server_close(self):
+        super().server_close()
+        self.version.close()
+        self.manager.close()
+
+
+def serve(db_file, host=DEFAULT_HOST, port=DEFAULT_PORT, max_readers=MAX_READERS, verbose=False):
+    """Run the API server until interrupted"""
+    server = APIServer(db_file, host, port, max_readers, verbose)
+    print(f"Serving {db_file} on http://{server.server_address[0]}:{server.server_address[1]}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,43 @@
+import sqlite3
+from collections import namedtuple
+
+CategoryStats = namedtuple("CategoryStats", ["category", "read", "unread", "total"])
+
+Totals = namedtuple("Totals", ["read", "unread", "total"])
+
+# url_stats holds one row per (category, status) pair, so these queries read a
+# handful of rows whatever the size of the urls table
+CATEGORY_STATS_SQL = '''
+    SELECT category,
+           SUM(CASE WHEN status THEN count ELSE 0 END),
+           SUM(CASE WHEN status THEN 0 ELSE count END)
+    FROM url_stats
+    GROUP BY category
+    ORDER BY category'''
+
+TOTALS_SQL = '''
+    SELECT IFNULL(SUM(CASE WHEN status THEN count ELSE 0 END), 0),
+           IFNULL(SUM(CASE WHEN status THEN 0 ELSE count END), 0)
+    FROM url_stats'''
+
+
+def fetch_category_stats(conn):
+    """Return the read, unread and total counts of each category. URLs without a category are counted under ''"""
+    try:
+        return [
+            CategoryStats(category, read, unread, read + unread)
+            for category, read, unread in conn.execute(CATEGORY_STATS_SQL)
+        ]
+    except sqlite3.Error as e:
+        print(f"Failed to fetch statistics: {e}")
+        return []
+
+
+def fetch_totals(conn):
+    """Return the read, unread and total counts over all URLs"""
+    try:
+        read, unread = conn.execute(TOTALS_SQL).fetchone()
+        return Totals(read, unread, read + unread)
+    except sqlite3.Error as e:
+        print(f"Failed to fetch statistics: {e}")
+        return Totals(0, 0, 0)
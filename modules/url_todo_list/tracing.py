@@ -0,0 +1,277 @@
+import bisect
+import re
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from functools import lru_cache
+from modules.url_todo_list.connection import Connection
+
+# Upper bounds of the latency histogram buckets, in seconds (Prometheus defaults, plus finer ones)
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_PREFIX = "url_todo_list_query"
+
+# One summary line of the menu and of QueryTracer.summary()
+QueryStats = namedtuple("QueryStats", ["query", "calls", "errors", "rows", "total_seconds", "mean_seconds",
+                                       "p50_seconds", "p95_seconds", "max_seconds"])
+
+WHITESPACE_RE = re.compile(r"\s+")
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """Reduce a statement to its shape: literals become ? and lists of placeholders (...)"""
+    sql = WHITESPACE_RE.sub(" ", sql).strip().rstrip(";")
+    sql = STRING_RE.sub("?", sql)
+    sql = NUMBER_RE.sub("?", sql)
+    return LIST_RE.sub("(...)", sql)
+
+
+class StatementStats:
+    """Call count, error count, row count and latency histogram of one normalized statement"""
+
+    __slots__ = ("calls", "errors", "rows", "total_seconds", "max_seconds", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        # One counter per bucket of BUCKETS plus the +Inf bucket, not cumulative
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds, rows):
+        """Add one execution"""
+        self.calls += 1
+        self.rows += rows
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def quantile(self, q):
+        """Estimate a latency quantile as the upper bound of the bucket holding it"""
+        if not self.calls:
+            return 0.0
+        rank = q * self.calls
+        seen = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+
+class QueryTracer:
+    """
+    Collects per-statement latency histograms, row counts and call counts.
+
+    Statements are keyed by their normalized SQL, so the same query with different
+    literals or IN list lengths is counted once. The latency of a query covers
+    its execution and the fetching of its rows: it is recorded when the cursor is
+    exhausted, runs another statement, is closed or is garbage collected.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql, seconds, rows):
+        """Add one execution of a statement"""
+        key = normalize_sql(sql)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StatementStats()
+            stats.observe(seconds, rows)
+
+    def record_error(self, sql):
+        """Count a statement that raised"""
+        key = normalize_sql(sql)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StatementStats()
+            stats.errors += 1
+
+    def reset(self):
+        """Forget every recorded statement"""
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self):
+        """Return a QueryStats per statement, the most time consuming first"""
+        with self._lock:
+            items = list(self._stats.items())
+        summary = []
+        for query, stats in items:
+            mean = stats.total_seconds / stats.calls if stats.calls else 0.0
+            summary.append(QueryStats(query, stats.calls, stats.errors, stats.rows, stats.total_seconds, mean,
+                                      stats.quantile(0.5), stats.quantile(0.95), stats.max_seconds))
+        summary.sort(key=lambda row: row.total_seconds, reverse=True)
+        return summary
+
+    def to_prometheus(self):
+        """Render the statistics in the Prometheus text exposition format"""
+        with self._lock:
+            items = sorted((query, list(stats.buckets), stats.calls, stats.errors, stats.rows, stats.total_seconds)
+                           for query, stats in self._stats.items())
+
+        duration = f"{METRIC_PREFIX}_duration_seconds"
+        lines = [
+            f"# HELP {duration} Latency of url_todo_list SQL statements, execution and fetching.",
+            f"# TYPE {duration} histogram",
+        ]
+        for query, buckets, calls, _, _, total in items:
+            label = escape_label(query)
+            cumulative = 0
+            for bound, count in zip(BUCKETS, buckets):
+                cumulative += count
+                lines.append(f'{duration}_bucket{{query="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{duration}_bucket{{query="{label}",le="+Inf"}} {calls}')
+            lines.append(f'{duration}_sum{{query="{label}"}} {total}')
+            lines.append(f'{duration}_count{{query="{label}"}} {calls}')
+
+        for name, help_text, index in (
+            ("rows_total", "Rows returned or changed by url_todo_list SQL statements.", 4),
+            ("errors_total", "url_todo_list SQL statements that raised an error.", 3),
+        ):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for item in items:
+                lines.append(f'{metric}{{query="{escape_label(item[0])}"}} {item[index]}')
+        return "\n".join(lines) + "\n"
+
+    def dump_prometheus(self, path):
+        """Write the statistics to a file in the Prometheus text format. Returns True on success"""
+        try:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(self.to_prometheus())
+        except OSError as e:
+            print(f"Error writing query statistics to {path}: {e}")
+            return False
+        return True
+
+
+# Cursor class used by Connection.cursor() while a tracer is active, set below
+QueryTracer.cursor_factory = None
+
+
+def escape_label(value):
+    """Escape a Prometheus label value"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class TracingCursor(sqlite3.Cursor):
+    """Cursor reporting the latency and row count of each statement to the connection's tracer"""
+
+    _tracer = None
+    _sql = None
+    _seconds = 0.0
+    _rows = 0
+
+    def _finish(self):
+        if self._sql is not None:
+            sql, self._sql = self._sql, None
+            self._tracer.record(sql, self._seconds, self._rows)
+
+    def _start(self, sql, seconds):
+        self._tracer = self.connection.tracer or self._tracer
+        if self.description is None:
+            # Nothing to fetch: the statement is complete
+            self._tracer.record(sql, seconds, max(self.rowcount, 0))
+        else:
+            self._sql = sql
+            self._seconds = seconds
+            self._rows = 0
+
+    def _fetched(self, seconds, rows, exhausted):
+        if self._sql is None:
+            return
+        self._seconds += seconds
+        self._rows += rows
+        if exhausted:
+            self._finish()
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except sqlite3.Error:
+            (self.connection.tracer or self._tracer).record_error(sql)
+            raise
+        self._start(sql, time.perf_counter() - start)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        except sqlite3.Error:
+            (self.connection.tracer or self._tracer).record_error(sql)
+            raise
+        self._start(sql, time.perf_counter() - start)
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(time.perf_counter() - start, len(rows), not rows)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - start, len(rows), True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(time.perf_counter() - start, 0, True)
+            raise
+        self._fetched(time.perf_counter() - start, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        if self._sql is not None:
+            self._finish()
+
+
+QueryTracer.cursor_factory = TracingCursor
+
+
+def enable_tracing(tracer=None):
+    """Trace every url_todo_list connection, open or future. Returns the tracer in use"""
+    Connection.tracer = tracer or Connection.tracer or QueryTracer()
+    return Connection.tracer
+
+
+def disable_tracing():
+    """Stop tracing connections"""
+    Connection.tracer = None
+
+
+def get_tracer():
+    """Return the active tracer, or None when tracing is off"""
+    return Connection.tracer
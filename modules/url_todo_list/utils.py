@@ -1,71 +1,113 @@
 import sqlite3
+import sys
 import csv
+import gzip
 import json
 import re
 import xml.etree.ElementTree as ET
+from modules.url_todo_list.repository import URLRepository
+
+URL_REGEX = re.compile(
+    r'^(https?://)?'  # http:// or https://
+    r'([a-zA-Z0-9-]{1,63}\.)+'  # domain...
+    r'[a-zA-Z]{2,6}'  # top-level domain
+    r'(:\d+)?'  # optional port
+    r'(/.*)?$', re.IGNORECASE)  # optional path
 
 def is_valid_url(url):
     """Check if a string is a valid URL"""
-    regex = re.compile(
-        r'^(https?://)?'  # http:// or https://
-        r'([a-zA-Z0-9-]{1,63}\.)+'  # domain...
-        r'[a-zA-Z]{2,6}'  # top-level domain
-        r'(:\d+)?'  # optional port
-        r'(/.*)?$', re.IGNORECASE)  # optional path
-    return re.match(regex, url) is not None
+    return URL_REGEX.match(url) is not None
+
+def validate_urls(urls):
+    """Check a batch of strings at once, returning a list of booleans. Values that are not strings are invalid"""
+    match = URL_REGEX.match
+    return [isinstance(url, str) and bool(url) and match(url) is not None for url in urls]
+
+def is_gzip_filename(filename):
+    """Check if a filename designates a gzip-compressed file"""
+    return str(filename).lower().endswith(".gz")
+
+def open_file(filename, mode, compress=None, **kwargs):
+    """Open a file for export or import, through gzip if compress is set or the name ends with .gz"""
+    if compress is None:
+        compress = is_gzip_filename(filename)
+    if compress:
+        if "b" not in mode:
+            mode = mode if "t" in mode else mode + "t"
+        return gzip.open(filename, mode, **kwargs)
+    return open(filename, mode, **kwargs)
+
+def write_csv(urls, file):
+    """Write URLs as CSV to a text file object"""
+    writer = csv.writer(file)
+    writer.writerow(["ID", "URL", "Description", "Category", "Status"])
+    writer.writerows(url[:5] for url in urls)
 
-def export_to_csv(urls, filename):
-    """Export URLs to a CSV file"""
-    with open(filename, mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(["ID", "URL", "Description", "Category", "Status"])
+def export_to_csv(urls, filename, compress=None):
+    """Export URLs to a CSV file, writing rows as they are read"""
+    with open_file(filename, 'w', compress, newline='', encoding='utf-8') as file:
+        write_csv(urls, file)
+
+def url_record(url):
+    """Convert a URL row to the dictionary written by the JSON exporter"""
+    return {
+        "ID": url[0],
+        "URL": url[1],
+        "Description": url[2],
+        "Category": url[3],
+        "Status": url[4]
+    }
+
+def write_json(urls, write, ndjson=False):
+    """Write URLs as a JSON array, or as NDJSON with one object per line, through a write function"""
+    if ndjson:
         for url in urls:
-            writer.writerow(url)
+            write(json.dumps(url_record(url)))
+            write("\n")
+        return
 
-def export_to_json(urls, filename):
-    """Export URLs to a JSON file"""
-    with open(filename, 'w') as file:
-        json.dump([{
-            "ID": url[0],
-            "URL": url[1],
-            "Description": url[2],
-            "Category": url[3],
-            "Status": url[4]
-        } for url in urls], file, indent=4)
+    # Same layout as json.dump(..., indent=4) on the whole list
+    separator = "[\n"
+    for url in urls:
+        write(separator)
+        write("    " + json.dumps(url_record(url), indent=4).replace("\n", "\n    "))
+        separator = ",\n"
+    write("[]" if separator == "[\n" else "\n]")
 
-def export_to_xml(urls, filename):
-    """Export URLs to an XML file"""
-    root = ET.Element("urls")
+def export_to_json(urls, filename, ndjson=False, compress=None):
+    """Export URLs to a JSON array, or to NDJSON with one object per line, writing rows as they are read"""
+    with open_file(filename, 'w', compress, encoding='utf-8') as file:
+        write_json(urls, file.write, ndjson)
+
+def write_xml(urls, write):
+    """Write URLs as an XML document through a write function, one element at a time"""
+    write("<?xml version='1.0' encoding='utf-8'?>\n<urls>")
     for url in urls:
-        url_element = ET.SubElement(root, "url")
+        url_element = ET.Element("url")
         ET.SubElement(url_element, "ID").text = str(url[0])
         ET.SubElement(url_element, "URL").text = url[1]
         ET.SubElement(url_element, "Description").text = url[2]
         ET.SubElement(url_element, "Category").text = url[3]
         ET.SubElement(url_element, "Status").text = str(url[4])
+        write(ET.tostring(url_element, encoding="unicode"))
+    write("</urls>")
 
-    tree = ET.ElementTree(root)
-    tree.write(filename, encoding='utf-8', xml_declaration=True)
+def export_to_xml(urls, filename, compress=None):
+    """Export URLs to an XML file, writing one element at a time"""
+    with open_file(filename, 'w', compress, encoding='utf-8') as file:
+        write_xml(urls, file.write)
 
 def add_url(conn, url, description, category):
     """Add a new URL to the table"""
-    if url_exists(conn, url):
-        print(f"Warning: URL '{url}' already exists.")
-        return None
-    sql = ''' INSERT INTO urls(url, description, category, status)
-              VALUES(?,?,?,?) '''
     try:
-        cur = conn.cursor()
-        cur.execute(sql, (url, description, category, False))
-        conn.commit()
-        return cur.lastrowid
+        url_id = URLRepository(conn).add(url, description, category)
+        if url_id is None:
+            sys.stderr.write(f"Warning: URL '{url}' already exists.\n")
+        return url_id
     except sqlite3.Error as e:
         print(f"Failed to add URL: {e}")
         return None
 
 def url_exists(conn, url):
-    """Check if a URL already exists in the table"""
-    sql = ''' SELECT 1 FROM urls WHERE url=? '''
-    cur = conn.cursor()
-    cur.execute(sql, (url,))
-    return cur.fetchone() is not None
+    """Check if a URL, or another form of the same canonical URL, already exists in the table"""
+    return URLRepository(conn).exists(url)
@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from core.accounting import ResourceAccounting, ResourceMonitor, ResourceUsage
+from core.isolation import ProcessRunner
+from core.manager import ModuleManager
+
+# Entry points run in the worker processes by the tests below
+
+def spin(seconds):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+def hold_memory(size, seconds):
+    data = bytearray(size)
+    time.sleep(seconds)
+    return len(data)
+
+
+def usage(module_name, **fields):
+    values = dict(started=0.0, wall_seconds=1.0, cpu_seconds=0.5, rss_peak=100, rss_delta=10,
+                  open_fds=5, fds_delta=1, threads=2, isolated=False, ok=True)
+    values.update(fields)
+    return ResourceUsage(module_name, **values)
+
+
+class TestResourceMonitor(unittest.TestCase):
+
+    def test_measures_current_process(self):
+        monitor = ResourceMonitor(interval=0.01).start()
+        spin(0.2)
+        data = bytearray(64 * 1024 ** 2)
+        for i in range(0, len(data), 4096):
+            data[i] = 1
+        time.sleep(0.05)
+        result = monitor.stop("current")
+        self.assertEqual(result.module_name, "current")
+        self.assertGreaterEqual(result.wall_seconds, 0.2)
+        self.assertGreater(result.cpu_seconds, 0.1)
+        self.assertGreater(result.rss_delta, 32 * 1024 ** 2)
+        self.assertGreaterEqual(result.rss_peak, result.rss_delta)
+        self.assertGreater(result.open_fds, 0)
+        self.assertGreaterEqual(result.threads, 2)
+        del data
+
+    def test_counts_threads_and_fds(self):
+        stop = threading.Event()
+        monitor = ResourceMonitor(interval=0.01).start()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        with tempfile.TemporaryFile() as file:
+            time.sleep(0.05)
+            result = monitor.stop("threads")
+        stop.set()
+        thread.join()
+        self.assertEqual(result.fds_delta, 1)
+        self.assertGreaterEqual(result.threads, 3)
+
+    def test_worker_process(self):
+        runner = ProcessRunner(max_workers=1, accounting=ResourceAccounting(interval=0.01))
+        try:
+            run = runner.submit(__name__, "hold_memory", (64 * 1024 ** 2, 0.3))
+            run.result()
+        finally:
+            runner.shutdown()
+        self.assertTrue(run.usage.isolated)
+        self.assertTrue(run.usage.ok)
+        self.assertGreater(run.usage.rss_peak, 64 * 1024 ** 2)
+
+
+class TestResourceAccounting(unittest.TestCase):
+
+    def test_history_is_bounded(self):
+        accounting = ResourceAccounting(history_size=3)
+        for i in range(5):
+            accounting.record(usage("a", started=float(i)))
+        accounting.record(usage("b"))
+        self.assertEqual([run.started for run in accounting.history("a")], [2.0, 3.0, 4.0])
+        self.assertEqual(len(accounting.history()), 4)
+        self.assertEqual(accounting.history("missing"), [])
+
+    def test_summary(self):
+        accounting = ResourceAccounting()
+        accounting.record(usage("a", rss_peak=100, rss_delta=10, threads=2))
+        accounting.record(usage("a", rss_peak=300, rss_delta=20, threads=4, ok=False))
+        summary = accounting.summary()["a"]
+        self.assertEqual(summary["runs"], 2)
+        self.assertEqual(summary["failures"], 1)
+        self.assertEqual(summary["wall_seconds"], 2.0)
+        self.assertEqual(summary["cpu_seconds"], 1.0)
+        self.assertEqual(summary["rss_peak"], 300)
+        self.assertEqual(summary["rss_delta"], 30)
+        self.assertEqual(summary["fds_delta"], 2)
+        self.assertEqual(summary["threads"], 4)
+
+    def test_measure_records_failures(self):
+        accounting = ResourceAccounting()
+        with self.assertRaises(RuntimeError):
+            with accounting.measure("broken"):
+                raise RuntimeError("boom")
+        self.assertFalse(accounting.history("broken")[0].ok)
+
+    def test_dump(self):
+        accounting = ResourceAccounting()
+        accounting.record(usage("a"))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "usage.json")
+            self.assertTrue(accounting.dump(path))
+            with open(path) as file:
+                data = json.load(file)
+        self.assertEqual(data["summary"]["a"]["runs"], 1)
+        self.assertEqual(data["history"][0]["module_name"], "a")
+
+    def test_dump_error(self):
+        accounting = ResourceAccounting()
+        self.assertFalse(accounting.dump(os.path.join("missing", "dir", "usage.json")))
+
+
+class TestManagerAccounting(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = ModuleManager()
+        self.manager.register_module("test_module")
+
+    def tearDown(self):
+        self.manager.shutdown(cancel=True)
+
+    def test_in_process_run_is_recorded(self):
+        self.manager.run_module("test_module")
+        history = self.manager.accounting.history("test_module")
+        self.assertEqual(len(history), 1)
+        self.assertFalse(history[0].isolated)
+
+    def test_isolated_run_is_recorded(self):
+        run = self.manager.submit_module("test_module")
+        run.result(30)
+        deadline = time.monotonic() + 5
+        while not self.manager.accounting.history("test_module") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        history = self.manager.accounting.history("test_module")
+        self.assertEqual(len(history), 1)
+        self.assertTrue(history[0].isolated)
+        self.assertTrue(history[0].ok)
+
+
+if __name__ == '__main__':
+    unittest.main()
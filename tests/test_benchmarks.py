@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from benchmarks.run import compare, measure, generate_database, save_baseline, load_baseline
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_compare_flags_regressions_above_threshold(self):
+        baseline = {
+            "fast": {"seconds": 1.0, "peak_bytes": 1000},
+            "slow": {"seconds": 1.0, "peak_bytes": 1000},
+            "startup": {"seconds": 1.0, "peak_bytes": None},
+        }
+        results = {
+            "fast": {"seconds": 1.1, "peak_bytes": 900},
+            "slow": {"seconds": 1.5, "peak_bytes": 2000},
+            "startup": {"seconds": 1.0, "peak_bytes": None},
+            "new": {"seconds": 9.0, "peak_bytes": 9000},
+        }
+        self.assertEqual(compare(results, baseline, threshold=0.2), [
+            ("slow", "seconds", 1.0, 1.5),
+            ("slow", "peak_bytes", 1000, 2000),
+        ])
+
+    def test_measure_reports_time_and_peak_memory(self):
+        calls = []
+        seconds, peak = measure(lambda: bytearray(1024 * 1024), lambda: calls.append(1), repeat=2)
+        self.assertGreaterEqual(seconds, 0)
+        self.assertGreaterEqual(peak, 1024 * 1024)
+        # Once per timed run and once for the memory run
+        self.assertEqual(len(calls), 3)
+
+    def test_generated_database_and_baseline_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            conn = generate_database(os.path.join(directory, "bench.db"), 250)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0], 250)
+            conn.close()
+
+            path = os.path.join(directory, "baseline.json")
+            self.assertIsNone(load_baseline(path))
+            results = {"fast": {"seconds": 0.5, "peak_bytes": 10}}
+            save_baseline(path, results)
+            self.assertEqual(load_baseline(path), results)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import types
+import unittest
+from unittest.mock import patch
+from core.discovery import ModuleIndex, ModuleInfo
+from core.manager import ModuleManager
+
+class TestModuleIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.modules_path = tempfile.mkdtemp()
+        self.write_module("alpha_module", 'name = "Alpha"\nversion = "1.0.0"\n\ndef main():\n    pass\n')
+        self.write_module("beta_module", 'name = "Beta"\nversion = "2.0.0"\n')
+        self.index = ModuleIndex(self.modules_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.modules_path)
+
+    def write_module(self, module_name, source):
+        module_path = os.path.join(self.modules_path, module_name)
+        os.makedirs(module_path, exist_ok=True)
+        with open(os.path.join(module_path, "__init__.py"), "w") as file:
+            file.write(source)
+
+    def test_scan_reads_identity(self):
+        modules = self.index.scan()
+        self.assertEqual(list(modules), ["alpha_module", "beta_module"])
+        self.assertEqual(modules["alpha_module"], ModuleInfo("alpha_module", "Alpha", "1.0.0", "main"))
+        self.assertIsNone(modules["beta_module"].entry_point)
+        self.assertTrue(os.path.exists(self.index.index_path))
+
+    def test_scan_uses_cache_for_unchanged_modules(self):
+        self.index.scan()
+        with patch('core.discovery.inspect_module') as mock_inspect:
+            modules = self.index.scan()
+            mock_inspect.assert_not_called()
+        self.assertEqual(modules["beta_module"].version, "2.0.0")
+
+    def test_scan_reinspects_changed_modules(self):
+        self.index.scan()
+        self.write_module("beta_module", 'name = "Beta"\nversion = "2.10.0"\n')
+        modules = self.index.scan()
+        self.assertEqual(modules["beta_module"].version, "2.10.0")
+
+    def test_scan_reads_dependencies(self):
+        self.write_module("gamma_module", 'name = "Gamma"\nversion = "1.0.0"\ndependencies = ["alpha_module"]\n')
+        modules = self.index.scan()
+        self.assertEqual(modules["gamma_module"].dependencies, ("alpha_module",))
+        self.assertEqual(self.index.scan()["gamma_module"].dependencies, ("alpha_module",))
+
+    def test_scan_skips_module_with_invalid_dependencies(self):
+        self.write_module("broken_module", 'name = "Broken"\nversion = "1.0.0"\ndependencies = 5\n')
+        with patch('builtins.print'):
+            modules = self.index.scan()
+        self.assertEqual(list(modules), ["alpha_module", "beta_module"])
+
+    def test_scan_skips_module_missing_identity(self):
+        self.write_module("broken_module", 'name = "Broken"\n')
+        modules = self.index.scan()
+        self.assertNotIn("broken_module", modules)
+
+    def test_discover_modules_registers_without_import(self):
+        manager = ModuleManager()
+        with patch('importlib.import_module') as mock_import_module:
+            manager.discover_modules(self.modules_path)
+            self.assertEqual(manager.modules["alpha_module"].name, "Alpha")
+            mock_import_module.assert_not_called()
+
+    def test_load_modules_reads_dependencies_of_listed_modules(self):
+        self.write_module("gamma_module", 'name = "Gamma"\nversion = "1.0.0"\ndependencies = ["alpha_module"]\n')
+        manager = ModuleManager()
+        order = []
+        def import_module(module_path):
+            order.append(module_path)
+            return types.SimpleNamespace(name=module_path, version="1.0.0")
+        with patch('builtins.print'), patch('core.manager.MODULES_PATH', self.modules_path), \
+                patch('importlib.import_module', side_effect=import_module):
+            failures = manager.load_modules(["gamma_module"])
+        self.assertEqual(failures, {})
+        self.assertEqual(order, ["modules.alpha_module", "modules.gamma_module"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import time
+import unittest
+from core.isolation import (
+    ProcessRunner, ModuleTimeoutError, ModuleCancelledError, ModuleProcessError, resource,
+)
+from core.manager import ModuleManager
+
+# Entry points run in the worker processes by the tests below
+
+def return_value(value):
+    return value
+
+def return_pid():
+    return os.getpid()
+
+def raise_error():
+    raise ValueError("broken module")
+
+def exit_with(code):
+    raise SystemExit(code)
+
+def crash():
+    os._exit(3)
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+def allocate(size):
+    return len(bytearray(size))
+
+
+class TestProcessRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.runner = ProcessRunner(max_workers=4)
+
+    def tearDown(self):
+        self.runner.shutdown(cancel=True)
+
+    def test_returns_result(self):
+        self.assertEqual(self.runner.run(__name__, "return_value", ({"a": [1, 2]},)), {"a": [1, 2]})
+
+    def test_runs_in_another_process(self):
+        self.assertNotEqual(self.runner.run(__name__, "return_pid"), os.getpid())
+
+    def test_exception_is_reported(self):
+        with self.assertRaises(ModuleProcessError) as context:
+            self.runner.run(__name__, "raise_error")
+        self.assertIn("ValueError: broken module", str(context.exception))
+        self.assertIn("raise_error", context.exception.details)
+
+    def test_system_exit(self):
+        self.assertIsNone(self.runner.run(__name__, "exit_with", (0,)))
+        with self.assertRaises(ModuleProcessError):
+            self.runner.run(__name__, "exit_with", (2,))
+
+    def test_worker_crash(self):
+        with self.assertRaises(ModuleProcessError) as context:
+            self.runner.run(__name__, "crash")
+        self.assertEqual(context.exception.exitcode, 3)
+
+    def test_missing_module(self):
+        with self.assertRaises(ModuleProcessError) as context:
+            self.runner.run("modules.does_not_exist")
+        self.assertIn("ModuleNotFoundError", str(context.exception))
+
+    def test_timeout_terminates_worker(self):
+        run = self.runner.submit(__name__, "sleep", (30,), timeout=0.5)
+        start = time.monotonic()
+        with self.assertRaises(ModuleTimeoutError):
+            run.result()
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertFalse(run.process.is_alive())
+
+    def test_cancel_running(self):
+        run = self.runner.submit(__name__, "sleep", (30,))
+        while run.process is None:
+            time.sleep(0.01)
+        self.assertTrue(run.cancel())
+        with self.assertRaises(ModuleCancelledError):
+            run.result(10)
+        run.process.join(10)
+        self.assertFalse(run.process.is_alive())
+
+    def test_cancel_finished(self):
+        run = self.runner.submit(__name__, "return_value", (1,))
+        self.assertEqual(run.result(), 1)
+        self.assertFalse(run.cancel())
+
+    @unittest.skipIf(resource is None, "memory limits need the resource module")
+    def test_memory_limit(self):
+        with self.assertRaises(ModuleProcessError) as context:
+            self.runner.run(__name__, "allocate", (1024 ** 3,), memory_limit=512 * 1024 ** 2)
+        self.assertIn("MemoryError", str(context.exception))
+        self.assertEqual(self.runner.run(__name__, "allocate", (1024,), memory_limit=512 * 1024 ** 2), 1024)
+
+    def test_runs_in_parallel(self):
+        start = time.monotonic()
+        runs = [self.runner.submit(__name__, "sleep", (1,)) for _ in range(4)]
+        self.assertEqual([run.result() for run in runs], [1, 1, 1, 1])
+        self.assertLess(time.monotonic() - start, 3.5)
+
+    def test_shutdown_cancels_pending_runs(self):
+        runner = ProcessRunner(max_workers=1)
+        runs = [runner.submit(__name__, "sleep", (30,)) for _ in range(3)]
+        runner.shutdown(cancel=True)
+        for run in runs:
+            with self.assertRaises(ModuleCancelledError):
+                run.result()
+
+
+class TestManagerIsolation(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = ModuleManager()
+        self.manager.register_module("test_module")
+
+    def tearDown(self):
+        self.manager.shutdown(cancel=True)
+
+    def test_run_module_isolated(self):
+        self.assertIsNone(self.manager.run_module("test_module", isolated=True, timeout=30))
+        # The module was only imported in the worker
+        self.assertFalse(self.manager.modules["test_module"].is_loaded)
+
+    def test_submit_module(self):
+        run = self.manager.submit_module("test_module")
+        self.assertIsNone(run.result(30))
+        self.assertEqual(run.function_name, "main")
+
+    def test_unknown_module(self):
+        with self.assertRaises(KeyError):
+            self.manager.submit_module("not_registered")
+
+    def test_shutdown(self):
+        self.manager.run_module("test_module", isolated=True)
+        runner = self.manager.runner
+        self.manager.shutdown()
+        self.assertIsNone(self.manager.runner)
+        with self.assertRaises(RuntimeError):
+            runner.submit("modules.test_module")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+import sys
+import types
 import unittest
 from unittest.mock import patch, MagicMock
-from core.manager import ModuleManager
+from core.manager import ModuleManager, LazyModule
+from core.discovery import ModuleInfo
 
 class TestModuleManager(unittest.TestCase):
 
@@ -50,5 +53,132 @@ class TestModuleManager(unittest.TestCase):
         modules = self.manager.get_modules()
         self.assertIn("mock_module", modules)
 
+    @patch('importlib.import_module')
+    def test_register_module_is_lazy(self, mock_import_module):
+        self.manager.register_module("mock_module")
+        self.assertIn("mock_module", self.manager.get_modules())
+        self.assertIsInstance(self.manager.modules["mock_module"], LazyModule)
+        mock_import_module.assert_not_called()
+
+    @patch('importlib.import_module')
+    def test_get_module_imports_on_first_use(self, mock_import_module):
+        mock_module = MagicMock()
+        mock_module.name = "Mock Module"
+        mock_module.version = "1.0.0"
+        mock_import_module.return_value = mock_module
+        self.manager.register_module("mock_module")
+        module = self.manager.get_module("mock_module")
+        self.assertIs(module, mock_module)
+        self.assertIs(self.manager.modules["mock_module"], mock_module)
+        self.manager.get_module("mock_module")
+        mock_import_module.assert_called_once_with("modules.mock_module")
+
+    @patch('importlib.import_module')
+    def test_lazy_module_attribute_access_imports(self, mock_import_module):
+        mock_module = MagicMock()
+        mock_module.name = "Mock Module"
+        mock_module.version = "1.0.0"
+        mock_import_module.return_value = mock_module
+        proxy = LazyModule("mock_module")
+        self.assertFalse(proxy.is_loaded)
+        self.assertEqual(proxy.version, "1.0.0")
+        self.assertTrue(proxy.is_loaded)
+
+    def test_get_lazy_non_existent_module(self):
+        self.manager.register_module("non_existent_module")
+        with self.assertRaises(ImportError) as context:
+            self.manager.get_module("non_existent_module")
+        self.assertTrue("Failed to load module non_existent_module" in str(context.exception))
+
+    def make_module(self, module_path):
+        mock_module = MagicMock()
+        mock_module.name = module_path
+        mock_module.version = "1.0.0"
+        return mock_module
+
+    @patch('importlib.import_module')
+    def test_load_modules_respects_dependencies(self, mock_import_module):
+        order = []
+        def import_module(module_path):
+            order.append(module_path)
+            return self.make_module(module_path)
+        mock_import_module.side_effect = import_module
+        self.manager.module_info = {
+            "app": ModuleInfo("app", "App", "1.0.0", "main", ("storage", "network")),
+            "storage": ModuleInfo("storage", "Storage", "1.0.0", None, ("base",)),
+            "network": ModuleInfo("network", "Network", "1.0.0", None, ()),
+        }
+        failures = self.manager.load_modules(["app"], max_workers=4)
+        self.assertEqual(failures, {})
+        self.assertEqual(set(self.manager.get_modules()), {"app", "storage", "network", "base"})
+        self.assertLess(order.index("modules.base"), order.index("modules.storage"))
+        self.assertEqual(order[-1], "modules.app")
+
+    @patch('importlib.import_module')
+    def test_load_modules_reports_failures_without_aborting(self, mock_import_module):
+        def import_module(module_path):
+            if module_path == "modules.broken":
+                raise ImportError("boom")
+            return self.make_module(module_path)
+        mock_import_module.side_effect = import_module
+        self.manager.module_info = {
+            "dependent": ModuleInfo("dependent", "Dependent", "1.0.0", None, ("broken",)),
+        }
+        failures = self.manager.load_modules(["broken", "dependent", "healthy"])
+        self.assertEqual(set(failures), {"broken", "dependent"})
+        self.assertIn("dependency 'broken'", str(failures["dependent"]))
+        self.assertIn("healthy", self.manager.modules)
+
+    @patch('importlib.import_module')
+    def test_load_modules_detects_cycles(self, mock_import_module):
+        mock_import_module.side_effect = self.make_module
+        self.manager.module_info = {
+            "first": ModuleInfo("first", "First", "1.0.0", None, ("second",)),
+            "second": ModuleInfo("second", "Second", "1.0.0", None, ("first",)),
+        }
+        failures = self.manager.load_modules(["first"])
+        self.assertEqual(set(failures), {"first", "second"})
+        mock_import_module.assert_not_called()
+
+    @patch('importlib.import_module')
+    def test_reload_module_swaps_new_version(self, mock_import_module):
+        old_module = self.make_module("old")
+        old_submodule = types.ModuleType("modules.mock_module.utils")
+        new_module = self.make_module("new")
+        mock_import_module.return_value = new_module
+        self.manager.modules["mock_module"] = old_module
+        with patch.dict(sys.modules, {"modules.mock_module": old_module, "modules.mock_module.utils": old_submodule}):
+            self.manager.reload_module("mock_module")
+            self.assertNotIn("modules.mock_module.utils", sys.modules)
+        self.assertIs(self.manager.modules["mock_module"], new_module)
+
+    @patch('importlib.import_module')
+    def test_reload_module_keeps_previous_version_on_failure(self, mock_import_module):
+        old_module = self.make_module("old")
+        mock_import_module.side_effect = SyntaxError("invalid syntax")
+        self.manager.modules["mock_module"] = old_module
+        with patch.dict(sys.modules, {"modules.mock_module": old_module}):
+            with self.assertRaises(ImportError):
+                self.manager.reload_module("mock_module")
+            self.assertIs(sys.modules["modules.mock_module"], old_module)
+        self.assertIs(self.manager.modules["mock_module"], old_module)
+
+    @patch('importlib.import_module')
+    def test_unload_module_removes_from_sys_modules(self, mock_import_module):
+        mock_module = self.make_module("mock")
+        mock_import_module.return_value = mock_module
+        self.manager.load_module("mock_module")
+        with patch.dict(sys.modules, {"modules.mock_module": mock_module}):
+            self.manager.unload_module("mock_module")
+            self.assertNotIn("modules.mock_module", sys.modules)
+
+    def test_reload_changed_modules(self):
+        self.manager.modules = {"loaded": self.make_module("loaded"), "lazy": LazyModule("lazy")}
+        self.manager.watcher = MagicMock()
+        self.manager.watcher.poll.return_value = ["loaded", "lazy"]
+        with patch.object(self.manager, 'reload_module') as mock_reload:
+            self.assertEqual(self.manager.reload_changed_modules(), ["loaded"])
+            mock_reload.assert_called_once_with("loaded")
+
 if __name__ == '__main__':
     unittest.main()
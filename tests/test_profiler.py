@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+from unittest.mock import patch, MagicMock
+from core.manager import ModuleManager
+from core.profiler import StartupProfiler
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def tearDown(self):
+        tracemalloc.stop()
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = StartupProfiler()
+        with profiler.phase("phase"):
+            pass
+        self.assertEqual(profiler.records, [])
+        self.assertIsNone(profiler.finish())
+
+    def test_from_environment(self):
+        argv = ["main.py", "--profile", "--profile-json", "profile.json"]
+        profiler = StartupProfiler.from_environment(argv, {})
+        self.assertTrue(profiler.enabled)
+        self.assertEqual(profiler.json_path, "profile.json")
+        self.assertEqual(argv, ["main.py"])
+        self.assertTrue(StartupProfiler.from_environment([], {"EXPANDCORE_PROFILE": "1"}).enabled)
+        self.assertFalse(StartupProfiler.from_environment([], {"EXPANDCORE_PROFILE": "0"}).enabled)
+
+    def test_report_is_sorted_and_written_as_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "profile.json")
+            profiler = StartupProfiler(enabled=True, json_path=json_path)
+            with profiler.phase("fast"):
+                pass
+            with profiler.phase("slow"):
+                data = [0] * 100000
+            with patch('builtins.print'):
+                report = profiler.finish()
+            self.assertEqual([record["phase"] for record in report["phases"]], ["slow", "fast"])
+            self.assertGreater(report["phases"][0]["memory_delta"], 0)
+            with open(json_path) as file:
+                self.assertEqual(json.load(file)["phases"], report["phases"])
+
+    def test_finish_stops_tracing_it_started(self):
+        tracemalloc.stop()
+        profiler = StartupProfiler(enabled=True)
+        self.assertTrue(tracemalloc.is_tracing())
+        with patch('builtins.print'):
+            profiler.finish()
+        self.assertFalse(tracemalloc.is_tracing())
+        with profiler.phase("after startup"):
+            pass
+        self.assertEqual(profiler.records, [])
+
+    def test_finish_keeps_tracing_started_elsewhere(self):
+        tracemalloc.start()
+        profiler = StartupProfiler(enabled=True)
+        with patch('builtins.print'):
+            profiler.finish()
+        self.assertTrue(tracemalloc.is_tracing())
+
+    @patch('importlib.import_module')
+    def test_manager_records_module_imports(self, mock_import_module):
+        mock_module = MagicMock()
+        mock_module.name = "Mock Module"
+        mock_module.version = "1.0.0"
+        mock_import_module.return_value = mock_module
+        profiler = StartupProfiler(enabled=True)
+        manager = ModuleManager(profiler)
+        manager.load_module("mock_module")
+        self.assertEqual(profiler.records[0]["phase"], "import modules.mock_module")
+
+if __name__ == '__main__':
+    unittest.main()
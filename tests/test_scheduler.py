@@ -0,0 +1,243 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from core.manager import ModuleManager
+from core.notifications import Notifier
+from core.scheduler import Scheduler, ModuleScheduler
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = Scheduler(max_workers=2)
+        self.scheduler.start()
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_one_shot_job(self):
+        done = threading.Event()
+        job = self.scheduler.schedule(done.set, delay=0.05)
+        self.assertTrue(done.wait(5))
+        self.assertTrue(wait_for(lambda: job.runs == 1))
+        self.assertEqual(self.scheduler.jobs(), [])
+
+    def test_jobs_run_in_time_order(self):
+        order = []
+        self.scheduler.schedule(order.append, delay=0.2, args=("late",))
+        self.scheduler.schedule(order.append, delay=0.05, args=("early",))
+        self.assertTrue(wait_for(lambda: len(order) == 2))
+        self.assertEqual(order, ["early", "late"])
+
+    def test_periodic_job(self):
+        calls = []
+        job = self.scheduler.schedule(lambda: calls.append(time.monotonic()), interval=0.05)
+        self.assertTrue(wait_for(lambda: len(calls) >= 3))
+        self.scheduler.cancel(job)
+        self.assertNotIn(job, self.scheduler.jobs())
+        count = job.runs
+        time.sleep(0.2)
+        self.assertLessEqual(job.runs, count + 1)
+
+    def test_jitter_delays_runs(self):
+        with patch("core.scheduler.random.uniform", return_value=0.3) as uniform:
+            job = self.scheduler.schedule(lambda: None, delay=0.1, jitter=0.5)
+            uniform.assert_called_with(0, 0.5)
+        self.assertGreaterEqual(job.next_run - time.monotonic(), 0.3)
+
+    def test_failing_job_keeps_running(self):
+        calls = []
+
+        def fail():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        with patch("builtins.print"):
+            job = self.scheduler.schedule(fail, interval=0.05)
+            self.assertTrue(wait_for(lambda: len(calls) >= 2))
+        self.assertIn("RuntimeError: boom", job.last_error)
+
+    def test_coalesce_skips_missed_runs(self):
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+
+        job = self.scheduler.schedule(slow, interval=0.02, delay=0)
+        time.sleep(0.3)
+        release.set()
+        self.scheduler.cancel(job)
+        self.assertTrue(wait_for(lambda: not job.running))
+        self.assertEqual(len(calls), 1)
+        self.assertGreater(job.missed, 0)
+
+    def test_without_coalesce_missed_runs_are_replayed(self):
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+
+        job = self.scheduler.schedule(slow, interval=0.05, delay=0, coalesce=False)
+        time.sleep(0.3)
+        self.assertEqual(len(calls), 1)
+        missed = job._pending - 1
+        release.set()
+        self.assertTrue(wait_for(lambda: len(calls) > missed))
+        self.scheduler.cancel(job)
+        self.assertGreater(missed, 2)
+        self.assertEqual(job.missed, 0)
+
+    def test_worker_pool_is_bounded(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.1)
+            with lock:
+                running.pop()
+
+        jobs = [self.scheduler.schedule(work) for _ in range(6)]
+        self.assertTrue(wait_for(lambda: all(job.runs for job in jobs)))
+        self.assertEqual(max(peak), 2)
+
+    def test_cancel_owner(self):
+        self.scheduler.schedule(lambda: None, interval=10, owner="a")
+        self.scheduler.schedule(lambda: None, interval=10, owner="a")
+        kept = self.scheduler.schedule(lambda: None, interval=10, owner="b")
+        self.assertEqual(self.scheduler.cancel_owner("a"), 2)
+        self.assertEqual(self.scheduler.jobs(), [kept])
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.schedule(lambda: None, interval=0)
+
+    def test_module_scheduler(self):
+        notifier = Notifier(backend=None)
+        view = ModuleScheduler(self.scheduler, "mod", notifier)
+        job = view.schedule(lambda: None, interval=10, name="tick")
+        self.assertEqual(job.name, "mod.tick")
+        self.assertEqual(self.scheduler.jobs(owner="mod"), [job])
+        view.notify("Title", "Body")
+        self.assertTrue(wait_for(lambda: notifier.pop_undelivered() == [("Title", "Body")]))
+
+
+class TestNotifier(unittest.TestCase):
+
+    def test_without_backend(self):
+        notifier = Notifier(backend=None)
+        self.assertFalse(notifier.send("Title", "Body"))
+        self.assertEqual(notifier.pop_undelivered(), [("Title", "Body")])
+        self.assertEqual(notifier.pop_undelivered(), [])
+
+    @patch("core.notifications.notify2")
+    def test_notify2_backend(self, notify2):
+        notifier = Notifier(backend="notify2")
+        self.assertTrue(notifier.send("Title", "Body"))
+        notify2.init.assert_called_once()
+        notify2.Notification.assert_called_with("Title", "Body")
+        notify2.Notification.return_value.show.assert_called_once()
+        self.assertEqual(notifier.pop_undelivered(), [])
+
+    @patch("core.notifications.notify2")
+    def test_backend_failure_falls_back_to_menu(self, notify2):
+        notify2.init.side_effect = Exception("no D-Bus session")
+        notifier = Notifier(backend="notify2")
+        self.assertFalse(notifier.send("Title", "Body"))
+        self.assertIsNone(notifier.backend)
+        self.assertEqual(notifier.pop_undelivered(), [("Title", "Body")])
+
+
+class TestManagerJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.modules_path = tempfile.mkdtemp()
+        self.write_module("with_jobs", 'name = "With jobs"\nversion = "1.0.0"\n\ndef register_jobs(scheduler):\n    pass\n')
+        self.write_module("without_jobs", 'name = "Without jobs"\nversion = "1.0.0"\n')
+        self.manager = ModuleManager()
+        self.manager.discover_modules(self.modules_path)
+
+    def tearDown(self):
+        self.manager.shutdown()
+        shutil.rmtree(self.modules_path)
+
+    def write_module(self, module_name, source):
+        module_path = os.path.join(self.modules_path, module_name)
+        os.makedirs(module_path, exist_ok=True)
+        with open(os.path.join(module_path, "__init__.py"), "w") as file:
+            file.write(source)
+
+    def test_discovery_detects_jobs(self):
+        self.assertTrue(self.manager.module_info["with_jobs"].jobs)
+        self.assertFalse(self.manager.module_info["without_jobs"].jobs)
+
+    def test_start_jobs_only_imports_modules_with_jobs(self):
+        module = MagicMock()
+        with patch.object(self.manager, "_load_registered", return_value=module) as load:
+            self.assertEqual(self.manager.start_jobs(), ["with_jobs"])
+        load.assert_called_once_with("with_jobs")
+        scheduler = module.register_jobs.call_args[0][0]
+        self.assertIsInstance(scheduler, ModuleScheduler)
+        self.assertEqual(scheduler.module_name, "with_jobs")
+        # Jobs are registered once
+        self.assertEqual(self.manager.start_jobs(), [])
+
+    def test_failing_registration(self):
+        module = MagicMock()
+        module.register_jobs.side_effect = RuntimeError("boom")
+        with patch.object(self.manager, "_load_registered", return_value=module), patch("builtins.print") as mock_print:
+            self.assertEqual(self.manager.start_jobs(), [])
+        mock_print.assert_not_called()
+        self.assertEqual(self.manager.notifier.pop_undelivered(),
+                         [("Jobs of with_jobs not started", "register_jobs() failed: boom")])
+
+    def test_start_jobs_later_runs_off_the_calling_thread(self):
+        threads = []
+        module = MagicMock()
+        module.register_jobs.side_effect = lambda scheduler: threads.append(threading.current_thread())
+        with patch.object(self.manager, "_load_registered", return_value=module):
+            self.manager.start_jobs_later()
+            self.assertTrue(wait_for(lambda: threads))
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_job_errors_go_to_the_notification_history(self):
+        scheduler = self.manager.get_scheduler()
+        with patch("builtins.print") as mock_print:
+            job = scheduler.schedule(lambda: 1 / 0, name="broken")
+            self.assertTrue(wait_for(lambda: job.runs == 1))
+        mock_print.assert_not_called()
+        self.assertEqual(self.manager.notifier.pop_undelivered(), [("Job broken failed", "division by zero")])
+
+    def test_unload_cancels_jobs(self):
+        module = MagicMock()
+        module.register_jobs.side_effect = lambda scheduler: scheduler.schedule(lambda: None, interval=10)
+        with patch.object(self.manager, "_load_registered", return_value=module):
+            self.manager.start_jobs()
+        self.assertEqual(len(self.manager.scheduler.jobs(owner="with_jobs")), 1)
+        with patch("builtins.print"):
+            self.manager.unload_module("with_jobs")
+        self.assertEqual(self.manager.scheduler.jobs(owner="with_jobs"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
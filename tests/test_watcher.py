@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import unittest
+from core.watcher import ModuleWatcher
+
+class TestModuleWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.modules_path = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.modules_path, "watched_module", "sub"))
+        self.write("watched_module/__init__.py", "name = 'Watched'\n")
+        self.write("watched_module/sub/helpers.py", "VALUE = 1\n")
+        self.watcher = ModuleWatcher(self.modules_path)
+        self.watcher.watch("watched_module")
+
+    def tearDown(self):
+        shutil.rmtree(self.modules_path)
+
+    def write(self, relative_path, source, mtime_ns=None):
+        path = os.path.join(self.modules_path, relative_path)
+        with open(path, "w") as file:
+            file.write(source)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_poll_without_changes(self):
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_poll_detects_modified_submodule(self):
+        self.write("watched_module/sub/helpers.py", "VALUE = 2\n", mtime_ns=1_000_000_000)
+        self.assertEqual(self.watcher.poll(), ["watched_module"])
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_poll_detects_new_file(self):
+        self.write("watched_module/extra.py", "")
+        self.assertEqual(self.watcher.poll(), ["watched_module"])
+
+    def test_unwatch(self):
+        self.watcher.unwatch("watched_module")
+        self.write("watched_module/extra.py", "")
+        self.assertEqual(self.watcher.poll(), [])
+
+if __name__ == '__main__':
+    unittest.main()
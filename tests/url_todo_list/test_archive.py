@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from modules.url_todo_list.archive import (
+    archive_path, archive_urls, restore_urls, iter_archived_urls, iter_all_urls, count_archived_urls,
+    attached_archive, incremental_vacuum, is_attached,
+)
+from modules.url_todo_list.bulk import URLFilter
+from modules.url_todo_list.database import (
+    create_connection, create_table, add_url, fetch_urls, archive_matching_urls
+)
+from modules.url_todo_list.search import search_urls
+from modules.url_todo_list.stats import fetch_totals
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "todos.db")
+        self.conn = create_connection(self.db_path)
+        create_table(self.conn)
+        for i in range(30):
+            add_url(self.conn, f"https://example.com/{i}", f"Article {i}", "news" if i % 3 else "blog", commit=False)
+        self.conn.execute("UPDATE urls SET status = 1 WHERE id % 2 = 0")
+        self.conn.execute("UPDATE urls SET timestamp = '2024-01-01 12:00:00' WHERE id <= 10")
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        self.directory.cleanup()
+
+    def test_archive_path(self):
+        self.assertEqual(archive_path("/data/todos.db"), "/data/todos.archive.db")
+        self.assertEqual(archive_path("/data/todos"), "/data/todos.archive.db")
+
+    def test_archive_read_urls(self):
+        result = archive_urls(self.conn, URLFilter(status=True), batch_size=4)
+        self.assertEqual((result.matched, result.moved, result.dry_run), (15, 15, False))
+        self.assertTrue(os.path.exists(archive_path(self.db_path)))
+        self.assertFalse(is_attached(self.conn))
+        self.assertFalse(self.conn.in_transaction)
+        self.assertEqual(len(fetch_urls(self.conn)), 15)
+        self.assertEqual(count_archived_urls(self.conn), 15)
+        totals = fetch_totals(self.conn)
+        self.assertEqual((totals.read, totals.unread), (0, 15))
+        # The search index follows the active table
+        self.assertEqual(len(search_urls(self.conn, "article", 100)), 15)
+
+    def test_old_rows_and_dry_run(self):
+        url_filter = URLFilter(end_time="2024-12-31")
+        self.assertEqual(archive_urls(self.conn, url_filter, dry_run=True).matched, 10)
+        self.assertFalse(os.path.exists(archive_path(self.db_path)))
+        archive_urls(self.conn, url_filter)
+        self.assertEqual([record.id for record in iter_archived_urls(self.conn, status=False)], [1, 3, 5, 7, 9])
+
+    def test_queries_reach_archived_rows(self):
+        archive_urls(self.conn, URLFilter(status=True))
+        records = list(iter_all_urls(self.conn))
+        self.assertEqual([record.id for record in records], list(range(1, 31)))
+        self.assertEqual(records[1].url, "https://example.com/1")
+        self.assertEqual(len(list(iter_archived_urls(self.conn, category="blog"))), 5)
+
+    def test_interrupted_move_is_not_duplicated(self):
+        archive_urls(self.conn, URLFilter(max_id=5))
+        # A copy committed to the archive but not deleted from urls yet
+        with attached_archive(self.conn):
+            self.conn.execute("INSERT INTO archive.urls(id, url, status) SELECT id, url, status FROM urls WHERE id = 6")
+            self.conn.commit()
+        self.assertEqual([record.id for record in iter_all_urls(self.conn)], list(range(1, 31)))
+        archive_urls(self.conn, URLFilter(max_id=6))
+        self.assertEqual(count_archived_urls(self.conn), 6)
+        self.assertEqual(fetch_urls(self.conn)[0].id, 7)
+
+    def test_restore(self):
+        archive_urls(self.conn, URLFilter(status=True))
+        add_url(self.conn, "https://example.com/1", "Added again", "news")
+        restored = restore_urls(self.conn, category="news")
+        self.assertEqual(restored, 9)
+        self.assertEqual(count_archived_urls(self.conn), 6)
+        self.assertEqual(fetch_totals(self.conn).read, 9)
+        self.assertEqual(len(search_urls(self.conn, "article", 100)), 24)
+
+    def test_incremental_vacuum(self):
+        self.assertEqual(self.conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+        self.conn.executemany("INSERT INTO urls(url, description) VALUES (?, ?)",
+                              [(f"https://example.org/{i}", "x" * 500) for i in range(2000)])
+        self.conn.commit()
+        result = archive_urls(self.conn, URLFilter(search="example.org"), batch_size=500)
+        self.assertEqual(result.moved, 2000)
+        self.assertGreater(result.freed_pages, 0)
+        self.assertEqual(self.conn.execute("PRAGMA freelist_count").fetchone()[0], 0)
+
+    def test_converts_database_without_auto_vacuum(self):
+        path = os.path.join(self.directory.name, "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE t (x)")
+        conn.executemany("INSERT INTO t VALUES (?)", [("x" * 500,)] * 500)
+        conn.commit()
+        conn.execute("DELETE FROM t")
+        conn.commit()
+        self.assertGreater(incremental_vacuum(conn), 0)
+        self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+        conn.close()
+
+    def test_memory_database_needs_archive_file(self):
+        conn = create_connection(":memory:")
+        create_table(conn)
+        add_url(conn, "https://example.com", "", "")
+        with self.assertRaises(ValueError):
+            archive_urls(conn, URLFilter())
+        archive_file = os.path.join(self.directory.name, "memory.archive.db")
+        self.assertEqual(archive_urls(conn, URLFilter(), archive_file).moved, 1)
+        self.assertEqual(count_archived_urls(conn, archive_file), 1)
+        conn.close()
+
+    def test_wrapper_reports_errors(self):
+        conn = create_connection(":memory:")
+        create_table(conn)
+        with patch("builtins.print") as mock_print:
+            self.assertIsNone(archive_matching_urls(conn, URLFilter(status=True)))
+        self.assertIn("Failed to archive URLs", mock_print.call_args[0][0])
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
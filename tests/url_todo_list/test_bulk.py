@@ -0,0 +1,105 @@
+import sqlite3
+import unittest
+from unittest.mock import patch
+from modules.url_todo_list.bulk import (
+    URLFilter, filter_is_empty, bulk_set_status, bulk_set_category, bulk_delete, PREVIEW_SIZE
+)
+from modules.url_todo_list.database import (
+    create_connection, create_table, add_url, fetch_urls, bulk_update_status
+)
+from modules.url_todo_list.stats import fetch_totals, fetch_category_stats
+
+class TestBulk(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = create_connection(":memory:")
+        create_table(self.conn)
+        for i in range(20):
+            category = "news" if i % 2 else "blog"
+            add_url(self.conn, f"https://example.com/{category}/{i}", f"Article {i}", category)
+        self.conn.execute("UPDATE urls SET timestamp = '2024-01-01 12:00:00' WHERE id <= 5")
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_filter_is_empty(self):
+        self.assertTrue(filter_is_empty(URLFilter()))
+        self.assertFalse(filter_is_empty(URLFilter(status=False)))
+
+    def test_set_status_by_category(self):
+        result = bulk_set_status(self.conn, URLFilter(category="news"), True)
+        self.assertEqual((result.matched, result.changed, result.dry_run), (10, 10, False))
+        self.assertEqual(len(fetch_urls(self.conn, status=True)), 10)
+        self.assertFalse(self.conn.in_transaction)
+        # Rows already read are not rewritten
+        result = bulk_set_status(self.conn, URLFilter(category="news"), True)
+        self.assertEqual((result.matched, result.changed), (10, 0))
+
+    def test_stats_follow_bulk_changes(self):
+        bulk_set_status(self.conn, URLFilter(min_id=1, max_id=4), True)
+        bulk_set_category(self.conn, URLFilter(max_id=2), "docs")
+        bulk_delete(self.conn, URLFilter(min_id=19))
+        totals = fetch_totals(self.conn)
+        self.assertEqual((totals.read, totals.unread, totals.total), (4, 14, 18))
+        docs = [stats for stats in fetch_category_stats(self.conn) if stats.category == "docs"]
+        self.assertEqual(docs[0].total, 2)
+
+    def test_id_range_and_time_window(self):
+        result = bulk_set_category(self.conn, URLFilter(min_id=3, end_time="2024-12-31"), "old")
+        self.assertEqual(result.changed, 3)
+        self.assertEqual([record.id for record in fetch_urls(self.conn, category="old")], [3, 4, 5])
+        result = bulk_delete(self.conn, URLFilter(start_time="2024-01-01", end_time="2024-01-02"), dry_run=True)
+        self.assertEqual(result.matched, 5)
+
+    def test_date_only_end_time_includes_the_whole_day(self):
+        self.assertEqual(bulk_delete(self.conn, URLFilter(end_time="2024-01-01"), dry_run=True).matched, 5)
+        self.assertEqual(bulk_delete(self.conn, URLFilter(end_time="2024-01-01 11:59:59"), dry_run=True).matched, 0)
+        self.assertEqual(bulk_delete(self.conn, URLFilter(end_time="2023-12-31"), dry_run=True).matched, 0)
+
+    def test_search_filter(self):
+        result = bulk_delete(self.conn, URLFilter(search="news"))
+        self.assertEqual(result.changed, 10)
+        self.assertEqual(len(fetch_urls(self.conn)), 10)
+        self.assertEqual(bulk_delete(self.conn, URLFilter(search="  ")).matched, 0)
+
+    def test_search_filter_without_fts(self):
+        self.conn.execute("DROP TABLE urls_fts")
+        result = bulk_set_status(self.conn, URLFilter(search="blog/1"), True, dry_run=True)
+        # blog/10, blog/12, ... blog/18
+        self.assertEqual(result.matched, 5)
+
+    def test_dry_run_writes_nothing(self):
+        result = bulk_delete(self.conn, URLFilter(status=False), dry_run=True)
+        self.assertTrue(result.dry_run)
+        self.assertEqual((result.matched, result.changed), (20, 20))
+        self.assertEqual(len(result.preview), PREVIEW_SIZE)
+        self.assertEqual(result.preview[0].id, 1)
+        self.assertEqual(len(fetch_urls(self.conn)), 20)
+        self.assertFalse(self.conn.in_transaction)
+
+    def test_uncommitted_in_caller_transaction(self):
+        add_url(self.conn, "https://example.com/pending", "", "", commit=False)
+        bulk_set_status(self.conn, URLFilter(category="blog"), True, commit=False)
+        self.assertTrue(self.conn.in_transaction)
+        self.conn.rollback()
+        self.assertEqual(len(fetch_urls(self.conn, status=True)), 0)
+        self.assertEqual(len(fetch_urls(self.conn)), 20)
+
+    def test_error_rolls_back(self):
+        self.conn.execute("CREATE TRIGGER fail BEFORE DELETE ON urls WHEN OLD.id = 15 BEGIN SELECT RAISE(ABORT, 'no'); END")
+        self.conn.commit()
+        with self.assertRaises(sqlite3.Error):
+            bulk_delete(self.conn, URLFilter(min_id=10))
+        self.assertFalse(self.conn.in_transaction)
+        self.assertEqual(len(fetch_urls(self.conn)), 20)
+
+    def test_wrapper_reports_errors(self):
+        self.conn.execute("CREATE TRIGGER fail BEFORE UPDATE ON urls BEGIN SELECT RAISE(ABORT, 'no'); END")
+        with patch("builtins.print") as mock_print:
+            self.assertIsNone(bulk_update_status(self.conn, URLFilter(category="news"), True))
+        self.assertIn("Failed to update URL statuses", mock_print.call_args[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from modules.url_todo_list.cache import QueryCache, get_query_cache, cached_fetchall
+from modules.url_todo_list.database import (
+    create_connection, create_table, add_url, delete_url, update_url_status,
+    update_url_description, fetch_all_urls, fetch_urls, fetch_urls_page
+)
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = create_connection(":memory:")
+        create_table(self.conn)
+        add_url(self.conn, "https://example.com/a", "A", "news")
+        add_url(self.conn, "https://example.com/b", "B", "blog")
+        self.cache = get_query_cache(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_repeated_reads_hit_the_cache(self):
+        first = fetch_all_urls(self.conn)
+        second = fetch_all_urls(self.conn)
+        self.assertEqual(first, second)
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 1))
+
+    def test_results_are_copies(self):
+        fetch_urls(self.conn, category="news").clear()
+        self.assertEqual(len(fetch_urls(self.conn, category="news")), 1)
+
+    def test_write_paths_invalidate(self):
+        fetch_all_urls(self.conn)
+        generation = self.cache.generation
+
+        add_url(self.conn, "https://example.com/c", "C", "news")
+        self.assertEqual(len(fetch_all_urls(self.conn)), 3)
+        update_url_status(self.conn, 1, True)
+        self.assertEqual(len(fetch_urls(self.conn, status=True)), 1)
+        update_url_description(self.conn, 1, "Changed")
+        self.assertEqual(fetch_urls_page(self.conn, limit=1)[0][2], "Changed")
+        delete_url(self.conn, 1)
+        self.assertEqual(len(fetch_all_urls(self.conn)), 2)
+        self.assertEqual(self.cache.generation, generation + 4)
+
+    def test_other_writes_on_the_connection_invalidate(self):
+        fetch_all_urls(self.conn)
+        self.conn.execute("DELETE FROM urls")
+        self.conn.commit()
+        self.assertEqual(fetch_all_urls(self.conn), [])
+
+    def test_lru_eviction(self):
+        cache = QueryCache(max_entries=2)
+        for category in ("news", "blog", "news", "other"):
+            cache.fetchall(self.conn, "SELECT * FROM urls WHERE category = ?", (category,))
+        self.assertEqual(len(cache), 2)
+        # "news" was used more recently than "blog", so it survived
+        cache.fetchall(self.conn, "SELECT * FROM urls WHERE category = ?", ("news",))
+        self.assertEqual(cache.hits, 2)
+
+    def test_row_budget_eviction(self):
+        add_url(self.conn, "https://example.com/c", "C", "news")
+        cache = QueryCache(max_rows=4)
+        cache.fetchall(self.conn, "SELECT * FROM urls WHERE category = ?", ("news",))
+        cache.fetchall(self.conn, "SELECT * FROM urls WHERE category = ?", ("blog",))
+        self.assertEqual((len(cache), cache.rows), (2, 3))
+        # The three rows of every URL go over the budget: the least recently used entry makes room
+        cache.fetchall(self.conn, "SELECT * FROM urls")
+        self.assertEqual((len(cache), cache.rows), (2, 4))
+        cache.fetchall(self.conn, "SELECT * FROM urls WHERE category = ?", ("blog",))
+        self.assertEqual(cache.hits, 1)
+        # "blog" was used more recently than every URL, so it survives the next eviction
+        cache.fetchall(self.conn, "SELECT * FROM urls WHERE category = ?", ("news",))
+        self.assertEqual((len(cache), cache.rows), (2, 3))
+        cache.fetchall(self.conn, "SELECT * FROM urls WHERE category = ?", ("blog",))
+        self.assertEqual(cache.hits, 2)
+
+    def test_large_results_are_not_kept(self):
+        cache = QueryCache(max_rows=1)
+        cache.fetchall(self.conn, "SELECT * FROM urls")
+        self.assertEqual(len(cache), 0)
+
+    def test_plain_connections_bypass_the_cache(self):
+        conn = sqlite3.connect(":memory:")
+        self.assertIsNone(get_query_cache(conn))
+        self.assertEqual(cached_fetchall(conn, "SELECT 1"), [(1,)])
+        conn.close()
+
+
+class TestQueryCacheAcrossConnections(unittest.TestCase):
+
+    def test_commits_from_other_connections_invalidate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "urls.db")
+            reader = create_connection(path)
+            writer = create_connection(path)
+            create_table(writer)
+            add_url(writer, "https://example.com/a", "A", "news")
+
+            self.assertEqual(len(fetch_all_urls(reader)), 1)
+            add_url(writer, "https://example.com/b", "B", "news")
+            self.assertEqual(len(fetch_all_urls(reader)), 2)
+
+            reader.close()
+            writer.close()
+
+if __name__ == '__main__':
+    unittest.main()
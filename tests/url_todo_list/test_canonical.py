@@ -0,0 +1,82 @@
+import unittest
+from modules.url_todo_list.canonical import canonicalize_url, url_identity, url_hash
+from modules.url_todo_list.database import create_connection, create_table, add_url, url_exists, merge_duplicates
+from modules.url_todo_list.migrations import migrate
+from modules.url_todo_list.utils import validate_urls
+
+class TestCanonicalize(unittest.TestCase):
+
+    def test_normalizes_scheme_host_and_port(self):
+        self.assertEqual(canonicalize_url("HTTPS://Example.COM:443/Path/"), "https://example.com/Path")
+        self.assertEqual(canonicalize_url("http://example.com:8080"), "http://example.com:8080")
+
+    def test_drops_tracking_params_and_fragment(self):
+        url = "https://example.com/a?utm_source=x&b=2&a=1&fbclid=y#section"
+        self.assertEqual(canonicalize_url(url), "https://example.com/a?a=1&b=2")
+
+    def test_query_is_sorted_and_reencoded(self):
+        self.assertEqual(canonicalize_url("https://example.com/?b=2&a&c=x-y.z"), "https://example.com?a=&b=2&c=x-y.z")
+        self.assertEqual(canonicalize_url("https://example.com/?q=a+b&p=%7e"), "https://example.com?p=~&q=a+b")
+        self.assertEqual(canonicalize_url("https://example.com/?a=1&&utm_medium=x"), "https://example.com?a=1")
+
+    def test_identity_ignores_scheme(self):
+        self.assertEqual(url_identity("http://example.com/"), url_identity("https://example.com"))
+        self.assertEqual(url_hash("http://example.com/"), url_hash("https://EXAMPLE.com"))
+        self.assertNotEqual(url_hash("https://example.com/a"), url_hash("https://example.com/b"))
+
+    def test_hash_fits_sqlite_integer(self):
+        value = url_hash("https://example.com")
+        self.assertTrue(-2**63 <= value < 2**63)
+
+    def test_validate_urls(self):
+        self.assertEqual(validate_urls(["https://example.com", "not a url", ""]), [True, False, False])
+
+
+class TestDeduplication(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = create_connection(":memory:")
+        create_table(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_add_url_rejects_canonical_duplicates(self):
+        self.assertIsNotNone(add_url(self.conn, "https://example.com/page", "Page", "test"))
+        self.assertIsNone(add_url(self.conn, "http://EXAMPLE.com/page/?utm_source=feed", "Page", "test"))
+        self.assertTrue(url_exists(self.conn, "https://example.com/page#top"))
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0], 1)
+
+    def test_migration_backfills_hashes(self):
+        conn = create_connection(":memory:")
+        conn.execute("CREATE TABLE urls (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT, description TEXT, category TEXT, status BOOLEAN)")
+        conn.execute("INSERT INTO urls(url, status) VALUES ('https://example.com', 0)")
+        conn.commit()
+        migrate(conn)
+        stored = conn.execute("SELECT url_hash FROM urls").fetchone()[0]
+        self.assertEqual(stored, url_hash("https://example.com"))
+        conn.close()
+
+    def test_merge_duplicates(self):
+        rows = [
+            ("https://example.com/a", "", "", 0),
+            ("http://example.com/a/", "Kept description", "news", 1),
+            ("https://example.com/a?utm_medium=mail", "Other", "misc", 0),
+            ("https://example.com/b", "Unique", "news", 0),
+        ]
+        # Rows written before the hash existed bypass the duplicate check
+        self.conn.executemany("INSERT INTO urls(url, description, category, status) VALUES (?, ?, ?, ?)", rows)
+        self.conn.commit()
+
+        self.assertEqual(merge_duplicates(self.conn, dry_run=True), (1, 2))
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0], 4)
+
+        self.assertEqual(merge_duplicates(self.conn), (1, 2))
+        remaining = self.conn.execute("SELECT url, description, category, status FROM urls ORDER BY id").fetchall()
+        self.assertEqual(remaining, [
+            ("https://example.com/a", "Kept description", "news", 1),
+            ("https://example.com/b", "Unique", "news", 0),
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
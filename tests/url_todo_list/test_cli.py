@@ -0,0 +1,172 @@
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from modules.url_todo_list.cli import main
+from modules.url_todo_list.database import create_connection, fetch_all_urls
+
+class TestCommandLine(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "todos.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_cli(self, *argv, stdin=""):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with patch('sys.stdout', stdout), patch('sys.stderr', stderr), patch('sys.stdin', io.StringIO(stdin)):
+            code = main(["--database", self.db_path, *argv])
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def fetch_rows(self):
+        conn = create_connection(self.db_path)
+        try:
+            return fetch_all_urls(conn)
+        finally:
+            conn.close()
+
+    def test_add_and_list(self):
+        code, output, _ = self.run_cli("add", "http://example.com", "-d", "Example", "-c", "news")
+        self.assertEqual(code, 0)
+        self.assertEqual(output, "1\n")
+        code, output, _ = self.run_cli("list", "--category", "news")
+        self.assertEqual(output, "1\thttp://example.com\tExample\tnews\t0\n")
+
+    def test_list_streams_rows(self):
+        for i in range(5):
+            self.run_cli("add", f"http://example{i}.com", "-c", "odd" if i % 2 else "even")
+        # Listing must not build and cache the whole result
+        with patch('modules.url_todo_list.repository.cached_fetchall', side_effect=AssertionError):
+            code, output, _ = self.run_cli("list", "--category", "even", "--status", "unread")
+        self.assertEqual(code, 0)
+        self.assertEqual([line.split("\t")[0] for line in output.splitlines()], ["1", "3", "5"])
+
+    def test_add_duplicate_warns_on_stderr(self):
+        self.run_cli("add", "http://example.com")
+        code, output, error = self.run_cli("add", "http://example.com/")
+        self.assertEqual(code, 0)
+        self.assertEqual(output, "")
+        self.assertIn("already exists", error)
+
+    def test_delete_missing_id(self):
+        self.run_cli("add", "http://example.com")
+        code, output, error = self.run_cli("delete", "1", "999")
+        self.assertEqual(code, 1)
+        self.assertEqual(output, "")
+        self.assertIn("No URL with ID 999", error)
+        self.assertEqual(self.fetch_rows(), [])
+
+    def test_add_invalid_url(self):
+        code, _, error = self.run_cli("add", "invalid-url")
+        self.assertEqual(code, 1)
+        self.assertIn("Invalid URL format", error)
+        self.assertEqual(self.fetch_rows(), [])
+
+    def test_database_errors_are_reported(self):
+        error = sqlite3.IntegrityError("UNIQUE constraint failed: urls.url_hash")
+        with patch('modules.url_todo_list.cli.add_url', side_effect=error):
+            code, output, stderr = self.run_cli("add", "http://example.com")
+            self.assertEqual(code, 1)
+            self.assertEqual(output, "")
+            self.assertIn("Error: UNIQUE constraint failed", stderr)
+
+            code, _, stderr = self.run_cli("batch", stdin="add http://example.com\nadd http://example2.com\n")
+            self.assertEqual(code, 1)
+            self.assertIn("Line 1: UNIQUE constraint failed", stderr)
+            self.assertIn("Line 2: UNIQUE constraint failed", stderr)
+
+    def test_update_and_filter_by_status(self):
+        self.run_cli("add", "http://example1.com")
+        self.run_cli("add", "http://example2.com")
+        self.run_cli("update", "2", "--status", "read", "--description", "Done")
+        _, output, _ = self.run_cli("list", "--status", "read")
+        self.assertEqual(output, "2\thttp://example2.com\tDone\t\t1\n")
+
+    def test_update_missing_id(self):
+        self.run_cli("add", "http://example.com")
+        code, output, error = self.run_cli("update", "999", "--status", "read")
+        self.assertEqual(code, 1)
+        self.assertEqual(output, "")
+        self.assertIn("No URL with ID 999", error)
+        self.assertFalse(self.fetch_rows()[0][4])
+
+    def test_batch_from_stdin(self):
+        commands = "\n".join(f"add http://example{i}.com -c batch" for i in range(50))
+        commands += "\n# comment\ndelete 1 2\nbogus\nupdate 3 -s read\n"
+        code, _, error = self.run_cli("batch", stdin=commands)
+        self.assertEqual(code, 1)
+        self.assertIn("Line 53", error)
+        rows = self.fetch_rows()
+        self.assertEqual(len(rows), 48)
+        self.assertEqual(rows[0][0], 3)
+        self.assertTrue(rows[0][4])
+
+    def test_export_json(self):
+        self.run_cli("add", "http://example.com", "-c", "news")
+        export_path = os.path.join(self.directory.name, "urls.json")
+        code, _, _ = self.run_cli("export", "json", export_path)
+        self.assertEqual(code, 0)
+        with open(export_path) as file:
+            self.assertEqual(json.load(file)[0]["URL"], "http://example.com")
+
+    def test_bulk_commands(self):
+        for i in range(6):
+            self.run_cli("add", f"http://example{i}.com", "-c", "news" if i < 4 else "blog")
+        code, output, _ = self.run_cli("bulk-status", "read", "--category", "news", "--dry-run")
+        self.assertEqual(code, 0)
+        self.assertEqual(output.splitlines()[0], "Would update 4 of 4 matching URL(s)")
+        self.assertEqual(len(output.splitlines()), 5)
+        self.assertFalse(any(row.status for row in self.fetch_rows()))
+
+        code, output, _ = self.run_cli("bulk-status", "read", "--category", "news", "--ids", "2-")
+        self.assertEqual(output, "Updated 3 of 3 matching URL(s)\n")
+        code, output, _ = self.run_cli("bulk-category", "archive", "--status", "read")
+        self.assertEqual(output, "Updated 3 of 3 matching URL(s)\n")
+        code, output, _ = self.run_cli("bulk-delete", "--category", "archive")
+        self.assertEqual(output, "Deleted 3 of 3 matching URL(s)\n")
+        self.assertEqual([row.id for row in self.fetch_rows()], [1, 5, 6])
+
+    def test_bulk_requires_a_filter(self):
+        self.run_cli("add", "http://example.com")
+        code, _, error = self.run_cli("bulk-delete")
+        self.assertEqual(code, 1)
+        self.assertIn("--all", error)
+        code, output, _ = self.run_cli("bulk-delete", "--all")
+        self.assertEqual(output, "Deleted 1 of 1 matching URL(s)\n")
+
+    def test_bulk_in_batch(self):
+        commands = "add http://example1.com -c news\nadd http://example2.com -c news\nbulk-status read --category news\nbulk-delete --ids 5-x\n"
+        code, output, error = self.run_cli("batch", stdin=commands)
+        self.assertEqual(code, 1)
+        self.assertIn("Line 4", error)
+        self.assertIn("Updated 2 of 2 matching URL(s)", output)
+        self.assertTrue(all(row.status for row in self.fetch_rows()))
+
+    def test_archive_commands(self):
+        for i in range(4):
+            self.run_cli("add", f"http://example{i}.com", "-c", "news")
+        self.run_cli("bulk-status", "read", "--ids", "1-2")
+        code, output, _ = self.run_cli("archive", "--dry-run")
+        self.assertEqual((code, output), (0, "Would archive 2 URL(s)\n"))
+        code, output, _ = self.run_cli("archive", "--batch-size", "1")
+        self.assertTrue(output.startswith("Archived 2 URL(s)"))
+        self.assertEqual([row.id for row in self.fetch_rows()], [3, 4])
+        _, output, _ = self.run_cli("list", "--archived")
+        self.assertEqual(output, "1\thttp://example0.com\t\tnews\t1\n2\thttp://example1.com\t\tnews\t1\n")
+
+        export_path = os.path.join(self.directory.name, "urls.json")
+        self.run_cli("export", "json", export_path, "--include-archived")
+        with open(export_path) as file:
+            self.assertEqual(len(json.load(file)), 4)
+        _, output, _ = self.run_cli("restore")
+        self.assertEqual(output, "Restored 2 URL(s)\n")
+        self.assertEqual(len(self.fetch_rows()), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from modules.url_todo_list.connection import ConnectionManager, PoolTimeoutError
+from modules.url_todo_list.database import create_table
+
+class TestConnectionManager(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "todos.db")
+        self.manager = ConnectionManager(self.db_path, max_readers=2)
+        with self.manager.write() as conn:
+            create_table(conn)
+
+    def tearDown(self):
+        self.manager.close()
+        self.directory.cleanup()
+
+    def test_writer_pragmas(self):
+        conn = self.manager.writer
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+        self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)  # MEMORY
+
+    def test_write_commits_and_rolls_back(self):
+        with self.manager.write() as conn:
+            conn.execute("INSERT INTO urls(url) VALUES ('http://example1.com')")
+        with self.assertRaises(RuntimeError):
+            with self.manager.write() as conn:
+                conn.execute("INSERT INTO urls(url) VALUES ('http://example2.com')")
+                raise RuntimeError("abort")
+        with self.manager.read() as conn:
+            rows = conn.execute("SELECT url FROM urls").fetchall()
+        self.assertEqual(rows, [("http://example1.com",)])
+
+    def test_readers_are_read_only_and_reused(self):
+        with self.manager.read() as conn:
+            first = conn
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO urls(url) VALUES ('http://example.com')")
+        with self.manager.read() as conn:
+            self.assertIs(conn, first)
+
+    def test_readers_do_not_block_writer(self):
+        with self.manager.read() as reader:
+            reader.execute("BEGIN")
+            reader.execute("SELECT COUNT(*) FROM urls").fetchone()
+            with self.manager.write() as conn:
+                conn.execute("INSERT INTO urls(url) VALUES ('http://example.com')")
+            # The open read transaction keeps its snapshot
+            self.assertEqual(reader.execute("SELECT COUNT(*) FROM urls").fetchone()[0], 0)
+        with self.manager.read() as reader:
+            self.assertEqual(reader.execute("SELECT COUNT(*) FROM urls").fetchone()[0], 1)
+
+    def test_pool_is_bounded_across_threads(self):
+        results = []
+        def read():
+            with self.manager.read() as conn:
+                results.append(conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0])
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [0] * 8)
+        self.assertLessEqual(self.manager._reader_count, 2)
+
+    def test_read_timeout(self):
+        with self.manager.read(), self.manager.read():
+            with self.assertRaises(PoolTimeoutError):
+                with self.manager.read(timeout=0.05):
+                    pass
+        with self.manager.read(timeout=0.05) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0], 0)
+
+    def test_memory_database_reads_through_writer(self):
+        manager = ConnectionManager(":memory:")
+        with manager.read() as conn:
+            self.assertIs(conn, manager.writer)
+        manager.close()
+
+if __name__ == '__main__':
+    unittest.main()
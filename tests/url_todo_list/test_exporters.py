@@ -0,0 +1,92 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+import xml.etree.ElementTree as ET
+from modules.url_todo_list.database import create_connection, create_table, add_url, iter_urls
+from modules.url_todo_list.importer import import_urls
+from modules.url_todo_list.utils import export_to_csv, export_to_json, export_to_xml
+
+ROWS = [
+    (1, "http://example1.com", "First", "news", 1),
+    (2, "http://example2.com", None, "blog", 0),
+]
+
+def generate_rows(count):
+    for i in range(count):
+        yield (i, f"http://example{i}.com/some/long/path", f"Description {i}", "category", i % 2)
+
+class TestExporters(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, filename):
+        return os.path.join(self.directory.name, filename)
+
+    def test_json_layout_matches_json_dump(self):
+        export_to_json(ROWS, self.path("urls.json"))
+        with open(self.path("urls.json")) as file:
+            content = file.read()
+        expected = [{"ID": r[0], "URL": r[1], "Description": r[2], "Category": r[3], "Status": r[4]} for r in ROWS]
+        self.assertEqual(content, json.dumps(expected, indent=4))
+        export_to_json([], self.path("empty.json"))
+        with open(self.path("empty.json")) as file:
+            self.assertEqual(json.load(file), [])
+
+    def test_ndjson(self):
+        export_to_json(ROWS, self.path("urls.ndjson"), ndjson=True)
+        with open(self.path("urls.ndjson")) as file:
+            lines = file.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[1])["URL"], "http://example2.com")
+
+    def test_xml(self):
+        export_to_xml(ROWS, self.path("urls.xml"))
+        root = ET.parse(self.path("urls.xml")).getroot()
+        self.assertEqual([element.find("URL").text for element in root], ["http://example1.com", "http://example2.com"])
+
+    def test_gzip_output(self):
+        export_to_csv(ROWS, self.path("urls.csv.gz"))
+        with gzip.open(self.path("urls.csv.gz"), "rt", newline="") as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ["ID", "URL", "Description", "Category", "Status"])
+        self.assertEqual(rows[1][1], "http://example1.com")
+
+    def test_gzip_roundtrip_through_importer(self):
+        conn = create_connection(":memory:")
+        create_table(conn)
+        export_to_json(ROWS, self.path("urls.ndjson.gz"), ndjson=True)
+        self.assertEqual(import_urls(conn, self.path("urls.ndjson.gz")).inserted, 2)
+        conn.close()
+
+    def test_iter_urls_streams_rows(self):
+        conn = create_connection(":memory:")
+        create_table(conn)
+        add_url(conn, "http://example1.com", "First", "news")
+        add_url(conn, "http://example2.com", "Second", "news")
+        rows = iter_urls(conn, batch_size=1)
+        first = next(rows)
+        self.assertEqual(first[:5], (1, "http://example1.com", "First", "news", 0))
+        self.assertEqual(first.url, "http://example1.com")
+        self.assertEqual(len(list(rows)), 1)
+        conn.close()
+
+    def test_memory_stays_flat(self):
+        for exporter, filename in ((export_to_csv, "big.csv"), (export_to_json, "big.json"), (export_to_xml, "big.xml")):
+            tracemalloc.start()
+            try:
+                exporter(generate_rows(5000), self.path(filename))
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertLess(peak, 256 * 1024, filename)
+
+if __name__ == '__main__':
+    unittest.main()
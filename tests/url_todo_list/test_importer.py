@@ -0,0 +1,121 @@
+import csv
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from modules.url_todo_list.database import create_connection, create_table, add_url, fetch_all_urls
+from modules.url_todo_list.importer import import_urls
+from modules.url_todo_list.search import search_urls, search_url_substring
+from modules.url_todo_list.stats import fetch_category_stats, fetch_totals
+from modules.url_todo_list.utils import export_to_csv, export_to_json, export_to_xml
+
+ROWS = [
+    (1, "http://example1.com", "First", "news", True),
+    (2, "http://example2.com", None, "blog", False),
+    (3, "invalid-url", "Broken", "news", False),
+    (4, "http://example1.com", "Duplicate", "news", False),
+]
+
+class TestImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.conn = create_connection(":memory:")
+        create_table(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        self.directory.cleanup()
+
+    def check_import(self, exporter, filename):
+        path = os.path.join(self.directory.name, filename)
+        exporter(ROWS, path)
+        result = import_urls(self.conn, path, batch_size=2)
+        self.assertEqual(result.read, 4)
+        self.assertEqual(result.inserted, 2)
+        self.assertEqual(result.duplicates, 1)
+        self.assertEqual(result.invalid, 1)
+        rows = [row[1:5] for row in fetch_all_urls(self.conn)]
+        self.assertEqual(rows[0], ("http://example1.com", "First", "news", 1))
+        self.assertEqual(rows[1][0], "http://example2.com")
+        self.assertFalse(rows[1][3])
+
+    def test_import_csv(self):
+        self.check_import(export_to_csv, "urls.csv")
+
+    def test_import_json(self):
+        self.check_import(export_to_json, "urls.json")
+
+    @patch('modules.url_todo_list.importer.JSON_CHUNK_SIZE', 7)
+    def test_import_json_in_small_chunks(self):
+        self.check_import(export_to_json, "urls.json")
+
+    def test_import_ndjson(self):
+        path = os.path.join(self.directory.name, "urls.ndjson")
+        with open(path, "w") as file:
+            file.write('{"URL": "http://example1.com", "Status": true}\n{"URL": "http://example2.com"}\n')
+        result = import_urls(self.conn, path)
+        self.assertEqual(result.inserted, 2)
+
+    def test_import_xml(self):
+        self.check_import(export_to_xml, "urls.xml")
+
+    def test_import_is_idempotent(self):
+        path = os.path.join(self.directory.name, "urls.csv")
+        export_to_csv(ROWS, path)
+        import_urls(self.conn, path)
+        result = import_urls(self.conn, path)
+        self.assertEqual(result.inserted, 0)
+        self.assertEqual(len(fetch_all_urls(self.conn)), 2)
+
+    def test_imported_urls_are_searchable(self):
+        path = os.path.join(self.directory.name, "urls.csv")
+        export_to_csv(ROWS, path)
+        import_urls(self.conn, path, batch_size=2)
+        self.assertEqual([row[1] for row in search_urls(self.conn, "first")], ["http://example1.com"])
+        self.assertEqual(len(search_url_substring(self.conn, "example")), 2)
+        triggers = {name for (name,) in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        self.assertTrue({"urls_fts_insert", "urls_trigram_insert"} <= triggers)
+
+    def test_imported_urls_are_counted(self):
+        add_url(self.conn, "http://example3.com", "Before", "news")
+        path = os.path.join(self.directory.name, "urls.csv")
+        export_to_csv(ROWS, path)
+        cache_size = self.conn.execute("PRAGMA cache_size").fetchone()[0]
+        import_urls(self.conn, path, batch_size=2)
+        self.assertEqual(tuple(fetch_totals(self.conn)), (1, 2, 3))
+        self.assertEqual([(stats.category, stats.read, stats.unread) for stats in fetch_category_stats(self.conn)],
+                         [("blog", 0, 1), ("news", 1, 1)])
+        # The insert trigger is back once the import is done
+        add_url(self.conn, "http://example4.com", "After", "blog")
+        self.assertEqual(fetch_totals(self.conn).total, 4)
+        self.assertEqual(self.conn.execute("PRAGMA cache_size").fetchone()[0], cache_size)
+
+    def write_file(self, filename, content):
+        path = os.path.join(self.directory.name, filename)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def test_non_string_urls_are_invalid(self):
+        path = self.write_file("urls.json", '[{"URL": 5}, {"URL": null}, {"URL": "http://example.com"}]')
+        result = import_urls(self.conn, path)
+        self.assertEqual((result.read, result.inserted, result.invalid), (3, 1, 2))
+
+    def test_malformed_files_raise_value_error(self):
+        files = {
+            "bad.xml": "<urls><url><URL>http://example.com</URL></url>",
+            "bad.json": '[{"URL": "http://example.com"}, {"URL": ',
+            "bad.csv": "ID,URL\n1," + "x" * (csv.field_size_limit() + 1) + "\n",
+        }
+        for filename, content in files.items():
+            with self.subTest(filename=filename):
+                with self.assertRaisesRegex(ValueError, "Malformed"):
+                    import_urls(self.conn, self.write_file(filename, content))
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            import_urls(self.conn, "urls.txt")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from modules.url_todo_list.database import create_connection, create_table, add_url
+from modules.url_todo_list.jobs import (
+    count_stale_urls, remind_stale_urls, maintain_database, register_jobs, STALE_DAYS,
+    REMINDER_INTERVAL, MAINTENANCE_INTERVAL,
+)
+
+class TestJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "todos.db")
+        self.conn = create_connection(self.db_path)
+        create_table(self.conn)
+        add_url(self.conn, "https://example.com/old", "", "news")
+        add_url(self.conn, "https://example.com/read", "", "news")
+        add_url(self.conn, "https://example.com/new", "", "news")
+        self.conn.execute("UPDATE urls SET timestamp = datetime('now', '-30 days') WHERE id IN (1, 2)")
+        self.conn.execute("UPDATE urls SET status = 1 WHERE id = 2")
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        self.directory.cleanup()
+
+    def test_count_stale_urls(self):
+        self.assertEqual(count_stale_urls(self.conn), 1)
+        self.assertEqual(count_stale_urls(self.conn, days=60), 0)
+
+    def test_remind_stale_urls(self):
+        scheduler = MagicMock()
+        remind_stale_urls(scheduler, self.db_path)
+        scheduler.notify.assert_called_once()
+        self.assertIn(f"1 unread URLs are older than {STALE_DAYS} days", scheduler.notify.call_args[0][1])
+
+    def test_no_reminder_without_stale_urls(self):
+        self.conn.execute("UPDATE urls SET status = 1")
+        self.conn.commit()
+        scheduler = MagicMock()
+        remind_stale_urls(scheduler, self.db_path)
+        scheduler.notify.assert_not_called()
+
+    def test_missing_database(self):
+        scheduler = MagicMock()
+        missing = os.path.join(self.directory.name, "missing.db")
+        remind_stale_urls(scheduler, missing)
+        maintain_database(missing)
+        scheduler.notify.assert_not_called()
+        self.assertFalse(os.path.exists(missing))
+
+    def test_maintain_database(self):
+        maintain_database(self.db_path)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0], 3)
+
+    def test_register_jobs(self):
+        scheduler = MagicMock()
+        register_jobs(scheduler, self.db_path)
+        intervals = sorted(call[0][1] for call in scheduler.schedule.call_args_list)
+        self.assertEqual(intervals, sorted([REMINDER_INTERVAL, MAINTENANCE_INTERVAL]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from modules.url_todo_list.database import create_connection, create_table, add_url
+from modules.url_todo_list.link_checker import check_links
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers according to the path, and tracks how many requests run at once"""
+
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, body):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.05)
+            if self.path.startswith("/missing"):
+                self.send_response(404)
+            elif self.path == "/redirect":
+                self.send_response(301)
+                self.send_header("Location", "/ok")
+            elif self.path == "/loop":
+                self.send_response(302)
+                self.send_header("Location", "/loop")
+            elif self.path == "/no-head" and self.command == "HEAD":
+                self.send_response(405)
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            if body:
+                self.wfile.write(b"ok")
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def do_HEAD(self):
+        self.respond(body=False)
+
+    def do_GET(self):
+        self.respond(body=True)
+
+
+class TestLinkChecker(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server.daemon_threads = True
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.conn = create_connection(":memory:")
+        create_table(self.conn)
+        StubHandler.max_active = 0
+
+    def tearDown(self):
+        self.conn.close()
+
+    def results(self):
+        return self.conn.execute("SELECT url, http_status, final_url, check_error, checked_at FROM urls ORDER BY id").fetchall()
+
+    def test_records_status_and_redirect_target(self):
+        for path in ("/ok", "/missing", "/redirect", "/no-head"):
+            add_url(self.conn, self.base + path, "", "test")
+
+        summary = check_links(self.conn, batch_size=2)
+        self.assertEqual((summary.checked, summary.ok, summary.broken, summary.errors), (4, 3, 1, 0))
+
+        rows = self.results()
+        self.assertEqual([row[1] for row in rows], [200, 404, 200, 200])
+        self.assertEqual(rows[2][2], self.base + "/ok")
+        self.assertTrue(all(row[4] is not None for row in rows))
+
+    def test_unreachable_and_redirect_loops_are_errors(self):
+        add_url(self.conn, self.base + "/loop", "", "test")
+        # Nothing listens on port 1
+        add_url(self.conn, "http://127.0.0.1:1/", "", "test")
+
+        summary = check_links(self.conn, timeout=2)
+        self.assertEqual(summary.errors, 2)
+        for row in self.results():
+            self.assertIsNone(row[1])
+            self.assertTrue(row[3])
+
+    def test_url_without_scheme(self):
+        add_url(self.conn, self.base.replace("http://", "") + "/ok", "", "test")
+
+        summary = check_links(self.conn)
+        self.assertEqual((summary.ok, summary.errors), (1, 0))
+        self.assertEqual(self.results()[0][2], self.base + "/ok")
+
+    def test_per_host_limit(self):
+        for index in range(12):
+            add_url(self.conn, f"{self.base}/slow/{index}", "", "test")
+
+        summary = check_links(self.conn, concurrency=10, per_host=2)
+        self.assertEqual(summary.ok, 12)
+        self.assertLessEqual(StubHandler.max_active, 2)
+
+    def test_unchecked_only(self):
+        add_url(self.conn, self.base + "/ok", "", "test")
+        check_links(self.conn)
+        add_url(self.conn, self.base + "/missing", "", "test")
+
+        summary = check_links(self.conn, unchecked_only=True)
+        self.assertEqual((summary.checked, summary.broken), (1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from modules.url_todo_list.database import create_connection, fetch_all_urls
+from modules.url_todo_list.migrations import migrate, get_schema_version, table_columns, SCHEMA_VERSION
+
+# Schema created by earlier versions of module_runner.initialize_database
+LEGACY_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    description TEXT,
+    category TEXT,
+    status BOOLEAN NOT NULL CHECK (status IN (0, 1))
+);
+"""
+
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = create_connection(":memory:")
+
+    def tearDown(self):
+        self.conn.close()
+
+    def index_names(self):
+        return {row[1] for row in self.conn.execute("PRAGMA index_list(urls)")}
+
+    def test_migrate_new_database(self):
+        self.assertEqual(migrate(self.conn), SCHEMA_VERSION)
+        self.assertEqual(get_schema_version(self.conn), SCHEMA_VERSION)
+        self.assertIn("timestamp", table_columns(self.conn, "urls"))
+        self.assertTrue({"idx_urls_status", "idx_urls_category", "idx_urls_timestamp"} <= self.index_names())
+
+    def test_migrate_is_idempotent(self):
+        migrate(self.conn)
+        self.conn.execute("INSERT INTO urls(url) VALUES ('http://example.com')")
+        self.conn.commit()
+        migrate(self.conn)
+        self.assertEqual(len(fetch_all_urls(self.conn)), 1)
+
+    def test_migrate_legacy_database(self):
+        self.conn.execute(LEGACY_TABLE_SQL)
+        self.conn.executemany("INSERT INTO urls(url, description, category, status) VALUES (?, ?, ?, ?)", [
+            ("http://example1.com", "First", "news", True),
+            ("http://example2.com", "Second", "blog", False),
+            ("http://example1.com", "Duplicate", "news", False),
+        ])
+        self.conn.commit()
+        migrate(self.conn)
+
+        rows = fetch_all_urls(self.conn)
+        self.assertEqual([row[:5] for row in rows], [
+            (1, "http://example1.com", "First", "news", 1),
+            (2, "http://example2.com", "Second", "blog", 0),
+        ])
+        self.assertIsNotNone(self.conn.execute("SELECT timestamp FROM urls WHERE id = 1").fetchone()[0])
+        cur = self.conn.execute("INSERT INTO urls(url) VALUES ('http://example3.com')")
+        self.assertEqual(cur.lastrowid, 4)
+        with self.assertRaises(Exception):
+            self.conn.execute("INSERT INTO urls(url) VALUES ('http://example1.com')")
+
+    def test_filtered_queries_use_indexes(self):
+        migrate(self.conn)
+        plan = self.conn.execute("EXPLAIN QUERY PLAN SELECT * FROM urls WHERE category = ?", ("news",)).fetchall()
+        self.assertIn("idx_urls_category", " ".join(str(row[-1]) for row in plan))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch
+from modules.url_todo_list.archive import ArchiveResult
+from modules.url_todo_list import module_runner
+from modules.url_todo_list.database import create_connection, create_table, add_url, fetch_all_urls
+
+class TestMenuActions(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = create_connection(":memory:")
+        create_table(self.conn)
+        add_url(self.conn, "http://example.com", "Example", "news")
+
+    def tearDown(self):
+        self.conn.close()
+
+    @patch.object(module_runner, 'pause_for_error')
+    @patch.object(module_runner, 'console')
+    def update(self, url_id, inputs, mock_console, mock_pause):
+        mock_console.input.side_effect = inputs
+        with patch.object(module_runner, 'browse_urls', return_value=url_id):
+            module_runner.update_url(self.conn)
+        return " ".join(str(call.args[0]) for call in mock_console.print.call_args_list)
+
+    def test_update_url(self):
+        output = self.update(1, ["Updated", "true"])
+        self.assertIn("updated successfully", output)
+        self.assertEqual(fetch_all_urls(self.conn)[0][2:5], ("Updated", "news", 1))
+
+    def test_update_missing_url(self):
+        output = self.update(999, ["Updated", "true"])
+        self.assertIn("No URL with ID 999", output)
+        self.assertNotIn("updated successfully", output)
+        self.assertEqual(fetch_all_urls(self.conn)[0][2:5], ("Example", "news", 0))
+
+    @patch.object(module_runner, 'pause_for_error')
+    @patch.object(module_runner, 'clear_console')
+    @patch.object(module_runner, 'count_archived_urls', return_value=0)
+    @patch.object(module_runner, 'console')
+    def archive(self, inputs, mock_console, *mocks):
+        mock_console.input.side_effect = inputs
+        with patch.object(module_runner, 'archive_urls', return_value=ArchiveResult(1, 0, 0, True)) as mock_archive:
+            module_runner.archive_menu(self.conn)
+        return mock_archive.call_args.args[1], mock_console
+
+    def test_archive_days_are_validated(self):
+        url_filter, mock_console = self.archive(["1", "-5", "abc", "99999999", "30", "n"])
+        self.assertEqual(mock_console.input.call_count, 6)
+        errors = [call for call in mock_console.print.call_args_list if "whole number of days" in str(call.args[0])]
+        self.assertEqual(len(errors), 3)
+        self.assertTrue(url_filter.status)
+        self.assertIsNotNone(url_filter.end_time)
+
+    def test_archive_without_day_limit(self):
+        url_filter, _ = self.archive(["1", "", "n"])
+        self.assertIsNone(url_filter.end_time)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import patch
+from modules.url_todo_list import module_runner
+from modules.url_todo_list.database import create_connection, create_table, add_url, update_url_status, fetch_urls_page
+
+class TestPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = create_connection(":memory:")
+        create_table(self.conn)
+        for i in range(1, 8):
+            add_url(self.conn, f"http://example{i}.com", f"Description {i}", "even" if i % 2 == 0 else "odd")
+        update_url_status(self.conn, 3, True)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def ids(self, rows):
+        return [row[0] for row in rows]
+
+    def test_first_and_next_page(self):
+        self.assertEqual(self.ids(fetch_urls_page(self.conn, limit=3)), [1, 2, 3])
+        self.assertEqual(self.ids(fetch_urls_page(self.conn, after_id=3, limit=3)), [4, 5, 6])
+        self.assertEqual(self.ids(fetch_urls_page(self.conn, after_id=6, limit=3)), [7])
+
+    def test_previous_page(self):
+        self.assertEqual(self.ids(fetch_urls_page(self.conn, before_id=7, limit=3)), [4, 5, 6])
+        self.assertEqual(self.ids(fetch_urls_page(self.conn, before_id=2, limit=3)), [1])
+
+    def test_filtered_pages(self):
+        self.assertEqual(self.ids(fetch_urls_page(self.conn, after_id=1, limit=2, category="odd")), [3, 5])
+        self.assertEqual(self.ids(fetch_urls_page(self.conn, status=True)), [3])
+        self.assertEqual(self.ids(fetch_urls_page(self.conn, status=False, category="odd", before_id=7)), [1, 5])
+
+    def test_page_query_uses_index(self):
+        plan = self.conn.execute("EXPLAIN QUERY PLAN SELECT id FROM urls WHERE id > ? ORDER BY id LIMIT 20", (5000,)).fetchall()
+        self.assertNotIn("SCAN urls", " ".join(str(row[-1]) for row in plan))
+
+    @patch.object(module_runner, 'PAGE_SIZE', 3)
+    @patch.object(module_runner, 'console')
+    def browse(self, inputs, mock_console, **kwargs):
+        mock_console.input.side_effect = inputs
+        pages = []
+        with patch.object(module_runner, 'display_urls_table', side_effect=lambda rows: pages.append(self.ids(rows))):
+            selected = module_runner.browse_urls(self.conn, **kwargs)
+        return selected, pages
+
+    def test_browse_navigation(self):
+        selected, pages = self.browse(["n", "n", "p", "p", "q"])
+        self.assertIsNone(selected)
+        self.assertEqual(pages, [[1, 2, 3], [4, 5, 6], [7], [4, 5, 6], [1, 2, 3]])
+
+    def test_browse_jump_and_select(self):
+        selected, pages = self.browse(["g 5", "p", "6"], select_prompt="Enter the ID")
+        self.assertEqual(selected, 6)
+        self.assertEqual(pages, [[1, 2, 3], [5, 6, 7], [2, 3, 4]])
+
+    def test_browse_filter(self):
+        selected, pages = self.browse(["f", "unread", "odd", "q"])
+        self.assertEqual(pages, [[1, 2, 3], [1, 5, 7]])
+
+if __name__ == '__main__':
+    unittest.main()
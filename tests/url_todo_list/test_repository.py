@@ -0,0 +1,69 @@
+import sqlite3
+import unittest
+from modules.url_todo_list.database import create_connection, create_table
+from modules.url_todo_list.repository import URLRepository, URLRecord, URL_COLUMNS, INSERT_URL_SQL, insert_url_params
+
+class TestURLRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = create_connection(":memory:")
+        create_table(self.conn)
+        self.repository = URLRepository(self.conn)
+        self.repository.add("https://example.com/a", "First", "news")
+        self.repository.add("https://example.com/b", "Second", "blog", status=True)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_records_name_their_columns(self):
+        record = self.repository.get(1)
+        self.assertIsInstance(record, URLRecord)
+        self.assertEqual(record._fields, URL_COLUMNS)
+        self.assertEqual((record.id, record.url, record.description, record.category, record.status),
+                         (1, "https://example.com/a", "First", "news", 0))
+        self.assertIsNone(self.repository.get(99))
+
+    def test_add_rejects_duplicates(self):
+        self.assertIsNone(self.repository.add("http://EXAMPLE.com/a/", "Again", "news"))
+        self.assertTrue(self.repository.exists("https://example.com/a#top"))
+        self.assertFalse(self.repository.exists("https://example.com/c"))
+
+    def test_add_reports_constraint_errors(self):
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.repository.add("https://example.com/c", "", "", status=None)
+        self.conn.rollback()
+        self.assertEqual(len(self.repository.list()), 2)
+
+    def test_batch_skips_repeated_urls(self):
+        rows = [insert_url_params(url, "", "") for url in ("https://example.com/c", "https://example.com/c", "https://example.com/a")]
+        self.assertEqual(self.conn.executemany(INSERT_URL_SQL, rows).rowcount, 1)
+
+    def test_update_and_delete(self):
+        self.assertTrue(self.repository.update(1, description="Changed", status=True))
+        self.assertEqual(self.repository.get(1)[2:5], ("Changed", "news", 1))
+        self.assertFalse(self.repository.update(99, status=True))
+        self.assertTrue(self.repository.update(1))
+        self.assertTrue(self.repository.delete(1))
+        self.assertFalse(self.repository.delete(1))
+        self.assertEqual([record.id for record in self.repository.list()], [2])
+
+    def test_list_and_iter_filters(self):
+        self.assertEqual([record.id for record in self.repository.list(status=True)], [2])
+        self.assertEqual([record.id for record in self.repository.list(category="news")], [1])
+        rows = self.repository.iter(batch_size=1)
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual([record.url for record in rows], ["https://example.com/a", "https://example.com/b"])
+        self.assertEqual([record.id for record in self.repository.iter(status=False)], [1])
+
+    def test_page(self):
+        self.assertEqual([record.id for record in self.repository.page(limit=1)], [1])
+        self.assertEqual([record.id for record in self.repository.page(after_id=1)], [2])
+        self.assertEqual([record.id for record in self.repository.page(before_id=2)], [1])
+
+    def test_uncommitted_writes(self):
+        self.repository.add("https://example.com/c", "", "", commit=False)
+        self.conn.rollback()
+        self.assertEqual(len(self.repository.list()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
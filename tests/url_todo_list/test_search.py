@@ -0,0 +1,67 @@
+import unittest
+from modules.url_todo_list.database import create_connection, create_table, add_url, delete_url, update_url_description
+from modules.url_todo_list.migrations import deferred_search_index
+from modules.url_todo_list.repository import INSERT_URL_SQL, insert_url_params
+from modules.url_todo_list.search import search_urls, search_url_substring, build_match_query
+
+class TestSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = create_connection(":memory:")
+        create_table(self.conn)
+        add_url(self.conn, "https://docs.python.org/3/library/sqlite3.html", "SQLite module reference", "python")
+        add_url(self.conn, "https://www.sqlite.org/fts5.html", "Full-text search extension", "databases")
+        add_url(self.conn, "https://example.com/recipes", "Pasta recipes", "cooking")
+
+    def tearDown(self):
+        self.conn.close()
+
+    def urls(self, rows):
+        return [row[1] for row in rows]
+
+    def test_build_match_query(self):
+        self.assertEqual(build_match_query('full "text'), '"full"* "text"*')
+        self.assertEqual(build_match_query("  "), "")
+
+    def test_word_search(self):
+        self.assertEqual(self.urls(search_urls(self.conn, "recipes")), ["https://example.com/recipes"])
+
+    def test_prefix_search(self):
+        self.assertEqual(self.urls(search_urls(self.conn, "data")), ["https://www.sqlite.org/fts5.html"])
+
+    def test_results_are_ranked(self):
+        rows = search_urls(self.conn, "sqlite")
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0][1], "https://docs.python.org/3/library/sqlite3.html")
+
+    def test_substring_search(self):
+        self.assertEqual(self.urls(search_url_substring(self.conn, "ample.co")), ["https://example.com/recipes"])
+        self.assertEqual(len(search_url_substring(self.conn, "ht")), 3)
+
+    def test_index_follows_updates_and_deletes(self):
+        update_url_description(self.conn, 3, "Bread baking")
+        self.assertEqual(search_urls(self.conn, "pasta"), [])
+        self.assertEqual(len(search_urls(self.conn, "bread")), 1)
+        delete_url(self.conn, 3)
+        self.assertEqual(search_urls(self.conn, "bread"), [])
+        self.assertEqual(search_url_substring(self.conn, "example"), [])
+
+    def test_deferred_index_is_rolled_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with deferred_search_index(self.conn):
+                self.conn.execute(INSERT_URL_SQL, insert_url_params("https://example.com/lost", "Lost page", None))
+                raise RuntimeError("interrupted")
+        self.assertFalse(self.conn.in_transaction)
+        self.assertEqual(search_url_substring(self.conn, "lost"), [])
+        # The insert triggers are back
+        add_url(self.conn, "https://example.com/found", "Found page", None)
+        self.assertEqual(self.urls(search_urls(self.conn, "found")), ["https://example.com/found"])
+
+    def test_like_fallback_without_fts(self):
+        self.conn.execute("DROP TABLE urls_fts")
+        self.conn.execute("DROP TABLE urls_trigram")
+        self.assertEqual(self.urls(search_urls(self.conn, "Pasta")), ["https://example.com/recipes"])
+        self.assertEqual(self.urls(search_url_substring(self.conn, "100%")), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+import csv
+import http.client
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from modules.url_todo_list.database import create_connection, create_table, add_url
+from modules.url_todo_list.server import APIServer, ChunkedWriter, ResponseCache, header_host, MAX_PAGE_LIMIT
+
+class TestAPIServer(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "todos.db")
+        conn = create_connection(self.db_path)
+        create_table(conn)
+        for i in range(5):
+            add_url(conn, f"https://example.com/{i}", f"Article {i}", "news" if i % 2 else "blog")
+        conn.close()
+        self.server = APIServer(self.db_path, port=0)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.client = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=10)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.directory.cleanup()
+
+    def request(self, method, path, body=None, headers=None):
+        payload = json.dumps(body) if body is not None else None
+        headers = dict(headers or {})
+        if payload is not None:
+            headers.setdefault("Content-Type", "application/json")
+        self.client.request(method, path, body=payload, headers=headers)
+        response = self.client.getresponse()
+        return response.status, response, response.read()
+
+    def test_page_and_stream(self):
+        status, _, data = self.request("GET", "/urls?limit=2&category=blog")
+        self.assertEqual(status, 200)
+        page = json.loads(data)
+        self.assertEqual([url["id"] for url in page["urls"]], [1, 3])
+        self.assertEqual(page["next_after_id"], 3)
+        _, _, data = self.request("GET", "/urls?limit=2&category=blog&after_id=3")
+        page = json.loads(data)
+        self.assertEqual([url["id"] for url in page["urls"]], [5])
+        self.assertIsNone(page["next_after_id"])
+
+        status, response, data = self.request("GET", "/urls?status=unread")
+        self.assertEqual(response.getheader("Transfer-Encoding"), "chunked")
+        self.assertEqual(len(json.loads(data)), 5)
+        self.assertEqual(self.request("GET", f"/urls?limit={MAX_PAGE_LIMIT + 1}")[0], 400)
+
+    def test_conditional_get(self):
+        _, response, _ = self.request("GET", "/urls/1")
+        etag = response.getheader("ETag")
+        status, response, data = self.request("GET", "/urls/1", headers={"If-None-Match": etag})
+        self.assertEqual((status, data), (304, b""))
+        self.assertEqual(response.getheader("ETag"), etag)
+
+        # A commit from another connection changes the version
+        conn = create_connection(self.db_path)
+        add_url(conn, "https://example.org", "", "")
+        conn.close()
+        status, response, data = self.request("GET", "/urls/1", headers={"If-None-Match": etag})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(response.getheader("ETag"), etag)
+        self.assertEqual(json.loads(data)["url"], "https://example.com/0")
+
+    def test_write_endpoints(self):
+        status, response, data = self.request("POST", "/urls", {"url": "https://example.net", "category": "docs"})
+        self.assertEqual(status, 201)
+        self.assertEqual(response.getheader("Location"), "/urls/6")
+        self.assertEqual(self.request("POST", "/urls", {"url": "https://example.net/"})[0], 409)
+        self.assertEqual(self.request("POST", "/urls", {"url": "not a url"})[0], 400)
+
+        status, _, data = self.request("PATCH", "/urls/6", {"status": True, "description": "Docs"})
+        self.assertEqual(json.loads(data), {"id": 6, "url": "https://example.net", "description": "Docs",
+                                            "category": "docs", "status": True})
+        self.assertEqual(self.request("PATCH", "/urls/6", {"status": "yes"})[0], 400)
+        self.assertEqual(self.request("PATCH", "/urls/99", {"status": True})[0], 404)
+
+        self.assertEqual(self.request("DELETE", "/urls/6")[0], 204)
+        self.assertEqual(self.request("DELETE", "/urls/6")[0], 404)
+        self.assertEqual(self.request("GET", "/urls/6")[0], 404)
+
+    def test_writes_invalidate_cached_responses(self):
+        _, _, before = self.request("GET", "/stats")
+        self.request("PATCH", "/urls/1", {"status": True})
+        _, _, after = self.request("GET", "/stats")
+        self.assertEqual(json.loads(before)["totals"]["read"], 0)
+        self.assertEqual(json.loads(after)["totals"]["read"], 1)
+
+    def test_search_and_export(self):
+        _, _, data = self.request("GET", "/search?q=article")
+        self.assertEqual(len(json.loads(data)["urls"]), 5)
+        _, _, data = self.request("GET", "/search?q=example.com/3&substring=1")
+        self.assertEqual([url["id"] for url in json.loads(data)["urls"]], [4])
+
+        status, response, data = self.request("GET", "/export?format=csv")
+        self.assertEqual(status, 200)
+        self.assertIn("urls.csv", response.getheader("Content-Disposition"))
+        rows = list(csv.reader(io.StringIO(data.decode("utf-8"))))
+        self.assertEqual(len(rows), 6)
+        _, _, data = self.request("GET", "/export?format=ndjson")
+        self.assertEqual(len(data.splitlines()), 5)
+        self.assertEqual(self.request("GET", "/export?format=pdf")[0], 400)
+
+    def test_errors(self):
+        self.assertEqual(self.request("GET", "/missing")[0], 404)
+        status, _, data = self.request("DELETE", "/urls")
+        self.assertEqual(status, 405)
+        self.assertIn("error", json.loads(data))
+        self.client.request("POST", "/urls", body="{not json", headers={"Content-Type": "application/json"})
+        response = self.client.getresponse()
+        self.assertEqual(response.status, 400)
+        response.read()
+        # The connection is still usable
+        self.assertEqual(self.request("GET", "/urls/1")[0], 200)
+
+    def test_ids_too_large_for_sqlite(self):
+        huge = 2 ** 63
+        for method, path in (("GET", f"/urls/{huge}"), ("PATCH", f"/urls/{huge}"), ("DELETE", f"/urls/{huge}"),
+                             ("GET", f"/urls?limit=5&after_id={huge}")):
+            status, _, data = self.request(method, path, {"status": True} if method == "PATCH" else None)
+            self.assertEqual(status, 400, path)
+            self.assertIn("error", json.loads(data))
+        self.assertEqual(self.request("GET", f"/urls/{huge - 1}")[0], 404)
+        # The connection is still usable
+        self.assertEqual(self.request("GET", "/urls/1")[0], 200)
+
+    def test_cross_site_requests_are_refused(self):
+        status, _, _ = self.request("POST", "/urls", {"url": "https://evil.example"},
+                                    headers={"Content-Type": "text/plain"})
+        self.assertEqual(status, 415)
+        self.reconnect()
+        status, _, _ = self.request("POST", "/urls", {"url": "https://evil.example"},
+                                    headers={"Origin": "https://evil.example"})
+        self.assertEqual(status, 403)
+        self.reconnect()
+        # DNS rebinding: a page of attacker.test resolved to 127.0.0.1
+        self.assertEqual(self.request("GET", "/urls?limit=5", headers={"Host": "attacker.test:8765"})[0], 403)
+        self.reconnect()
+        self.assertEqual(self.request("GET", "/stats", headers={"Host": "localhost:8765"})[0], 200)
+        self.assertEqual(self.request("GET", "/stats", headers={"Origin": "http://127.0.0.1:8765"})[0], 200)
+        self.assertEqual(self.request("GET", "/urls/6")[0], 404)
+
+    def test_busy_pool_answers_503(self):
+        self.server.reader_timeout = 0.1
+        readers = [self.server.manager.read() for _ in range(self.server.manager.max_readers)]
+        for reader in readers:
+            reader.__enter__()
+        try:
+            status, response, _ = self.request("GET", "/urls?limit=5")
+            self.assertEqual(status, 503)
+            self.assertEqual(response.getheader("Retry-After"), "1")
+        finally:
+            for reader in readers:
+                reader.__exit__(None, None, None)
+        self.assertEqual(self.request("GET", "/urls?limit=5")[0], 200)
+
+    def test_stalled_client_is_dropped(self):
+        self.server.request_timeout = 0.2
+        with socket.create_connection(self.server.server_address, timeout=5) as client:
+            # Half a request line, then nothing
+            client.sendall(b"GET /urls HT")
+            self.assertEqual(client.recv(1024), b"")
+
+    def reconnect(self):
+        self.client.close()
+        self.client = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=10)
+
+
+class TestHelpers(unittest.TestCase):
+
+    def test_header_host(self):
+        self.assertEqual(header_host("LocalHost:8765"), "localhost")
+        self.assertEqual(header_host("[::1]:8765"), "::1")
+        self.assertEqual(header_host("https://evil.example"), "evil.example")
+        self.assertEqual(header_host("127.0.0.1"), "127.0.0.1")
+
+    def test_chunked_writer(self):
+        output = io.BytesIO()
+        writer = ChunkedWriter(output, chunk_size=4)
+        writer.write("ab")
+        writer.write("cdé")
+        writer.write("f")
+        writer.close()
+        self.assertEqual(output.getvalue(), b"6\r\nabcd\xc3\xa9\r\n1\r\nf\r\n0\r\n\r\n")
+
+    def test_response_cache(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("/a", 1, b"a")
+        cache.put("/b", 1, b"b")
+        self.assertEqual(cache.get("/a", 1), b"a")
+        self.assertIsNone(cache.get("/a", 2))
+        cache.put("/c", 1, b"c")
+        self.assertIsNone(cache.get("/b", 1))
+        self.assertEqual(cache.get("/a", 1), b"a")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import sqlite3
+import unittest
+from modules.url_todo_list.database import (
+    create_connection, create_table, add_url, delete_url, update_url_status, merge_duplicates
+)
+from modules.url_todo_list.migrations import migrate, rebuild_stats
+from modules.url_todo_list.stats import fetch_category_stats, fetch_totals, CategoryStats, Totals
+
+class TestStats(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = create_connection(":memory:")
+        create_table(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def group_by_counts(self):
+        """The counts computed the slow way, to compare with the summary table"""
+        self.conn.execute("CREATE TEMP TABLE expected(category TEXT, status INTEGER, count INTEGER)")
+        self.conn.execute("INSERT INTO expected SELECT IFNULL(category, ''), status, COUNT(*) FROM urls GROUP BY 1, 2")
+        rows = self.conn.execute("SELECT * FROM expected ORDER BY 1, 2").fetchall()
+        self.conn.execute("DROP TABLE expected")
+        return rows
+
+    def summary_counts(self):
+        return self.conn.execute("SELECT category, status, count FROM url_stats ORDER BY 1, 2").fetchall()
+
+    def test_empty(self):
+        self.assertEqual(fetch_category_stats(self.conn), [])
+        self.assertEqual(fetch_totals(self.conn), Totals(0, 0, 0))
+
+    def test_triggers_follow_writes(self):
+        add_url(self.conn, "https://example.com/a", "", "news")
+        add_url(self.conn, "https://example.com/b", "", "news")
+        add_url(self.conn, "https://example.com/c", "", "blog")
+        update_url_status(self.conn, 1, True)
+        self.assertEqual(fetch_category_stats(self.conn), [
+            CategoryStats("blog", 0, 1, 1),
+            CategoryStats("news", 1, 1, 2),
+        ])
+        self.assertEqual(fetch_totals(self.conn), Totals(1, 2, 3))
+
+        self.conn.execute("UPDATE urls SET category = 'blog' WHERE id = 2")
+        delete_url(self.conn, 1)
+        self.assertEqual(fetch_category_stats(self.conn), [CategoryStats("blog", 0, 2, 2)])
+        self.assertEqual(self.summary_counts(), self.group_by_counts())
+
+    def test_merge_and_null_categories(self):
+        self.conn.executemany("INSERT INTO urls(url, category, status) VALUES (?, ?, ?)", [
+            ("https://example.com/a", None, 0),
+            ("http://example.com/a/", None, 1),
+            ("https://example.com/b", "news", 1),
+        ])
+        merge_duplicates(self.conn)
+        self.assertEqual(self.summary_counts(), self.group_by_counts())
+        self.assertEqual(fetch_totals(self.conn), Totals(2, 0, 2))
+
+    def test_migration_counts_existing_rows(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE urls (id INTEGER PRIMARY KEY, url TEXT, description TEXT, category TEXT, status BOOLEAN)")
+        conn.executemany("INSERT INTO urls(url, category, status) VALUES (?, ?, ?)", [
+            ("https://example.com/a", "news", 1),
+            ("https://example.com/b", "news", 0),
+        ])
+        conn.commit()
+        migrate(conn)
+        self.assertEqual(fetch_category_stats(conn), [CategoryStats("news", 1, 1, 2)])
+        conn.close()
+
+    def test_rebuild(self):
+        add_url(self.conn, "https://example.com/a", "", "news")
+        self.conn.execute("DELETE FROM url_stats")
+        rebuild_stats(self.conn)
+        self.assertEqual(fetch_totals(self.conn), Totals(0, 1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
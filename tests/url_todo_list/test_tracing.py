@@ -0,0 +1,128 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from modules.url_todo_list.cli import main
+from modules.url_todo_list.connection import Connection
+from modules.url_todo_list.database import create_connection, create_table, add_url, fetch_urls, iter_urls
+from modules.url_todo_list.tracing import (
+    QueryTracer, TracingCursor, StatementStats, normalize_sql, enable_tracing, disable_tracing, get_tracer,
+    BUCKETS,
+)
+
+class TestNormalizeSql(unittest.TestCase):
+
+    def test_literals_and_whitespace(self):
+        self.assertEqual(normalize_sql("SELECT *\n  FROM urls WHERE id = 42 AND category = 'it''s';"),
+                         "SELECT * FROM urls WHERE id = ? AND category = ?")
+
+    def test_placeholder_lists(self):
+        self.assertEqual(normalize_sql("DELETE FROM urls WHERE id IN (?, ?, ?)"),
+                         normalize_sql("DELETE FROM urls WHERE id IN (?,?)"))
+
+    def test_identifiers_with_digits(self):
+        self.assertEqual(normalize_sql("SELECT url_hash2 FROM t1"), "SELECT url_hash2 FROM t1")
+
+
+class TestStatementStats(unittest.TestCase):
+
+    def test_histogram(self):
+        stats = StatementStats()
+        for seconds in (0.00005, 0.0003, 0.0003, 0.2, 20.0):
+            stats.observe(seconds, 2)
+        self.assertEqual(stats.calls, 5)
+        self.assertEqual(stats.rows, 10)
+        self.assertEqual(sum(stats.buckets), 5)
+        self.assertEqual(stats.buckets[0], 1)
+        self.assertEqual(stats.buckets[-1], 1)
+        self.assertEqual(stats.quantile(0.5), 0.0005)
+        self.assertEqual(stats.quantile(1.0), 20.0)
+
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        self.tracer = enable_tracing(QueryTracer())
+        self.conn = create_connection(":memory:")
+        create_table(self.conn)
+        self.tracer.reset()
+
+    def tearDown(self):
+        self.conn.close()
+        disable_tracing()
+
+    def stats(self, query):
+        return next(stats for stats in self.tracer.summary() if stats.query.startswith(query))
+
+    def test_disabled_by_default(self):
+        disable_tracing()
+        self.assertIsNone(get_tracer())
+        self.assertNotIsInstance(self.conn.execute("SELECT 1"), TracingCursor)
+
+    def test_writes_are_counted(self):
+        for i in range(3):
+            add_url(self.conn, f"https://example.com/{i}", "", "news")
+        stats = self.stats("INSERT INTO urls(url, description, category, status, url_hash)")
+        self.assertEqual(stats.calls, 3)
+        self.assertEqual(stats.rows, 3)
+
+    def test_fetched_rows_are_counted(self):
+        for i in range(5):
+            add_url(self.conn, f"https://example.com/{i}", "", "news")
+        fetch_urls(self.conn, category="news")
+        self.assertEqual(len(list(iter_urls(self.conn))), 5)
+        stats = self.stats("SELECT id, url, description, category, status FROM urls WHERE category = ?")
+        self.assertEqual((stats.calls, stats.rows), (1, 5))
+        stats = self.stats("SELECT id, url, description, category, status FROM urls ORDER BY id")
+        self.assertEqual((stats.calls, stats.rows), (1, 5))
+
+    def test_iteration_and_fetchone(self):
+        self.conn.executemany("INSERT INTO urls(url) VALUES (?)", [(f"https://example.com/{i}",) for i in range(4)])
+        self.assertEqual(sum(1 for _ in self.conn.execute("SELECT url FROM urls")), 4)
+        self.conn.execute("SELECT COUNT(*) FROM urls").fetchone()
+        self.assertEqual(self.stats("SELECT url FROM urls").rows, 4)
+        self.assertEqual(self.stats("SELECT COUNT(*) FROM urls").calls, 1)
+        self.assertEqual(self.stats("INSERT INTO urls(url)").rows, 4)
+
+    def test_errors_are_counted(self):
+        with self.assertRaises(Exception):
+            self.conn.execute("SELECT missing FROM urls")
+        self.assertEqual(self.stats("SELECT missing").errors, 1)
+
+    def test_prometheus_format(self):
+        self.conn.execute('SELECT "quoted" FROM urls WHERE url = ?', ("x",)).fetchall()
+        text = self.tracer.to_prometheus()
+        self.assertIn("# TYPE url_todo_list_query_duration_seconds histogram", text)
+        label = 'query="SELECT \\"quoted\\" FROM urls WHERE url = ?"'
+        self.assertIn(f'url_todo_list_query_duration_seconds_bucket{{{label},le="+Inf"}} 1', text)
+        self.assertIn(f'url_todo_list_query_duration_seconds_count{{{label}}} 1', text)
+        self.assertIn(f'url_todo_list_query_rows_total{{{label}}} 0', text)
+        buckets = [line for line in text.splitlines() if line.startswith("url_todo_list_query_duration_seconds_bucket") and label in line]
+        self.assertEqual(len(buckets), len(BUCKETS) + 1)
+        counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+        self.assertEqual(counts, sorted(counts))
+
+    def test_dump_prometheus(self):
+        self.conn.execute("SELECT 1").fetchall()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "queries.prom")
+            self.assertTrue(self.tracer.dump_prometheus(path))
+            with open(path) as file:
+                self.assertIn('query="SELECT ?"', file.read())
+
+    def test_cli_trace(self):
+        disable_tracing()
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = os.path.join(directory, "todos.db")
+            path = os.path.join(directory, "queries.prom")
+            with patch('sys.stdout', io.StringIO()):
+                code = main(["--database", db_path, "--trace", path, "add", "https://example.com"])
+            self.assertEqual(code, 0)
+            with open(path) as file:
+                self.assertIn("INSERT INTO urls(url, description, category, status, url_hash)", file.read())
+        self.assertIsNone(Connection.tracer)
+
+
+if __name__ == '__main__':
+    unittest.main()